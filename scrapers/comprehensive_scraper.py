@@ -7,15 +7,18 @@ import json
 import re
 import pytz
 import sys
+import logging
 sys.path.append(os.path.dirname(__file__))
 from auth_helper import ensure_logged_in, login_to_farm_to_people
 
+logger = logging.getLogger(__name__)
+
 # Add path for server modules
 sys.path.append(str(Path(__file__).resolve().parent.parent / 'server'))
 try:
     import supabase_client
 except ImportError:
-    print("⚠️ Could not import supabase_client - database save will be skipped")
+    logger.warning("⚠️ Could not import supabase_client - database save will be skipped")
     supabase_client = None
 
 # Load .env from project root
@@ -32,7 +35,7 @@ def get_timeout(base_ms):
     """Get adjusted timeout based on environment"""
     adjusted = int(base_ms * TIMEOUT_MULTIPLIER)
     if IS_PRODUCTION and adjusted != base_ms:
-        print(f"⏱️ Timeout adjusted for production: {base_ms}ms → {adjusted}ms")
+        logger.info("⏱️ Timeout adjusted for production: %sms → %sms", base_ms, adjusted)
     return adjusted
 
 def parse_delivery_date(delivery_text: str) -> datetime:
@@ -64,7 +67,7 @@ def parse_delivery_date(delivery_text: str) -> datetime:
                 return datetime(current_year, month, day)
     
     except Exception as e:
-        print(f"⚠️ Error parsing delivery date '{delivery_text}': {e}")
+        logger.warning("⚠️ Error parsing delivery date '%s': %s", delivery_text, e)
     
     return None
 
@@ -131,7 +134,7 @@ async def scrape_customize_modal(page):
     selected_items = []
     available_alternatives = []
     
-    print(f"Found {len(articles)} total items in customize modal")
+    logger.info("Found %s total items in customize modal", len(articles))
     
     for article in articles:
         try:
@@ -161,7 +164,7 @@ async def scrape_customize_modal(page):
                         producer_text = (await producer_elem.text_content()).strip()
                         if producer_text and len(producer_text) > 2:  # Valid producer name
                             producer = producer_text
-                            print(f"    🏪 Box item producer via {selector}: {producer}")
+                            logger.info("    🏪 Box item producer via %s: %s", selector, producer)
                             break
                 except:
                     continue
@@ -211,7 +214,7 @@ async def scrape_customize_modal(page):
                     "selected": True,
                     "category": category
                 })
-                print(f"  ✅ Selected: {item_name} (qty: {quantity}) - {unit_info}")
+                logger.info("  ✅ Selected: %s (qty: %s) - %s", item_name, quantity, unit_info)
                 
             elif await add_button.count() > 0:
                 # This is an available alternative
@@ -237,10 +240,10 @@ async def scrape_customize_modal(page):
                     "selected": False,
                     "category": category
                 })
-                print(f"  🔄 Available: {item_name} - {unit_info}")
+                logger.info("  🔄 Available: %s - %s", item_name, unit_info)
                 
         except Exception as e:
-            print(f"  ❌ Error processing article: {e}")
+            logger.warning("  ❌ Error processing article: %s", e)
             continue
     
     return {
@@ -266,14 +269,14 @@ def detect_and_store_swaps(phone_number, new_cart_data, delivery_date):
         List of detected swap dictionaries
     """
     if not supabase_client:
-        print("⚠️ Supabase not available - skipping swap detection")
+        logger.warning("⚠️ Supabase not available - skipping swap detection")
         return []
 
     try:
         # Get previous cart data
         previous_cart = supabase_client.get_latest_cart_data(phone_number)
         if not previous_cart or not previous_cart.get('cart_data'):
-            print("📦 No previous cart data found - skipping swap detection")
+            logger.info("📦 No previous cart data found - skipping swap detection")
             return []
 
         old_cart_data = previous_cart['cart_data']
@@ -335,7 +338,7 @@ def detect_and_store_swaps(phone_number, new_cart_data, delivery_date):
         return detected_swaps
 
     except Exception as e:
-        print(f"❌ Error in swap detection: {e}")
+        logger.error("❌ Error in swap detection: %s", e)
         return []
 
 
@@ -352,15 +355,13 @@ async def main(credentials=None, return_data=False, phone_number=None, force_sav
         Otherwise: None (saves to file)
     """
     import time
-    from datetime import datetime as dt
 
     def log_progress(message, elapsed=None):
-        """Helper function to log with timestamp and elapsed time."""
-        timestamp = dt.now().strftime("%H:%M:%S.%f")[:-3]
+        """Helper function to log with elapsed time (the log formatter adds the timestamp)."""
         if elapsed is not None:
-            print(f"[{timestamp}] {message} (elapsed: {elapsed:.1f}s)")
+            logger.info("%s (elapsed: %.1fs)", message, elapsed)
         else:
-            print(f"[{timestamp}] {message}")
+            logger.info("%s", message)
 
     start_time = time.time()
     log_progress(f"🚀 Starting comprehensive scraper for phone: {phone_number}")
@@ -493,9 +494,9 @@ async def main(credentials=None, return_data=False, phone_number=None, force_sav
                                                 from services.cache_service import CacheService
 
                                             CacheService.set_browser_session(phone_number, email, cookies, ttl=3600)  # 1 hour
-                                            print(f"💾 Saved browser session for {phone_number}")
+                                            logger.info("💾 Saved browser session for %s", phone_number)
                                         except Exception as session_error:
-                                            print(f"⚠️ Failed to save session: {session_error}")
+                                            logger.warning("⚠️ Failed to save session: %s", session_error)
 
                                 else:
                                     log_progress("⚠️ Still on login page, may have failed", time.time() - start_time)
@@ -617,7 +618,7 @@ async def main(credentials=None, return_data=False, phone_number=None, force_sav
                             producer_text = (await producer_elem.text_content()).strip()
                             if producer_text and len(producer_text) > 2:  # Valid producer name
                                 producer = producer_text
-                                print(f"    🏪 Found producer via {selector}: {producer}")
+                                logger.info("    🏪 Found producer via %s: %s", selector, producer)
                                 break
                     except:
                         continue
@@ -642,17 +643,17 @@ async def main(credentials=None, return_data=False, phone_number=None, force_sav
                             # Look for "from [Farm Name]" pattern
                             if unit_text.lower().startswith('from '):
                                 producer = unit_text[5:]  # Remove "from " prefix
-                                print(f"    🏪 Found producer via 'from' pattern: {producer}")
+                                logger.info("    🏪 Found producer via 'from' pattern: %s", producer)
                                 break
                             # Look for farm indicators
                             elif any(word in unit_text for word in farm_indicators):
                                 producer = unit_text
-                                print(f"    🏪 Found producer via farm indicators: {producer}")
+                                logger.info("    🏪 Found producer via farm indicators: %s", producer)
                                 break
                             # Look for patterns like "by [Farm Name]"
                             elif unit_text.lower().startswith('by '):
                                 producer = unit_text[3:]  # Remove "by " prefix
-                                print(f"    🏪 Found producer via 'by' pattern: {producer}")
+                                logger.info("    🏪 Found producer via 'by' pattern: %s", producer)
                                 break
 
                 # Get unit info from remaining elements (if no producer found in them)
@@ -678,13 +679,13 @@ async def main(credentials=None, return_data=False, phone_number=None, force_sav
                 }
                 
                 individual_items.append(individual_item)
-                print(f"  ✅ Individual: {item_name} (qty: {quantity}) - {price}")
+                logger.info("  ✅ Individual: %s (qty: %s) - %s", item_name, quantity, price)
                 
             except Exception as e:
-                print(f"  ⚠️ Error processing individual item: {e}")
+                logger.warning("  ⚠️ Error processing individual item: %s", e)
                 continue
         
-        print(f"🛒 Found {len(individual_items)} individual cart items")
+        logger.info("🛒 Found %s individual cart items", len(individual_items))
         
         # Check for non-customizable boxes (like Seasonal Fruit Medley)
         log_progress("📦 Phase 2: Scraping non-customizable boxes...", time.time() - start_time)
@@ -802,7 +803,7 @@ async def main(credentials=None, return_data=False, phone_number=None, force_sav
                             box_price = price_match.group()
                             log_progress(f"💰 Found box price: {box_price}", time.time() - start_time)
                 
-                print(f"\n=== PROCESSING BOX {i+1}: {box_name} ===")
+                logger.info("=== PROCESSING BOX %s: %s ===", i + 1, box_name)
                 
                 # Improved clicking with retries and better error handling
                 box_data = None
@@ -810,7 +811,7 @@ async def main(credentials=None, return_data=False, phone_number=None, force_sav
                 
                 for attempt in range(max_retries):
                     try:
-                        print(f"Clicking CUSTOMIZE... (attempt {attempt + 1}/{max_retries})")
+                        logger.info("Clicking CUSTOMIZE... (attempt %s/%s)", attempt + 1, max_retries)
                         
                         # Ensure button is in viewport and ready
                         await customize_btn.scroll_into_view_if_needed()
@@ -826,27 +827,27 @@ async def main(credentials=None, return_data=False, phone_number=None, force_sav
                         try:
                             await customize_btn.click()
                             click_success = True
-                            print("✅ Regular click succeeded")
+                            logger.info("✅ Regular click succeeded")
                         except Exception as e:
-                            print(f"⚠️ Regular click failed: {e}")
+                            logger.warning("⚠️ Regular click failed: %s", e)
                         
                         # Method 2: Force click if regular click failed
                         if not click_success:
                             try:
                                 await customize_btn.click(force=True)
                                 click_success = True
-                                print("✅ Force click succeeded")
+                                logger.info("✅ Force click succeeded")
                             except Exception as e:
-                                print(f"⚠️ Force click failed: {e}")
+                                logger.warning("⚠️ Force click failed: %s", e)
                         
                         # Method 3: JavaScript click if both failed
                         if not click_success:
                             try:
                                 await customize_btn.evaluate("element => element.click()")
                                 click_success = True
-                                print("✅ JavaScript click succeeded")
+                                logger.info("✅ JavaScript click succeeded")
                             except Exception as e:
-                                print(f"⚠️ JavaScript click failed: {e}")
+                                logger.warning("⚠️ JavaScript click failed: %s", e)
                         
                         if not click_success:
                             raise Exception("All click methods failed")
@@ -1095,7 +1096,7 @@ async def main(credentials=None, return_data=False, phone_number=None, force_sav
                                     if 'T' in stored_delivery:  # ISO format from database
                                         # Use datetime from top-level import to avoid scope issues
                                         stored_parsed_date = datetime.fromisoformat(stored_delivery.replace('Z', '+00:00'))
-                                        print(f"✅ Parsed stored delivery date: {stored_parsed_date}")
+                                        logger.info("✅ Parsed stored delivery date: %s", stored_parsed_date)
                                     else:  # Text format
                                         stored_parsed_date = parse_delivery_date(stored_delivery)
                                         log_progress(f"✅ Parsed stored delivery date: {stored_parsed_date}", time.time() - start_time)
@@ -1204,4 +1205,5 @@ async def main(credentials=None, return_data=False, phone_number=None, force_sav
 
 if __name__ == "__main__":
     import asyncio
+    logging.basicConfig(level=logging.INFO, format="[%(asctime)s] %(message)s")
     asyncio.run(main())
@@ -13,6 +13,7 @@ Architecture:
 
 import os
 import json
+import orjson
 from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
@@ -194,7 +195,7 @@ Format as JSON with:
             response_format={"type": "json_object"}
         )
         
-        return json.loads(response.choices[0].message.content)
+        return orjson.loads(response.choices[0].message.content)
         
     except Exception as e:
         print(f"Error generating meal plan: {e}")
@@ -257,7 +258,7 @@ Return corrected JSON with same structure."""
             response_format={"type": "json_object"}
         )
         
-        return json.loads(response.choices[0].message.content)
+        return orjson.loads(response.choices[0].message.content)
         
     except Exception as e:
         print(f"Error repairing meal plan: {e}")
@@ -348,6 +348,7 @@ async def generate_initial_meal_plan(plan_id: str, cart_data: Dict, user_phone:
         # Use saved suggestions if available
         if saved_suggestions and len(saved_suggestions) >= 5:
             logger.info(f"Using {len(saved_suggestions)} saved meal suggestions")
+            saved_assignments = []
             for i, day in enumerate(days):
                 if i < len(saved_suggestions):
                     saved_meal = saved_suggestions[i]
@@ -372,17 +373,26 @@ async def generate_initial_meal_plan(plan_id: str, cart_data: Dict, user_phone:
                         ingredients.append(parse_ingredient_string(ingredient))
                     
                     if meal_data and ingredients:
-                        try:
+                        saved_assignments.append((day, meal_data, ingredients))
+            
+            # Write the whole week in one batch; only on a conflict go day by day
+            try:
+                await storage.assign_meals(plan_id, saved_assignments)
+                logger.info(f"Assigned saved meals to {len(saved_assignments)} days")
+            except ConflictError as e:
+                logger.warning(f"Ingredient conflict in saved meals, assigning day by day: {e.conflicts}")
+                for day, meal_data, ingredients in saved_assignments:
+                    try:
+                        await storage.assign_meal(plan_id, day, meal_data, ingredients)
+                        logger.info(f"Assigned saved meal to {day}: {meal_data['name']}")
+                    except ConflictError as e:
+                        logger.warning(f"Ingredient conflict for {day}: {e.conflicts}")
+                        # Fall back to generating a new meal
+                        meal_data, ingredients = await generate_meal_for_day(
+                            day, ingredient_pool, cart_data, user_phone, user_preferences
+                        )
+                        if meal_data and ingredients:
                             await storage.assign_meal(plan_id, day, meal_data, ingredients)
-                            logger.info(f"Assigned saved meal to {day}: {meal_data['name']}")
-                        except ConflictError as e:
-                            logger.warning(f"Ingredient conflict for {day}: {e.conflicts}")
-                            # Fall back to generating a new meal
-                            meal_data, ingredients = await generate_meal_for_day(
-                                day, ingredient_pool, cart_data, user_phone, user_preferences
-                            )
-                            if meal_data and ingredients:
-                                await storage.assign_meal(plan_id, day, meal_data, ingredients)
         else:
             # Generate new meals if no saved suggestions
             logger.info("No saved suggestions found, generating new meals")
@@ -4,6 +4,7 @@ Transforms basic meal plans into restaurant-quality detailed recipes
 """
 
 import json
+import orjson
 from typing import Dict, List, Any, Optional
 import openai
 import os
@@ -58,7 +59,7 @@ class RecipeGenerator:
                 response_format={"type": "json_object"}
             )
             
-            recipe_data = json.loads(response.choices[0].message.content)
+            recipe_data = orjson.loads(response.choices[0].message.content)
             
             # Merge the detailed recipe with original meal data
             enhanced_meal = meal.copy()
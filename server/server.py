@@ -1,5 +1,6 @@
 import asyncio
 import json
+import logging
 import os
 import re
 import uuid
@@ -8,9 +9,10 @@ from pathlib import Path
 from urllib.parse import quote
 
 from fastapi import FastAPI, Form, Request, BackgroundTasks
-from fastapi.responses import HTMLResponse, PlainTextResponse, FileResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse, FileResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+import orjson
 import vonage
 from dotenv import load_dotenv
 # Add paths for imports
@@ -27,71 +29,77 @@ sys.path.append(os.path.join(current_dir, '..'))  # For scrapers
 # Direct imports from the server directory
 import supabase_client as db
 import meal_planner
-# Import our current primary scraper
-from scrapers.comprehensive_scraper import main as run_cart_scraper
+# Primary scraper - imported lazily on the first scrape so workers boot without Playwright
+from services.scraper_service import run_cart_scraper
 
 # Load .env file from the project root
 from pathlib import Path
 project_root = Path(__file__).parent.parent
 load_dotenv(dotenv_path=project_root / '.env')
 
+def configure_logging():
+    """
+    Route all logging through a queue so request handlers never block on stdout.
+
+    Handlers only enqueue records; a QueueListener thread formats them and writes
+    to stderr. LOG_LEVEL=WARNING silences the per-request detail.
+    """
+    import atexit
+    import queue
+    from logging.handlers import QueueHandler, QueueListener
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    root = logging.getLogger()
+    root.handlers[:] = [QueueHandler(log_queue)]
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+
+
+# Service modules log through `logging`
+configure_logging()
+logger = logging.getLogger(__name__)
+
 # === CONFIGURATION ===
 # IMPORTANT: Change this single variable to switch between models throughout the app
 # Updated 2025-08-29: Switched from hardcoded models to configurable variable
 # Updated 2025-09-15: Support both GPT-4o and GPT-5 via environment variable
 AI_MODEL = os.getenv("AI_MODEL", "gpt-4o")  # Default to gpt-4o for stability
-print(f"🤖 AI Model configured: {AI_MODEL}")
+logger.info("🤖 AI Model configured: %s", AI_MODEL)
 
-# Function to determine if model needs max_completion_tokens
-def uses_completion_tokens_param(model_name):
-    """
-    Determine if the model uses max_completion_tokens instead of max_tokens.
-    GPT-5 and reasoning models (o1, o3) use max_completion_tokens.
-    """
-    model_lower = model_name.lower()
-    return (
-        model_lower.startswith("gpt-5") or
-        model_lower.startswith("o1") or
-        model_lower.startswith("o3")
-    )
+# Shared system prompt for the swap-analysis calls - one constant so every request
+# sends a byte-identical prefix
+SWAP_SYSTEM_PROMPT = "You are a Farm to People meal planning expert. Analyze carts and suggest smart improvements based on user preferences."
 
 
-def build_api_params(model_name, max_tokens_value, temperature_value=None):
+def parse_swap_response(gpt_response: str):
     """
-    Build OpenAI API parameters based on model capabilities.
-
-    Args:
-        model_name: The OpenAI model name
-        max_tokens_value: Maximum tokens to generate
-        temperature_value: Temperature setting (None means use model default)
+    Parse the swap JSON object from a GPT reply, or None if there isn't one.
 
-    Returns:
-        Dict with appropriate parameters for the model
+    JSON mode returns a bare object, parsed as-is. Older models without JSON mode
+    may wrap it in prose or code fences, so fall back to extracting the {...} span.
     """
-    params = {}
-
-    # Handle token parameter naming
-    if uses_completion_tokens_param(model_name):
-        params["max_completion_tokens"] = max_tokens_value
-        print(f"📝 [MODEL COMPAT] Using max_completion_tokens for {model_name}")
-    else:
-        params["max_tokens"] = max_tokens_value
-        print(f"📝 [MODEL COMPAT] Using max_tokens for {model_name}")
-
-    # Handle temperature (GPT-5 only supports default temperature=1)
-    model_lower = model_name.lower()
-    if model_lower.startswith("gpt-5"):
-        # GPT-5 only supports temperature=1 (default), so don't specify it
-        print(f"📝 [MODEL COMPAT] Skipping temperature for {model_name} (uses default)")
+    try:
+        return orjson.loads(gpt_response)
+    except orjson.JSONDecodeError:
+        json_match = re.search(r'\{.*\}', gpt_response, re.DOTALL)
+        return orjson.loads(json_match.group()) if json_match else None
 
-        # GPT-5 REQUIRES reasoning_effort parameter
-        params["reasoning_effort"] = "minimal"  # Use minimal for JSON generation tasks
-        print(f"📝 [MODEL COMPAT] Using reasoning_effort=minimal for {model_name}")
-    elif temperature_value is not None:
-        params["temperature"] = temperature_value
-        print(f"📝 [MODEL COMPAT] Using temperature={temperature_value} for {model_name}")
 
-    return params
+# Model compatibility helpers are shared with the meal generator (memoized there).
+# Flags for the configured model are computed once here, not on every swap request.
+# Swap calls go through the meal generator's pooled AsyncOpenAI client (call_gpt).
+from services.meal_generator import build_api_params, call_gpt, model_profile
+_SWAP_MODEL_PROFILE = model_profile(AI_MODEL)
+SWAP_TOKEN_LIMIT = 1200 if _SWAP_MODEL_PROFILE.needs_reasoning_effort else 500  # GPT-5 needs room for reasoning tokens
+SWAP_RESPONSE_FORMAT = {"response_format": {"type": "json_object"}} if _SWAP_MODEL_PROFILE.supports_json_mode else {}
+# Every swap call sends the same params - built once, spread into each call (don't mutate)
+SWAP_API_PARAMS = {**build_api_params(AI_MODEL, max_tokens_value=SWAP_TOKEN_LIMIT, temperature_value=0.7), **SWAP_RESPONSE_FORMAT}
 
 app = FastAPI()
 
@@ -117,24 +125,21 @@ DATA_DIR = Path(".")
 # Vonage Client for sending messages
 # Temporarily disabled for web endpoint testing
 vonage_client = None
-print("⚠️ SMS disabled for testing - web endpoint will work")
+from services.notification_service import VONAGE_FROM_NUMBER
+logger.warning("⚠️ SMS disabled for testing - web endpoint will work")
 
 def send_progress_sms(phone_number: str, message: str):
     """Send a progress update SMS to the user"""
     try:
-        to_number = phone_number.lstrip("+")
-        from_number = os.getenv("VONAGE_PHONE_NUMBER", "12019773745")
-        if not from_number.startswith("1"):
-            from_number = "1" + from_number
-        
+        to_number = phone_number[1:] if phone_number.startswith("+") else phone_number
         response = vonage_client.sms.send_message({
-            "from": from_number,
+            "from": VONAGE_FROM_NUMBER,
             "to": to_number,
             "text": message
         })
-        print(f"📱 Progress SMS sent: {message}")
+        logger.info("📱 Progress SMS sent: %s", message)
     except Exception as e:
-        print(f"❌ Error sending progress SMS: {e}")
+        logger.error("❌ Error sending progress SMS: %s", e)
 
 async def handle_meal_plan_confirmation(phone_number: str, user_message: str, background_tasks: BackgroundTasks):
     """Handle user responses to meal plan confirmation"""
@@ -171,7 +176,7 @@ async def handle_meal_plan_confirmation(phone_number: str, user_message: str, ba
         return PlainTextResponse("OK", status_code=200)
         
     except Exception as e:
-        print(f"❌ Error handling meal plan confirmation: {e}")
+        logger.error("❌ Error handling meal plan confirmation: %s", e)
         error_reply = "❌ Error processing your response. Please try again or text 'CONFIRM' to proceed."
         send_progress_sms(phone_number, error_reply)
         return PlainTextResponse("Error", status_code=500)
@@ -179,79 +184,10 @@ async def handle_meal_plan_confirmation(phone_number: str, user_message: str, ba
 # Moved to services/sms_handler.py
 from services.sms_handler import format_sms_with_help
 
-def format_sms_with_help_deprecated(message: str, state: str = None) -> str:
-    """
-    Add contextual help text to SMS messages based on conversation state.
-    
-    This function enhances user experience by providing relevant next-step guidance
-    in every SMS response, reducing user confusion and improving engagement.
-    
-    Args:
-        message (str): The main SMS message content
-        state (str, optional): Current conversation state to determine appropriate help text.
-                              If None or unknown, defaults to general help.
-    
-    Returns:
-        str: Original message + visual separator + contextual help text
-    
-    Available States:
-        - 'analyzing': Progress indicator during cart/meal analysis (shows timing expectation)
-        - 'plan_ready': Action options after meal plan is delivered (CONFIRM/SWAP/SKIP)
-        - 'greeting': Welcome state with basic navigation options
-        - 'onboarding': During user registration/setup process  
-        - 'login': After providing secure login link
-        - 'error': Recovery options when something goes wrong
-        - 'default': General help for unrecognized inputs or no state provided
-    
-    Example Usage:
-        >>> format_sms_with_help("📦 Analyzing your cart...", 'analyzing')
-        "📦 Analyzing your cart...\n━━━━━━━━━\n⏳ This takes 20-30 seconds..."
-        
-        >>> format_sms_with_help("Your meal plan is ready!", 'plan_ready')
-        "Your meal plan is ready!\n━━━━━━━━━\n💬 Reply: CONFIRM | SWAP item | SKIP day | help"
-    
-    Design Notes:
-        - Uses visual separator (━━━━━━━━━) to distinguish help from main message
-        - Keeps help text concise for SMS length limits (typically 65-200 total chars)
-        - Uses consistent emoji prefixes (⏳ for progress, 💬 for actions)
-        - Provides specific actionable commands rather than vague instructions
-    
-    Added: August 26, 2025 - Part of Tuesday PM milestone (Week 3 implementation)
-    """
-    
-    # Contextual help text mapped to conversation states
-    # Each help text follows pattern: visual separator + emoji + specific actions
-    help_text = {
-        # During processing states - set expectation of time required
-        'analyzing': "━━━━━━━━━\n⏳ This takes 20-30 seconds...",
-        
-        # After meal plan delivery - show available modification options
-        'plan_ready': "━━━━━━━━━\n💬 Reply: CONFIRM | SWAP item | SKIP day | help",
-        
-        # Initial greeting - show primary entry points
-        'greeting': "━━━━━━━━━\n💬 Text 'plan' to start | 'new' to register",
-        
-        # During user setup - encourage completion via web or SMS
-        'onboarding': "━━━━━━━━━\n💬 Reply with your cooking preferences or use the link",
-        
-        # After login link provided - guide to next step
-        'login': "━━━━━━━━━\n💬 After login, text 'plan' for your meal plan",
-        
-        # Error recovery - provide retry options and help
-        'error': "━━━━━━━━━\n💬 Text 'plan' to try again | 'help' for options",
-        
-        # Fallback for unknown inputs or states
-        'default': "━━━━━━━━━\n💬 Text 'plan' to start | 'new' to register | 'help' for options"
-    }
-    
-    # Return original message with contextual help appended
-    # Uses .get() with default fallback to handle unknown states gracefully
-    return f"{message}\n{help_text.get(state, help_text['default'])}"
-
 def generate_confirmed_meal_plan(phone_number: str):
     """Generate detailed PDF recipes after user confirmation"""
     try:
-        print(f"🍳 Generating confirmed meal plan for {phone_number}")
+        logger.info("🍳 Generating confirmed meal plan for %s", phone_number)
         
         # Get user preferences
         user_data = db.get_user_by_phone(phone_number)
@@ -282,13 +218,13 @@ def generate_confirmed_meal_plan(phone_number: str):
         send_progress_sms(phone_number, final_message)
         
     except Exception as e:
-        print(f"❌ Error generating confirmed meal plan: {e}")
+        logger.error("❌ Error generating confirmed meal plan: %s", e)
         send_progress_sms(phone_number, "❌ Error generating recipes. Please try again.")
 
 def handle_meal_plan_modification(phone_number: str, user_request: str):
     """Handle user requests to modify the meal plan"""
     try:
-        print(f"🔄 Handling meal plan modification for {phone_number}: {user_request}")
+        logger.info("🔄 Handling meal plan modification for %s: %s", phone_number, user_request)
         
         # For now, just regenerate the cart analysis
         import meal_planner
@@ -305,7 +241,7 @@ def handle_meal_plan_modification(phone_number: str, user_request: str):
         db.update_user_meal_plan_step(phone_number, 'awaiting_confirmation')
         
     except Exception as e:
-        print(f"❌ Error handling meal plan modification: {e}")
+        logger.error("❌ Error handling meal plan modification: %s", e)
         send_progress_sms(phone_number, "❌ Error modifying meal plan. Please try 'CONFIRM' to proceed with original plan.")
 
 async def run_full_meal_plan_flow(phone_number: str):
@@ -330,22 +266,22 @@ async def sms_incoming(request: Request, background_tasks: BackgroundTasks, msis
         query_params = request.query_params
         user_phone_number = "+" + query_params.get("msisdn", "")
         user_message = query_params.get("text", "").lower().strip()
-        print(f"GET request - Phone: {user_phone_number}, Message: '{user_message}'")
+        logger.debug("GET request - Phone: %s, Message: '%s'", user_phone_number, user_message)
     else:
         # POST request - try JSON first, then form data
         try:
             json_data = await request.json()
             user_phone_number = "+" + json_data.get("msisdn", "")
             user_message = json_data.get("text", "").lower().strip()
-            print(f"JSON-POST request - Phone: {user_phone_number}, Message: '{user_message}'")
-            print(f"📋 JSON data received: {json_data}")
+            logger.debug("JSON-POST request - Phone: %s, Message: '%s'", user_phone_number, user_message)
+            logger.debug("📋 JSON data received: %s", json_data)
         except:
             # Fallback to form data (current method)
             user_phone_number = "+" + (msisdn or "")
             user_message = (text or "").lower().strip()
-            print(f"Form POST request - Phone: {user_phone_number}, Message: '{user_message}'")
+            logger.debug("Form POST request - Phone: %s, Message: '%s'", user_phone_number, user_message)
 
-    print(f"Received message from {user_phone_number}: '{user_message}'")
+    logger.info("Received message from %s: '%s'", user_phone_number, user_message)
 
     # --- Use SMS Handler Service for Routing ---
     from services.sms_handler import route_sms_message
@@ -358,7 +294,7 @@ async def sms_incoming(request: Request, background_tasks: BackgroundTasks, msis
             # Handle meal plan confirmation responses
             return await handle_meal_plan_confirmation(user_phone_number, user_message, background_tasks)
     except Exception as e:
-        print(f"⚠️ Error checking meal plan step: {e}")
+        logger.warning("⚠️ Error checking meal plan step: %s", e)
 
     # Route the message using our service
     reply, should_trigger_task = route_sms_message(user_phone_number, user_message)
@@ -366,12 +302,12 @@ async def sms_incoming(request: Request, background_tasks: BackgroundTasks, msis
     # If we need to trigger background meal generation
     if should_trigger_task:
         # Add the scraping/planning job to the background
-        print(f"🎯 Adding background task for meal plan flow: {user_phone_number}")
+        logger.info("🎯 Adding background task for meal plan flow: %s", user_phone_number)
         try:
             background_tasks.add_task(run_full_meal_plan_flow, user_phone_number)
-            print(f"✅ Background task added successfully")
+            logger.info("✅ Background task added successfully")
         except Exception as e:
-            print(f"❌ Error adding background task: {e}")
+            logger.error("❌ Error adding background task: %s", e)
             # Update reply if task failed
             from services.sms_handler import format_sms_with_help
             reply = format_sms_with_help(
@@ -382,15 +318,15 @@ async def sms_incoming(request: Request, background_tasks: BackgroundTasks, msis
     # Send immediate reply via Vonage
     try:
         # Remove the + prefix for Vonage API
-        to_number = user_phone_number.lstrip("+")
+        to_number = user_phone_number[1:] if user_phone_number.startswith("+") else user_phone_number
         response = vonage_client.sms.send_message({
-            "from": "1" + os.getenv("VONAGE_PHONE_NUMBER", "2019773745"),  # Ensure country code
+            "from": VONAGE_FROM_NUMBER,
             "to": to_number,
             "text": reply
         })
-        print(f"✅ Immediate SMS reply sent: {response}")
+        logger.info("✅ Immediate SMS reply sent: %s", response)
     except Exception as e:
-        print(f"❌ Error sending immediate SMS reply: {e}")
+        logger.error("❌ Error sending immediate SMS reply: %s", e)
 
     # Return 200 OK to Vonage
     return {"status": "ok"}
@@ -500,15 +436,36 @@ async def login_submit(phone: str = Form("") , email: str = Form(...), password:
         )
         return PlainTextResponse("Saved. You can now text 'plan' to get meal ideas.")
     except Exception as e:
-        print(f"Supabase save error: {e}")
+        logger.error("Supabase save error: %s", e)
         return PlainTextResponse("There was an error saving your info. Please try again.", status_code=500)
 
 # Serve PDF files
 @app.get("/pdfs/{filename}")
 async def serve_pdf(filename: str):
     """Serve PDF meal plans"""
-    from fastapi.responses import FileResponse
+    from fastapi.responses import FileResponse, RedirectResponse
     import os
+    from services.pdf_service import is_pdf_pending, is_pdf_failed, get_pdf_download_url
+    
+    if is_pdf_pending(filename):
+        # Still rendering in the background - ask the client to retry shortly
+        return PlainTextResponse(
+            "Your PDF will be ready in a moment. Please refresh shortly.",
+            status_code=503,
+            headers={"Retry-After": "5"}
+        )
+    
+    if is_pdf_failed(filename):
+        # The link went out before the render failed - tell the user how to retry
+        return PlainTextResponse(
+            "❌ Error generating your recipe PDF. Please try again with 'plan'.",
+            status_code=500
+        )
+    
+    # Offloaded to storage - send the client there instead of streaming the bytes
+    signed_url = await asyncio.to_thread(get_pdf_download_url, filename)
+    if signed_url:
+        return RedirectResponse(signed_url, status_code=307)
     
     pdf_path = f"../pdfs/{filename}"
     if os.path.exists(pdf_path):
@@ -990,7 +947,7 @@ async def serve_meal_plan_analysis(analysis_id: str):
         return HTMLResponse(html_page)
         
     except Exception as e:
-        print(f"Error serving meal plan analysis: {e}")
+        logger.error("Error serving meal plan analysis: %s", e)
         import traceback
         traceback.print_exc()
         return HTMLResponse(
@@ -1009,7 +966,7 @@ async def test_full_flow(background_tasks: BackgroundTasks):
     if not test_phone_number:
         return {"status": "error", "message": "YOUR_PHONE_NUMBER not set in .env"}
 
-    print(f"--- TRIGGERING FULL FLOW FOR {test_phone_number} ---")
+    logger.info("--- TRIGGERING FULL FLOW FOR %s ---", test_phone_number)
     background_tasks.add_task(run_full_meal_plan_flow, test_phone_number)
     return {"status": "ok", "message": f"Meal planning process started for {test_phone_number}. The result will be sent via SMS."}
 
@@ -1130,19 +1087,19 @@ async def get_saved_cart(force_refresh: bool = False):
                                 cached_meals = CacheService.get_meals(phone_number)
                                 if cached_meals:
                                     cached_response["meals"] = cached_meals
-                                    print(f"⚡ Added {len(cached_meals)} cached meals to complete response")
+                                    logger.info("⚡ Added %s cached meals to complete response", len(cached_meals))
 
-                            print(f"⚡ Serving COMPLETE cart response from Redis cache for {phone_number}")
+                            logger.info("⚡ Serving COMPLETE cart response from Redis cache for %s", phone_number)
                             # Add cache metadata
                             cached_response["from_cache"] = True
                             cached_response["cache_type"] = "redis_complete"
                             return cached_response
                         else:
-                            print(f"⚠️ Cached response has invalid cart_data (empty selected_items) - invalidating")
+                            logger.warning("⚠️ Cached response has invalid cart_data (empty selected_items) - invalidating")
                             # Invalidate bad cache entry
                             CacheService.invalidate_cart_response(phone_number)
                     else:
-                        print(f"⚠️ Cached response missing cart_data - invalidating")
+                        logger.warning("⚠️ Cached response missing cart_data - invalidating")
                         CacheService.invalidate_cart_response(phone_number)
 
                 # Fall back to cart-only cache if complete response not available
@@ -1162,9 +1119,9 @@ async def get_saved_cart(force_refresh: bool = False):
                         cached_addons = cached_response.get('addons', [])
                         swaps_msg = f" with {len(cached_swaps)} swaps" if cached_swaps else ""
                         addons_msg = f" and {len(cached_addons)} add-ons" if cached_addons else ""
-                        print(f"✅ Found cached swaps/addons{swaps_msg}{addons_msg}")
+                        logger.info("✅ Found cached swaps/addons%s%s", swaps_msg, addons_msg)
 
-                    print(f"⚡ Serving cart-only from Redis cache for {phone_number}{meals_msg}")
+                    logger.info("⚡ Serving cart-only from Redis cache for %s%s", phone_number, meals_msg)
                     return {
                         "cart_data": cached_cart,
                         "delivery_date": cached_cart.get('delivery_date'),  # Get delivery date from cart data
@@ -1176,12 +1133,12 @@ async def get_saved_cart(force_refresh: bool = False):
                         "meals": cached_meals or []  # Ensure meals is always an array
                     }
             except Exception as cache_error:
-                print(f"⚠️ Redis cache read failed: {cache_error}")
+                logger.warning("⚠️ Redis cache read failed: %s", cache_error)
         else:
-            print(f"🔄 Force refresh requested - bypassing Redis cache")
+            logger.info("🔄 Force refresh requested - bypassing Redis cache")
 
         # Fall back to database if no Redis cache
-        print(f"📦 No Redis cache, checking database for {phone_number}")
+        logger.info("📦 No Redis cache, checking database for %s", phone_number)
         saved_cart = db.get_latest_cart_data(phone_number)
 
         if saved_cart and saved_cart.get('cart_data'):
@@ -1198,7 +1155,7 @@ async def get_saved_cart(force_refresh: bool = False):
             return {"error": "No saved cart data found"}
 
     except Exception as e:
-        print(f"Error retrieving saved cart: {e}")
+        logger.error("Error retrieving saved cart: %s", e)
         return {"error": str(e)}
 
 
@@ -1246,14 +1203,11 @@ async def generate_swaps_async(cart_data: dict, user_preferences: dict, normaliz
         List of swap suggestions
     """
     try:
-        import openai
         openai_key = os.getenv("OPENAI_API_KEY")
         if not openai_key:
-            print("⚠️ No OpenAI API key for swap generation")
+            logger.warning("⚠️ No OpenAI API key for swap generation")
             return []
 
-        client = openai.OpenAI(api_key=openai_key)
-
         # Build context for GPT-5 with category awareness
         selected_items = []
         available_alternatives = []
@@ -1320,9 +1274,9 @@ async def generate_swaps_async(cart_data: dict, user_preferences: dict, normaliz
 
                 recent_swaps = db.get_swap_history(normalized_phone, date_part, limit=5)
                 if recent_swaps:
-                    print(f"📋 Found {len(recent_swaps)} recent swaps for this delivery")
+                    logger.info("📋 Found %s recent swaps for this delivery", len(recent_swaps))
             except Exception as swap_error:
-                print(f"⚠️ Could not retrieve swap history: {swap_error}")
+                logger.warning("⚠️ Could not retrieve swap history: %s", swap_error)
 
         # Build category-aware swap constraints
         category_constraints = []
@@ -1374,35 +1328,26 @@ Return JSON format:
   ]
 }}"""
 
-        # Build parameters compatible with the specific model
-        from services.meal_generator import build_api_params
-        token_limit = 1200 if AI_MODEL.lower().startswith("gpt-5") else 500
-        api_params = build_api_params(AI_MODEL, max_tokens_value=token_limit, temperature_value=0.7)
-
-        response = client.chat.completions.create(
+        response = await call_gpt(
             model=AI_MODEL,
             messages=[
-                {"role": "system", "content": "You are a Farm to People meal planning expert. Analyze carts and suggest smart improvements based on user preferences."},
+                {"role": "system", "content": SWAP_SYSTEM_PROMPT},
                 {"role": "user", "content": prompt}
             ],
-            **api_params
+            **SWAP_API_PARAMS
         )
 
         # Parse response (swaps only)
-        import json
-        import re
-        gpt_response = response.choices[0].message.content.strip()
-        json_match = re.search(r'\{.*\}', gpt_response, re.DOTALL)
-        if json_match:
-            result = json.loads(json_match.group())
+        result = parse_swap_response(response.choices[0].message.content)
+        if result is not None:
             swaps = result.get("swaps", [])
             return swaps
         else:
-            print("⚠️ No JSON found in swap response")
+            logger.warning("⚠️ No JSON found in swap response")
             return []
 
     except Exception as e:
-        print(f"❌ Error in async swap generation: {e}")
+        logger.error("❌ Error in async swap generation: %s", e)
         return []
 
 
@@ -1430,28 +1375,26 @@ async def analyze_cart_api(request: Request, background_tasks: BackgroundTasks):
 
         cart_data = None
 
-        print(f"\n{'='*60}")
-        print(f"🚀 [TIMING] Cart Analysis Start - Force refresh: {force_refresh}")
-        print(f"{'='*60}")
+        logger.info("🚀 [TIMING] Cart Analysis Start - Force refresh: %s", force_refresh)
 
         if not use_mock and phone:
             # Try to get real cart data using stored credentials
             try:
-                print(f"⏱️ [T+0.0s] Starting analysis for phone: {phone}")
+                logger.info("⏱️ [T+0.0s] Starting analysis for phone: %s", phone)
 
                 # Use centralized phone service for consistent normalization
                 from services.phone_service import normalize_phone
                 normalized_phone = normalize_phone(phone)
                 
                 if not normalized_phone:
-                    print(f"[CART-ERROR] Invalid phone format: {phone}")
+                    logger.error("[CART-ERROR] Invalid phone format: %s", phone)
                     return {
                         "success": False,
                         "error": "Invalid phone number format",
                         "debug_info": f"Could not normalize phone: {phone}"
                     }
                 
-                print(f"[CART-STEP-1] Normalized: {phone} -> {normalized_phone}")
+                logger.debug("[CART-STEP-1] Normalized: %s -> %s", phone, normalized_phone)
 
                 # CRITICAL: Handle force refresh by invalidating Redis cache
                 if force_refresh:
@@ -1459,21 +1402,21 @@ async def analyze_cart_api(request: Request, background_tasks: BackgroundTasks):
                         from services.cache_service import CacheService
                         CacheService.invalidate_cart(normalized_phone)
                         CacheService.invalidate_cart_response(normalized_phone)
-                        print(f"🔄 Force refresh: Invalidated Redis cache and cart_response for {normalized_phone}")
+                        logger.info("🔄 Force refresh: Invalidated Redis cache and cart_response for %s", normalized_phone)
                     except Exception as cache_error:
-                        print(f"⚠️ Cache invalidation failed (non-critical): {cache_error}")
+                        logger.warning("⚠️ Cache invalidation failed (non-critical): %s", cache_error)
 
                 # Try to get stored cart data (but don't rely on it exclusively)
                 stored_cart = db.get_latest_cart_data(normalized_phone)
                 if stored_cart and stored_cart.get('cart_data'):
-                    print(f"📦 Found stored cart data for {normalized_phone}")
+                    logger.info("📦 Found stored cart data for %s", normalized_phone)
                 else:
-                    print(f"⚠️ No stored cart data for {normalized_phone}")
+                    logger.warning("⚠️ No stored cart data for %s", normalized_phone)
                 
                 # If regenerate_only flag is set, just use stored data (no scraping)
                 if regenerate_only:
                     if stored_cart and stored_cart.get('cart_data'):
-                        print("✨ Regenerate mode: Using stored cart data for new suggestions")
+                        logger.info("✨ Regenerate mode: Using stored cart data for new suggestions")
                         cart_data = stored_cart.get('cart_data')
                     else:
                         return {
@@ -1493,9 +1436,9 @@ async def analyze_cart_api(request: Request, background_tasks: BackgroundTasks):
                     # Use the normalized phone to find user
                     user_record = db.get_user_by_phone(normalized_phone)
                     if user_record:
-                        print(f"  ✅ Found user with normalized phone: {normalized_phone}")
+                        logger.info("  ✅ Found user with normalized phone: %s", normalized_phone)
                     else:
-                        print(f"  ⚠️ No user found for {normalized_phone}")
+                        logger.warning("  ⚠️ No user found for %s", normalized_phone)
                     
                     # Try live scraping first if we have credentials
                     if user_record and user_record.get('ftp_email'):
@@ -1511,17 +1454,17 @@ async def analyze_cart_api(request: Request, background_tasks: BackgroundTasks):
                             try:
                                 password = PasswordEncryption.decrypt_password(encoded_pwd)
                                 if password:
-                                    print(f"✅ Successfully decrypted password for {email}")
+                                    logger.info("✅ Successfully decrypted password for %s", email)
                                 else:
-                                    print(f"⚠️ Password decryption returned None for {email}")
+                                    logger.warning("⚠️ Password decryption returned None for %s", email)
                             except Exception as decrypt_error:
-                                print(f"⚠️ Failed to decrypt password: {decrypt_error}")
-                                print(f"⚠️ Encrypted password length: {len(encoded_pwd)}")
+                                logger.warning("⚠️ Failed to decrypt password: %s", decrypt_error)
+                                logger.warning("⚠️ Encrypted password length: %s", len(encoded_pwd))
                                 # Don't fail completely - maybe stored cart has data
                         
                         if email and password:
                             elapsed = time.time() - api_start_time
-                            print(f"⏱️ [T+{elapsed:.1f}s] Starting live scraper for {email} (force_refresh={force_refresh})")
+                            logger.info("⏱️ [T+%.1fs] Starting live scraper for %s (force_refresh=%s)", elapsed, email, force_refresh)
                             # Run the actual scraper with return_data=True (properly isolated from async context)
                             credentials = {'email': email, 'password': password}
 
@@ -1529,7 +1472,7 @@ async def analyze_cart_api(request: Request, background_tasks: BackgroundTasks):
                             import asyncio
                             try:
                                 scraper_start = time.time()
-                                print(f"⏱️ [T+{elapsed:.1f}s] Starting scraper with 120 second timeout...")
+                                logger.info("⏱️ [T+%.1fs] Starting scraper with 120 second timeout...", elapsed)
                                 # Use async scraper directly with normalized phone
                                 cart_data = await asyncio.wait_for(
                                     run_cart_scraper(
@@ -1542,45 +1485,45 @@ async def analyze_cart_api(request: Request, background_tasks: BackgroundTasks):
                                 )
                                 scraper_duration = time.time() - scraper_start
                                 elapsed = time.time() - api_start_time
-                                print(f"✅ [T+{elapsed:.1f}s] Scraper completed in {scraper_duration:.1f}s")
+                                logger.info("✅ [T+%.1fs] Scraper completed in %.1fs", elapsed, scraper_duration)
                             except asyncio.TimeoutError:
-                                print(f"⏰ Scraper timed out after 120 seconds - using fallback data")
+                                logger.warning("⏰ Scraper timed out after 120 seconds - using fallback data")
                                 cart_data = None
                             except Exception as scraper_error:
-                                print(f"❌ Scraper failed with error: {scraper_error}")
+                                logger.error("❌ Scraper failed with error: %s", scraper_error)
                                 cart_data = None
                             
                             if cart_data:
-                                print("✅ Successfully scraped live cart data!")
+                                logger.info("✅ Successfully scraped live cart data!")
 
                                 # CRITICAL: Cache fresh cart data to Redis immediately
                                 try:
                                     from services.cache_service import CacheService
                                     CacheService.set_cart(normalized_phone, cart_data, ttl=7200)  # 2 hour cache
-                                    print(f"🔥 Fresh cart data cached to Redis for {normalized_phone}")
+                                    logger.info("🔥 Fresh cart data cached to Redis for %s", normalized_phone)
                                 except Exception as cache_error:
-                                    print(f"⚠️ Redis cache failed (non-critical): {cache_error}")
+                                    logger.warning("⚠️ Redis cache failed (non-critical): %s", cache_error)
 
                                 # Check if cart is missing customizable boxes (likely locked)
                                 has_customizable = cart_data.get('customizable_boxes') and len(cart_data['customizable_boxes']) > 0
                                 
                                 if not has_customizable:
-                                    print("⚠️ Cart appears empty (no customizable boxes).")
+                                    logger.warning("⚠️ Cart appears empty (no customizable boxes).")
                                     # Use the stored cart if we already have it
                                     if stored_cart and stored_cart.get('cart_data'):
                                         stored_has_customizable = (stored_cart['cart_data'].get('customizable_boxes') and 
                                                                   len(stored_cart['cart_data']['customizable_boxes']) > 0)
                                         
                                         if stored_has_customizable:
-                                            print("✅ Using previously stored cart data with complete boxes")
+                                            logger.info("✅ Using previously stored cart data with complete boxes")
                                             cart_data = stored_cart['cart_data']
                                         else:
-                                            print("⚠️ Stored cart also has no customizable boxes")
+                                            logger.warning("⚠️ Stored cart also has no customizable boxes")
                             else:
                                 # Scraper returned no data or timed out - use fallback
-                                print("⚠️ Scraper returned no data or timed out.")
+                                logger.warning("⚠️ Scraper returned no data or timed out.")
                                 if stored_cart and stored_cart.get('cart_data'):
-                                    print("✅ Using previously stored cart data as fallback")
+                                    logger.info("✅ Using previously stored cart data as fallback")
                                     cart_data = stored_cart['cart_data']
                                 else:
                                     # Return error if no data available
@@ -1606,7 +1549,7 @@ async def analyze_cart_api(request: Request, background_tasks: BackgroundTasks):
                     
             except Exception as e:
                 # Return error instead of mock data
-                print(f"❌ Error scraping cart: {str(e)}")
+                logger.error("❌ Error scraping cart: %s", e)
                 return {
                     "success": False,
                     "error": f"Failed to scrape cart: {str(e)}",
@@ -1643,9 +1586,9 @@ async def analyze_cart_api(request: Request, background_tasks: BackgroundTasks):
                     if cached_swaps or cached_addons:
                         swaps = cached_swaps
                         addons = cached_addons
-                        print(f"✅ Using cached swaps ({len(swaps)}) and addons ({len(addons)}) from last successful scrape")
+                        logger.info("✅ Using cached swaps (%s) and addons (%s) from last successful scrape", len(swaps), len(addons))
             except Exception as cache_error:
-                print(f"⚠️ Could not load cached swaps/addons: {cache_error}")
+                logger.warning("⚠️ Could not load cached swaps/addons: %s", cache_error)
                 # Keep empty arrays as fallback
         
         # Get user preferences for personalized meal generation
@@ -1663,16 +1606,29 @@ async def analyze_cart_api(request: Request, background_tasks: BackgroundTasks):
                     user_record = db.get_user_by_phone(normalized_phone)
                     if user_record:
                         user_preferences = user_record.get('preferences', {})
-                        print(f"✅ Loaded preferences for meal generation: {list(user_preferences.keys())}")
+                        logger.info("✅ Loaded preferences for meal generation: %s", list(user_preferences.keys()))
                     else:
-                        print(f"⚠️ No preferences found for {normalized_phone} - using defaults")
+                        logger.warning("⚠️ No preferences found for %s - using defaults", normalized_phone)
             except Exception as e:
-                print(f"⚠️ Error loading preferences: {e}")
+                logger.warning("⚠️ Error loading preferences: %s", e)
         
+        # Meals don't depend on the swap suggestions - start the meal GPT call now so
+        # it runs concurrently with the swap request below instead of after it
+        meals_task = None
+        meal_preferences = {}
+        if fresh_scrape and cart_data and normalized_phone:
+            try:
+                from services.meal_generator import generate_meals
+                meal_user_record = db.get_user_by_phone(normalized_phone)
+                meal_preferences = meal_user_record.get('preferences', {}) if meal_user_record else {}
+                meals_task = asyncio.create_task(generate_meals(cart_data, preferences=meal_preferences))
+            except Exception as meal_error:
+                logger.warning("⚠️ Error starting meal generation for fresh cart: %s", meal_error)
+
         # Use GPT-5 to generate smart swaps and add-ons
         swaps_start_time = time.time()
         elapsed = swaps_start_time - api_start_time
-        print(f"⏱️ [T+{elapsed:.1f}s] Starting swap generation...")
+        logger.info("⏱️ [T+%.1fs] Starting swap generation...", elapsed)
 
         # Check both arrays for boxes with alternatives (fixed from only checking customizable_boxes)
         has_alternatives = False
@@ -1689,12 +1645,10 @@ async def analyze_cart_api(request: Request, background_tasks: BackgroundTasks):
         if has_alternatives:
             gpt_swap_start = time.time()
             try:
-                import openai
                 openai_key = os.getenv("OPENAI_API_KEY")
                 if openai_key:
-                    client = openai.OpenAI(api_key=openai_key)
                     elapsed = time.time() - api_start_time
-                    print(f"⏱️ [T+{elapsed:.1f}s] Building GPT-5 swap prompt...")
+                    logger.info("⏱️ [T+%.1fs] Building GPT-5 swap prompt...", elapsed)
 
                     # Build context for GPT-5
                     selected_items = []
@@ -1734,9 +1688,9 @@ async def analyze_cart_api(request: Request, background_tasks: BackgroundTasks):
 
                             recent_swaps = db.get_swap_history(normalized_phone, date_part, limit=5)
                             if recent_swaps:
-                                print(f"📋 Found {len(recent_swaps)} recent swaps for this delivery")
+                                logger.info("📋 Found %s recent swaps for this delivery", len(recent_swaps))
                         except Exception as swap_error:
-                            print(f"⚠️ Could not retrieve swap history: {swap_error}")
+                            logger.warning("⚠️ Could not retrieve swap history: %s", swap_error)
 
                     prompt = f"""Analyze this Farm to People cart and suggest smart swaps and fresh add-ons.
 
@@ -1792,120 +1746,110 @@ Return JSON format (generate appropriate suggestions based on cart):
 }}
 """
 
-                    # Build parameters compatible with the specific model
-                    # Use higher token limit for GPT-5 to account for reasoning tokens
-                    token_limit = 1200 if AI_MODEL.lower().startswith("gpt-5") else 500
-                    api_params = build_api_params(AI_MODEL, max_tokens_value=token_limit, temperature_value=0.7)
-                    print(f"📝 [CART ANALYSIS DEBUG] Using token limit: {token_limit} for {AI_MODEL}")
+                    logger.debug("📝 [CART ANALYSIS DEBUG] Using token limit: %s for %s", SWAP_TOKEN_LIMIT, AI_MODEL)
 
                     elapsed = time.time() - api_start_time
-                    print(f"⏱️ [T+{elapsed:.1f}s] Calling GPT-5 API for swaps...")
+                    logger.info("⏱️ [T+%.1fs] Calling GPT-5 API for swaps...", elapsed)
 
-                    response = client.chat.completions.create(
+                    response = await call_gpt(
                         model=AI_MODEL,
                         messages=[
-                            {"role": "system", "content": "You are a Farm to People meal planning expert. Analyze carts and suggest smart improvements based on user preferences."},
+                            {"role": "system", "content": SWAP_SYSTEM_PROMPT},
                             {"role": "user", "content": prompt}
                         ],
-                        **api_params
+                        **SWAP_API_PARAMS
                     )
 
                     elapsed = time.time() - api_start_time
                     gpt_time = time.time() - gpt_swap_start
-                    print(f"⏱️ [T+{elapsed:.1f}s] GPT-5 swap response received (API took {gpt_time:.1f}s)")
+                    logger.info("⏱️ [T+%.1fs] GPT-5 swap response received (API took %.1fs)", elapsed, gpt_time)
                     
                     # Parse response (swaps only now)
-                    import json
-                    import re
-                    gpt_response = response.choices[0].message.content.strip()
-                    json_match = re.search(r'\{.*\}', gpt_response, re.DOTALL)
-                    if json_match:
-                        result = json.loads(json_match.group())
+                    result = parse_swap_response(response.choices[0].message.content)
+                    if result is not None:
                         swaps = result.get("swaps", [])
                         elapsed = time.time() - api_start_time
-                        print(f"⏱️ [T+{elapsed:.1f}s] Generated {len(swaps)} swaps via GPT-5")
+                        logger.info("⏱️ [T+%.1fs] Generated %s swaps via GPT-5", elapsed, len(swaps))
                     
             except Exception as e:
-                print(f"⚠️ Could not generate AI swaps: {e}")
+                logger.warning("⚠️ Could not generate AI swaps: %s", e)
                 # Return empty swaps/addons rather than hardcoded ones
                 pass
         
         # Handle meal suggestions
         meals_start_time = time.time()
         elapsed = meals_start_time - api_start_time
-        print(f"⏱️ [T+{elapsed:.1f}s] Starting meal generation phase...")
+        logger.info("⏱️ [T+%.1fs] Starting meal generation phase...", elapsed)
 
         meals = None
-        if fresh_scrape and cart_data and normalized_phone:
-            # Fresh scrape - generate new meals automatically
+        if meals_task is not None:
+            # Fresh scrape - meal suggestions were started alongside the swaps
             meal_gen_start = time.time()
             try:
-                from services.meal_generator import generate_meals
-                user_record = db.get_user_by_phone(normalized_phone)
-                user_preferences = user_record.get('preferences', {}) if user_record else {}
+                user_preferences = meal_preferences
 
                 elapsed = time.time() - api_start_time
-                print(f"⏱️ [T+{elapsed:.1f}s] Fresh cart data detected - generating meal suggestions with GPT-5")
-                result = await generate_meals(cart_data, preferences=user_preferences)
+                logger.info("⏱️ [T+%.1fs] Fresh cart data detected - waiting on meal suggestions from GPT-5", elapsed)
+                result = await meals_task
                 if result['success']:
                     meals = result['meals']
                     elapsed = time.time() - api_start_time
                     meal_gen_time = time.time() - meal_gen_start
-                    print(f"⏱️ [T+{elapsed:.1f}s] Meal generation complete - {len(meals)} meals (took {meal_gen_time:.1f}s)")
+                    logger.info("⏱️ [T+%.1fs] Meal generation complete - %s meals (took %.1fs)", elapsed, len(meals), meal_gen_time)
 
                     # Cache the newly generated meals
                     cache_start = time.time()
                     from services.cache_service import CacheService
                     CacheService.set_meals(normalized_phone, meals, ttl=7200)
                     elapsed = time.time() - api_start_time
-                    print(f"⏱️ [T+{elapsed:.1f}s] Cached meals to Redis (took {time.time() - cache_start:.2f}s)")
+                    logger.info("⏱️ [T+%.1fs] Cached meals to Redis (took %.2fs)", elapsed, time.time() - cache_start)
 
                     # Initialize meal locks data structure
                     try:
                         meal_count = len([m for m in meals if m.get('type') != 'snack'])
                         snack_count = len([m for m in meals if m.get('type') == 'snack'])
                         CacheService.initialize_meal_locks(normalized_phone, meals, cart_data, meal_count, snack_count)
-                        print(f"🔒 Initialized meal locks for {len(meals)} meals ({meal_count} meals, {snack_count} snacks)")
+                        logger.info("🔒 Initialized meal locks for %s meals (%s meals, %s snacks)", len(meals), meal_count, snack_count)
                     except Exception as lock_error:
-                        print(f"⚠️ Error initializing meal locks: {lock_error}")
+                        logger.warning("⚠️ Error initializing meal locks: %s", lock_error)
 
                     # Generate meal-aware add-ons after meals are created
                     addons_start = time.time()
                     try:
                         elapsed = time.time() - api_start_time
-                        print(f"⏱️ [T+{elapsed:.1f}s] Generating meal-aware add-ons...")
+                        logger.info("⏱️ [T+%.1fs] Generating meal-aware add-ons...", elapsed)
                         from services.meal_generator import generate_meal_addons
                         addons = await generate_meal_addons(meals, cart_data, user_preferences)
                         elapsed = time.time() - api_start_time
                         addons_time = time.time() - addons_start
-                        print(f"⏱️ [T+{elapsed:.1f}s] Generated {len(addons)} meal-aware add-ons (took {addons_time:.1f}s)")
+                        logger.info("⏱️ [T+%.1fs] Generated %s meal-aware add-ons (took %.1fs)", elapsed, len(addons), addons_time)
                     except Exception as addon_error:
-                        print(f"⚠️ Error generating add-ons: {addon_error}")
+                        logger.warning("⚠️ Error generating add-ons: %s", addon_error)
                         # Fallback to basic add-ons
                         addons = [
                             {"item": "Fresh Italian Parsley", "price": "$2.50", "reason": "Versatile herb for garnishing", "category": "produce"},
                             {"item": "Fresh Lemons", "price": "$3.00", "reason": "Brightens any dish", "category": "produce"}
                         ]
                 else:
-                    print(f"⚠️ Failed to generate meals: {result.get('error', 'Unknown error')}")
+                    logger.warning("⚠️ Failed to generate meals: %s", result.get('error', 'Unknown error'))
             except Exception as meal_error:
-                print(f"⚠️ Error generating meals for fresh cart: {meal_error}")
+                logger.warning("⚠️ Error generating meals for fresh cart: %s", meal_error)
         elif not fresh_scrape and normalized_phone:
             # Page refresh - load cached meals
             try:
                 from services.cache_service import CacheService
                 meals = CacheService.get_meals(normalized_phone)
                 if meals:
-                    print(f"💾 Loaded {len(meals)} cached meals from Redis")
+                    logger.info("💾 Loaded %s cached meals from Redis", len(meals))
                 else:
-                    print(f"📦 No cached meals found for {normalized_phone}")
+                    logger.info("📦 No cached meals found for %s", normalized_phone)
             except Exception as cache_error:
-                print(f"⚠️ Error loading cached meals: {cache_error}")
+                logger.warning("⚠️ Error loading cached meals: %s", cache_error)
 
         # Build complete response
         response_start = time.time()
         elapsed = response_start - api_start_time
-        print(f"⏱️ [T+{elapsed:.1f}s] Building complete response...")
+        logger.info("⏱️ [T+%.1fs] Building complete response...", elapsed)
 
         complete_response = {
             "success": True,
@@ -1947,9 +1891,9 @@ Return JSON format (generate appropriate suggestions based on cart):
                 from services.cache_service import CacheService
                 CacheService.set_cart_response(normalized_phone, complete_response, ttl=7200)
                 elapsed = time.time() - api_start_time
-                print(f"⏱️ [T+{elapsed:.1f}s] Complete cart response cached to Redis (took {time.time() - redis_cache_start:.2f}s)")
+                logger.info("⏱️ [T+%.1fs] Complete cart response cached to Redis (took %.2fs)", elapsed, time.time() - redis_cache_start)
             except Exception as cache_error:
-                print(f"⚠️ Complete response cache failed (non-critical): {cache_error}")
+                logger.warning("⚠️ Complete response cache failed (non-critical): %s", cache_error)
 
             # Save analysis to database for persistence beyond Redis TTL
             db_save_start = time.time()
@@ -1970,11 +1914,11 @@ Return JSON format (generate appropriate suggestions based on cart):
                     metadata=metadata
                 )
                 elapsed = time.time() - api_start_time
-                print(f"⏱️ [T+{elapsed:.1f}s] Cart analysis persisted to database (took {time.time() - db_save_start:.2f}s)")
+                logger.info("⏱️ [T+%.1fs] Cart analysis persisted to database (took %.2fs)", elapsed, time.time() - db_save_start)
             except Exception as db_error:
-                print(f"⚠️ Database save failed (non-critical): {db_error}")
+                logger.warning("⚠️ Database save failed (non-critical): %s", db_error)
         elif normalized_phone:
-            print(f"⚠️ Skipping cache - invalid cart_data structure (missing selected_items in customizable boxes)")
+            logger.warning("⚠️ Skipping cache - invalid cart_data structure (missing selected_items in customizable boxes)")
 
         total_elapsed = time.time() - api_start_time
         # Calculate scrape_elapsed (was undefined causing NameError)
@@ -1982,14 +1926,13 @@ Return JSON format (generate appropriate suggestions based on cart):
         if 'scrape_start_time' in locals():
             scrape_elapsed = scrape_end_time - scrape_start_time if 'scrape_end_time' in locals() else 0
 
-        print(f"""⏱️ [T+{total_elapsed:.1f}s] ====== TOTAL API PROCESSING TIME ======
-        Breakdown:
-        - Scraping: {scrape_elapsed:.1f}s
-        - Swaps: {time.time() - swaps_start_time:.1f}s
-        - Meals: {time.time() - meals_start_time:.1f}s
-        - Cache ops: {time.time() - cache_operations_start:.1f}s
-        - Total: {total_elapsed:.1f}s
-        =========================================""")
+        now = time.time()
+        logger.info(
+            "⏱️ [T+%.1fs] TOTAL API PROCESSING TIME - scraping: %.1fs, swaps: %.1fs, "
+            "meals: %.1fs, cache ops: %.1fs, total: %.1fs",
+            total_elapsed, scrape_elapsed, now - swaps_start_time, now - meals_start_time,
+            now - cache_operations_start, total_elapsed
+        )
 
         return complete_response
         
@@ -2003,14 +1946,16 @@ async def refresh_meal_suggestions(request: Request):
     
     This allows users to get different meal ideas without re-analyzing their cart.
     Limited to prevent abuse (track refresh count on frontend).
+    Pass include_quick_meal to also get the simple meal card from the same GPT call.
     """
-    from services.meal_generator import generate_meals
+    from services.meal_generator import generate_meals, generate_meals_bundle
     from services.phone_service import normalize_phone
     
     try:
         data = await request.json()
         cart_data = data.get('cart_data')
         phone = data.get('phone')
+        include_quick_meal = bool(data.get('include_quick_meal'))
         
         if not cart_data:
             return {"success": False, "error": "No cart data provided"}
@@ -2023,41 +1968,131 @@ async def refresh_meal_suggestions(request: Request):
                 user_record = db.get_user_by_phone(normalized_phone)
                 if user_record:
                     user_preferences = user_record.get('preferences', {})
-                    print(f"✅ Loaded preferences for meal refresh")
+                    logger.info("✅ Loaded preferences for meal refresh")
         
-        # Use meal generator service
-        result = await generate_meals(cart_data, preferences=user_preferences)
+        # Use meal generator service - skip the response cache, the user wants new ideas
+        generate = generate_meals_bundle if include_quick_meal else generate_meals
+        result = await generate(cart_data, preferences=user_preferences, use_cache=False)
 
         if result['success']:
             # Cache the newly generated meals to Redis
             try:
                 from services.cache_service import CacheService
                 CacheService.set_meals(normalized_phone, result['meals'], ttl=7200)
-                print(f"🔥 Cached {len(result['meals'])} refreshed meals to Redis")
+                logger.info("🔥 Cached %s refreshed meals to Redis", len(result['meals']))
 
                 # Re-initialize meal locks data structure (clears existing locks)
                 meal_count = len([m for m in result['meals'] if m.get('type') != 'snack'])
                 snack_count = len([m for m in result['meals'] if m.get('type') == 'snack'])
                 CacheService.initialize_meal_locks(normalized_phone, result['meals'], cart_data, meal_count, snack_count)
-                print(f"🔒 Re-initialized meal locks for {len(result['meals'])} refreshed meals")
+                logger.info("🔒 Re-initialized meal locks for %s refreshed meals", len(result['meals']))
             except Exception as cache_error:
-                print(f"⚠️ Failed to cache refreshed meals or initialize locks: {cache_error}")
+                logger.warning("⚠️ Failed to cache refreshed meals or initialize locks: %s", cache_error)
 
-            return {
+            response = {
                 "success": True,
                 "meals": result['meals'],
                 "household_size": user_preferences.get('household_size', '2 people')
             }
+            if include_quick_meal:
+                response["quick_meal"] = result.get('quick_meal')
+            return response
         else:
             return result
         
     except Exception as e:
-        print(f"❌ Error in refresh meals: {e}")
+        logger.error("❌ Error in refresh meals: %s", e)
         return {"success": False, "error": str(e)}
 
+@app.post("/api/refresh-meals/stream")
+async def refresh_meal_suggestions_stream(request: Request):
+    """
+    Streaming version of /api/refresh-meals (Server-Sent Events).
+
+    Emits one `data: {...}` event per meal/snack as GPT finishes writing it, then
+    a final done/error event - the Meals tab can render meal #1 while the rest
+    are still generating instead of waiting for the whole response.
+    """
+    from services.meal_generator import generate_meals_stream
+    from services.phone_service import normalize_phone
+
+    data = await request.json()
+    cart_data = data.get('cart_data')
+    phone = data.get('phone')
+
+    normalized_phone = normalize_phone(phone) if phone else None
+    user_preferences = {}
+    if normalized_phone:
+        user_record = db.get_user_by_phone(normalized_phone)
+        if user_record:
+            user_preferences = user_record.get('preferences', {})
+
+    async def event_stream():
+        if not cart_data:
+            yield b"data: " + orjson.dumps({"event": "error", "error": "No cart data provided"}) + b"\n\n"
+            return
+
+        meals = []
+        async for event in generate_meals_stream(cart_data, preferences=user_preferences):
+            if event["event"] == "suggestion":
+                meals.append(event["meal"])
+            elif event["event"] == "done" and meals and normalized_phone:
+                # Same caching as the non-streaming refresh, once the full set is known
+                try:
+                    from services.cache_service import CacheService
+                    CacheService.set_meals(normalized_phone, meals, ttl=7200)
+                    CacheService.initialize_meal_locks(
+                        normalized_phone, meals, cart_data, event["meal_count"], event["snack_count"]
+                    )
+                except Exception as cache_error:
+                    logger.warning("⚠️ Failed to cache streamed meals or initialize locks: %s", cache_error)
+                event["household_size"] = user_preferences.get('household_size', '2 people')
+            yield b"data: " + orjson.dumps(event) + b"\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # OLD CODE REMOVED - Meal generation logic moved to services/meal_generator.py
 # The refresh-meals endpoint now uses the meal_generator service
 
+@app.post("/api/regenerate-simple-meal/stream")
+async def regenerate_simple_meal_stream(request: Request):
+    """
+    Streaming version of /api/regenerate-simple-meal (Server-Sent Events).
+
+    Emits the partial meal as each field arrives (the name first), then the
+    final meal - the card can show the meal name before GPT finishes.
+    """
+    from services.meal_generator import generate_single_meal_stream
+    from services.phone_service import normalize_phone
+
+    data = await request.json()
+    cart_data = data.get('cart_data')
+    phone = data.get('phone')
+
+    user_preferences = {}
+    normalized_phone = normalize_phone(phone) if phone else None
+    if normalized_phone:
+        user_record = db.get_user_by_phone(normalized_phone)
+        if user_record:
+            user_preferences = user_record.get('preferences', {})
+
+    async def event_stream():
+        if not cart_data:
+            yield b"data: " + orjson.dumps({"event": "error", "error": "No cart data provided"}) + b"\n\n"
+            return
+        async for event in generate_single_meal_stream(cart_data, user_preferences):
+            yield b"data: " + orjson.dumps(event) + b"\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/api/regenerate-simple-meal")
 async def regenerate_simple_meal(request: Request):
     """
@@ -2086,8 +2121,8 @@ async def regenerate_simple_meal(request: Request):
                 if user_record:
                     user_preferences = user_record.get('preferences', {})
 
-        # Generate a single meal using available ingredients
-        result = await generate_single_meal(cart_data, user_preferences)
+        # Generate a single meal using available ingredients (fresh each click, no response cache)
+        result = await generate_single_meal(cart_data, user_preferences, use_cache=False)
 
         if result['success']:
             return {
@@ -2099,7 +2134,7 @@ async def regenerate_simple_meal(request: Request):
             return result
 
     except Exception as e:
-        print(f"❌ Error regenerating simple meal: {e}")
+        logger.error("❌ Error regenerating simple meal: %s", e)
         return {"success": False, "error": str(e)}
 
 @app.get("/onboard")
@@ -2232,18 +2267,18 @@ async def get_user_preferences(phone: str):
         # For backward compatibility, also check variants
         phone_formats = get_phone_variants(phone)
             
-        print(f"🔍 Looking up user preferences for phone formats: {phone_formats}")
+        logger.info("🔍 Looking up user preferences for phone formats: %s", phone_formats)
         
         # Try each format until we find the user
         user_record = None
         for phone_format in phone_formats:
             user_record = db.get_user_by_phone(phone_format)
             if user_record:
-                print(f"  ✅ Found user with format: {phone_format}")
+                logger.info("  ✅ Found user with format: %s", phone_format)
                 break
         
         if not user_record:
-            print("  ❌ User not found with any phone format")
+            logger.error("  ❌ User not found with any phone format")
             return {"success": False, "error": "User not found"}
         
         preferences = user_record.get('preferences', {})
@@ -2301,9 +2336,9 @@ async def update_user_preferences(phone: str, request: Request):
     try:
         # Log incoming request for debugging
         data = await request.json()
-        print(f"📝 Settings update request for phone: {phone}")
-        print(f"   Category: {data.get('category')}")
-        print(f"   Value: {data.get('value')}")
+        logger.info("📝 Settings update request for phone: %s", phone)
+        logger.debug("   Category: %s", data.get('category'))
+        logger.debug("   Value: %s", data.get('value'))
         
         # Try multiple phone formats to find user
         phone_formats = [phone]
@@ -2326,11 +2361,11 @@ async def update_user_preferences(phone: str, request: Request):
             user_record = db.get_user_by_phone(phone_format)
             if user_record:
                 phone = phone_format  # Use the format that worked
-                print(f"✅ Found user with phone format: {phone_format}")
+                logger.info("✅ Found user with phone format: %s", phone_format)
                 break
         
         if not user_record:
-            print(f"❌ User not found with any phone format: {phone_formats}")
+            logger.error("❌ User not found with any phone format: %s", phone_formats)
             return {"success": False, "error": "User not found"}
         
         # Get current preferences
@@ -2364,14 +2399,14 @@ async def update_user_preferences(phone: str, request: Request):
         )
 
         if updated_record:
-            print(f"✅ Successfully updated preferences for {phone}")
+            logger.info("✅ Successfully updated preferences for %s", phone)
             return {
                 "success": True,
                 "message": "Preferences updated successfully",
                 "preferences": current_preferences
             }
         else:
-            print(f"❌ Failed to update preferences for {phone}")
+            logger.error("❌ Failed to update preferences for %s", phone)
             return {"success": False, "error": "Failed to update preferences in database"}
         
     except Exception as e:
@@ -2420,7 +2455,7 @@ async def get_meal_locks(phone: str):
         }
 
     except Exception as e:
-        print(f"❌ Get meal locks error: {e}")
+        logger.error("❌ Get meal locks error: %s", e)
         return {"success": False, "error": str(e)}
 
 
@@ -2463,7 +2498,7 @@ async def toggle_meal_lock(request: Request):
             locked_ingredients = CacheService.get_locked_ingredients(normalized_phone)
 
             action = "locked" if locked else "unlocked"
-            print(f"✅ Meal {index} {action} for {normalized_phone}")
+            logger.info("✅ Meal %s %s for %s", index, action, normalized_phone)
 
             return {
                 "success": True,
@@ -2477,7 +2512,7 @@ async def toggle_meal_lock(request: Request):
             return {"success": False, "error": "Failed to update meal lock"}
 
     except Exception as e:
-        print(f"❌ Toggle meal lock error: {e}")
+        logger.error("❌ Toggle meal lock error: %s", e)
         return {"success": False, "error": str(e)}
 
 
@@ -2503,7 +2538,7 @@ async def clear_meal_locks(phone: str):
         success = CacheService.clear_meal_locks(normalized_phone)
 
         if success:
-            print(f"✅ Cleared all meal locks for {normalized_phone}")
+            logger.info("✅ Cleared all meal locks for %s", normalized_phone)
             return {
                 "success": True,
                 "message": "All meal locks cleared successfully",
@@ -2513,7 +2548,7 @@ async def clear_meal_locks(phone: str):
             return {"success": False, "error": "Failed to clear meal locks"}
 
     except Exception as e:
-        print(f"❌ Clear meal locks error: {e}")
+        logger.error("❌ Clear meal locks error: %s", e)
         return {"success": False, "error": str(e)}
 
 
@@ -2545,7 +2580,7 @@ async def get_locked_ingredients(phone: str):
         }
 
     except Exception as e:
-        print(f"❌ Get locked ingredients error: {e}")
+        logger.error("❌ Get locked ingredients error: %s", e)
         return {"success": False, "error": str(e)}
 
 
@@ -2583,7 +2618,7 @@ async def get_meal_locks_data(phone: str):
             }
 
     except Exception as e:
-        print(f"❌ Get meal locks data error: {e}")
+        logger.error("❌ Get meal locks data error: %s", e)
         return {"success": False, "error": str(e)}
 
 
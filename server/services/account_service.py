@@ -6,11 +6,14 @@ Extracted from server.py to isolate account logic.
 """
 
 import os
+import logging
 import base64
 from typing import Dict, Any, Optional
 from services.phone_service import normalize_phone
 import supabase_client as db
 
+logger = logging.getLogger(__name__)
+
 
 def lookup_user_account(phone: str) -> Dict[str, Any]:
     """
@@ -35,13 +38,13 @@ def lookup_user_account(phone: str) -> Dict[str, Any]:
             "user_data": None
         }
     
-    print(f"🔍 Looking up user account for: {normalized_phone}")
+    logger.info("🔍 Looking up user account for: %s", normalized_phone)
     
     try:
         user_data = db.get_user_by_phone(normalized_phone)
         
         if not user_data:
-            print(f"❌ No user found for phone: {normalized_phone}")
+            logger.error("❌ No user found for phone: %s", normalized_phone)
             return {
                 "success": False,
                 "error": "Account not found. Please register first.",
@@ -49,11 +52,11 @@ def lookup_user_account(phone: str) -> Dict[str, Any]:
                 "user_data": None
             }
         
-        print(f"✅ User found: {user_data.get('ftp_email')}")
+        logger.info("✅ User found: %s", user_data.get('ftp_email'))
         
         # CRITICAL: Verify this data belongs to the requested phone
         if user_data.get('phone_number') and normalize_phone(user_data['phone_number']) != normalized_phone:
-            print(f"🚨 SECURITY ALERT: Data mismatch! Requested {normalized_phone}, got {user_data['phone_number']}")
+            logger.error("🚨 SECURITY ALERT: Data mismatch! Requested %s, got %s", normalized_phone, user_data['phone_number'])
             return {
                 "success": False,
                 "error": "Data integrity error",
@@ -84,9 +87,9 @@ def lookup_user_account(phone: str) -> Dict[str, Any]:
                         'password': password
                     }
                 else:
-                    print(f"⚠️ Could not decrypt password")
+                    logger.warning("⚠️ Could not decrypt password")
             except Exception as e:
-                print(f"⚠️ Error decrypting password: {e}")
+                logger.warning("⚠️ Error decrypting password: %s", e)
         
         return {
             "success": True,
@@ -96,7 +99,7 @@ def lookup_user_account(phone: str) -> Dict[str, Any]:
         }
         
     except Exception as e:
-        print(f"❌ Error looking up user: {e}")
+        logger.error("❌ Error looking up user: %s", e)
         return {
             "success": False,
             "error": str(e),
@@ -7,10 +7,13 @@ Works with Railway's Redis service.
 
 import os
 import json
+import logging
 import redis
 from typing import Any, Optional
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 
 # Initialize Redis connection
 # Railway automatically provides REDIS_URL when you add Redis service
@@ -20,12 +23,12 @@ if REDIS_URL:
     try:
         redis_client = redis.from_url(REDIS_URL, decode_responses=True)
         redis_client.ping()
-        print("✅ Redis connected successfully")
+        logger.info("✅ Redis connected successfully")
     except Exception as e:
-        print(f"⚠️ Redis connection failed: {e}")
+        logger.warning("⚠️ Redis connection failed: %s", e)
         redis_client = None
 else:
-    print("ℹ️ Redis not configured (REDIS_URL not found)")
+    logger.info("ℹ️ Redis not configured (REDIS_URL not found)")
     redis_client = None
 
 
@@ -56,10 +59,10 @@ class CacheService:
         try:
             cached = redis_client.get(f"cart:{phone}")
             if cached:
-                print(f"✅ Cache hit for cart:{phone}")
+                logger.info("✅ Cache hit for cart:%s", phone)
                 return json.loads(cached)
         except Exception as e:
-            print(f"⚠️ Cache get error: {e}")
+            logger.warning("⚠️ Cache get error: %s", e)
         
         return None
     
@@ -82,9 +85,9 @@ class CacheService:
                 ttl,
                 json.dumps(cart_data)
             )
-            print(f"✅ Cached cart:{phone} for {ttl} seconds")
+            logger.info("✅ Cached cart:%s for %s seconds", phone, ttl)
         except Exception as e:
-            print(f"⚠️ Cache set error: {e}")
+            logger.warning("⚠️ Cache set error: %s", e)
 
     @staticmethod
     def set_cart_response(phone: str, cart_response: dict, ttl: int = 7200):
@@ -105,9 +108,9 @@ class CacheService:
                 ttl,
                 json.dumps(cart_response)
             )
-            print(f"✅ Cached complete cart response:{phone} for {ttl} seconds")
+            logger.info("✅ Cached complete cart response:%s for %s seconds", phone, ttl)
         except Exception as e:
-            print(f"⚠️ Cart response cache set error: {e}")
+            logger.warning("⚠️ Cart response cache set error: %s", e)
 
     @staticmethod
     def get_cart_response(phone: str) -> Optional[dict]:
@@ -126,10 +129,10 @@ class CacheService:
         try:
             cached = redis_client.get(f"cart_response:{phone}")
             if cached:
-                print(f"✅ Cache hit for cart_response:{phone}")
+                logger.info("✅ Cache hit for cart_response:%s", phone)
                 return json.loads(cached)
         except Exception as e:
-            print(f"⚠️ Cart response cache get error: {e}")
+            logger.warning("⚠️ Cart response cache get error: %s", e)
 
         return None
 
@@ -146,9 +149,9 @@ class CacheService:
 
         try:
             redis_client.delete(f"cart_response:{phone}")
-            print(f"✅ Invalidated cart response cache for cart_response:{phone}")
+            logger.info("✅ Invalidated cart response cache for cart_response:%s", phone)
         except Exception as e:
-            print(f"⚠️ Cart response cache delete error: {e}")
+            logger.warning("⚠️ Cart response cache delete error: %s", e)
 
     @staticmethod
     def invalidate_cart(phone: str):
@@ -163,9 +166,9 @@ class CacheService:
         
         try:
             redis_client.delete(f"cart:{phone}")
-            print(f"✅ Invalidated cache for cart:{phone}")
+            logger.info("✅ Invalidated cache for cart:%s", phone)
         except Exception as e:
-            print(f"⚠️ Cache delete error: {e}")
+            logger.warning("⚠️ Cache delete error: %s", e)
     
     @staticmethod
     def get_meal_plan(phone: str) -> Optional[dict]:
@@ -178,7 +181,7 @@ class CacheService:
             if cached:
                 return json.loads(cached)
         except Exception as e:
-            print(f"⚠️ Cache get error: {e}")
+            logger.warning("⚠️ Cache get error: %s", e)
         
         return None
     
@@ -194,19 +197,19 @@ class CacheService:
                 ttl,
                 json.dumps(meals)
             )
-            print(f"✅ Cached meals:{phone} for {ttl} seconds")
+            logger.info("✅ Cached meals:%s for %s seconds", phone, ttl)
         except Exception as e:
-            print(f"⚠️ Cache set error: {e}")
+            logger.warning("⚠️ Cache set error: %s", e)
     
     @staticmethod
     def set_meals(phone_number: str, meals: list, ttl: int = 7200) -> bool:
         """Cache meal suggestions to Redis (convenience method)"""
         try:
             CacheService.set_meal_plan(phone_number, meals, ttl)
-            print(f"✅ Cached {len(meals)} meals to Redis for {phone_number}")
+            logger.info("✅ Cached %s meals to Redis for %s", len(meals), phone_number)
             return True
         except Exception as e:
-            print(f"❌ Failed to cache meals: {e}")
+            logger.error("❌ Failed to cache meals: %s", e)
             return False
 
     @staticmethod
@@ -220,10 +223,10 @@ class CacheService:
                     meals = cached_meals
                 else:
                     meals = cached_meals.get('meals', cached_meals)
-                print(f"⚡ Retrieved {len(meals)} cached meals from Redis")
+                logger.info("⚡ Retrieved %s cached meals from Redis", len(meals))
                 return meals
         except Exception as e:
-            print(f"❌ Failed to get cached meals: {e}")
+            logger.error("❌ Failed to get cached meals: %s", e)
         return None
 
     @staticmethod
@@ -248,9 +251,9 @@ class CacheService:
                 ttl,
                 json.dumps(session_data)
             )
-            print(f"✅ Cached browser session for {phone} ({ttl//60} min TTL)")
+            logger.info("✅ Cached browser session for %s (%s min TTL)", phone, ttl//60)
         except Exception as e:
-            print(f"⚠️ Session cache set error: {e}")
+            logger.warning("⚠️ Session cache set error: %s", e)
 
     @staticmethod
     def get_browser_session(phone: str, email: str) -> Optional[dict]:
@@ -268,13 +271,13 @@ class CacheService:
                 session_data = json.loads(cached)
                 # Validate email matches (security check)
                 if session_data.get('email') == email:
-                    print(f"✅ Retrieved cached browser session for {phone}")
+                    logger.info("✅ Retrieved cached browser session for %s", phone)
                     return session_data
                 else:
-                    print(f"🚨 Session email mismatch for {phone} - invalidating")
+                    logger.error("🚨 Session email mismatch for %s - invalidating", phone)
                     redis_client.delete(session_key)
         except Exception as e:
-            print(f"⚠️ Session cache get error: {e}")
+            logger.warning("⚠️ Session cache get error: %s", e)
 
         return None
 
@@ -289,9 +292,9 @@ class CacheService:
             email_hash = hashlib.md5(email.lower().encode()).hexdigest()[:8]
             session_key = f"browser_session:{phone}:{email_hash}"
             redis_client.delete(session_key)
-            print(f"🗑️ Invalidated browser session for {phone}")
+            logger.info("🗑️ Invalidated browser session for %s", phone)
         except Exception as e:
-            print(f"⚠️ Session invalidation error: {e}")
+            logger.warning("⚠️ Session invalidation error: %s", e)
 
     @staticmethod
     def get_stats():
@@ -310,6 +313,51 @@ class CacheService:
         except:
             return {"available": False}
 
+    # ===== LLM RESPONSE CACHE =====
+
+    @staticmethod
+    def get_llm_response(key: str) -> Optional[dict]:
+        """
+        Get a cached GPT response.
+
+        Args:
+            key: Cache key built from the request inputs (see meal_generator.llm_cache_key)
+
+        Returns:
+            Cached response dict or None if not cached
+        """
+        if not redis_client:
+            return None
+
+        try:
+            cached = redis_client.get(key)
+            if cached:
+                logger.info("✅ Cache hit for %s...", key[:24])
+                return json.loads(cached)
+        except Exception as e:
+            logger.warning("⚠️ LLM cache get error: %s", e)
+
+        return None
+
+    @staticmethod
+    def set_llm_response(key: str, response: dict, ttl: int = 3600):
+        """
+        Cache a GPT response.
+
+        Args:
+            key: Cache key built from the request inputs
+            response: Response dict to cache
+            ttl: Time to live in seconds (default 1 hour)
+        """
+        if not redis_client:
+            return
+
+        try:
+            redis_client.setex(key, ttl, json.dumps(response))
+            logger.info("✅ Cached %s... for %s seconds", key[:24], ttl)
+        except Exception as e:
+            logger.warning("⚠️ LLM cache set error: %s", e)
+
     # ===== MEAL LOCKING METHODS =====
 
     @staticmethod
@@ -329,10 +377,10 @@ class CacheService:
         try:
             cached = redis_client.get(f"user_meals:{phone}")
             if cached:
-                print(f"✅ Retrieved meal locks data for {phone}")
+                logger.info("✅ Retrieved meal locks data for %s", phone)
                 return json.loads(cached)
         except Exception as e:
-            print(f"⚠️ Meal locks get error: {e}")
+            logger.warning("⚠️ Meal locks get error: %s", e)
 
         return None
 
@@ -359,9 +407,9 @@ class CacheService:
                 ttl,
                 json.dumps(meal_data)
             )
-            print(f"✅ Cached meal locks data for {phone} (24h TTL)")
+            logger.info("✅ Cached meal locks data for %s (24h TTL)", phone)
         except Exception as e:
-            print(f"⚠️ Meal locks set error: {e}")
+            logger.warning("⚠️ Meal locks set error: %s", e)
 
     @staticmethod
     def get_meal_locks(phone: str) -> list:
@@ -399,7 +447,7 @@ class CacheService:
             # Get current meal data
             meal_data = CacheService.get_meal_locks_data(phone)
             if not meal_data:
-                print(f"⚠️ No meal data found for {phone} - cannot set lock")
+                logger.warning("⚠️ No meal data found for %s - cannot set lock", phone)
                 return False
 
             # Ensure locked_status array exists and is properly sized
@@ -447,11 +495,11 @@ class CacheService:
             CacheService.set_meal_locks_data(phone, meal_data)
 
             action = "locked" if locked else "unlocked"
-            print(f"✅ Meal {index} {action} for {phone}")
+            logger.info("✅ Meal %s %s for %s", index, action, phone)
             return True
 
         except Exception as e:
-            print(f"⚠️ Set meal lock error: {e}")
+            logger.warning("⚠️ Set meal lock error: %s", e)
             return False
 
     @staticmethod
@@ -483,11 +531,11 @@ class CacheService:
             # Save updated data
             CacheService.set_meal_locks_data(phone, meal_data)
 
-            print(f"✅ Cleared all meal locks for {phone}")
+            logger.info("✅ Cleared all meal locks for %s", phone)
             return True
 
         except Exception as e:
-            print(f"⚠️ Clear meal locks error: {e}")
+            logger.warning("⚠️ Clear meal locks error: %s", e)
             return False
 
     @staticmethod
@@ -539,11 +587,11 @@ class CacheService:
             }
 
             CacheService.set_meal_locks_data(phone, meal_data)
-            print(f"✅ Initialized meal locks for {phone} with {len(generated_meals)} meals")
+            logger.info("✅ Initialized meal locks for %s with %s meals", phone, len(generated_meals))
             return True
 
         except Exception as e:
-            print(f"⚠️ Initialize meal locks error: {e}")
+            logger.warning("⚠️ Initialize meal locks error: %s", e)
             return False
 
     @staticmethod
@@ -559,9 +607,9 @@ class CacheService:
 
         try:
             redis_client.delete(f"user_meals:{phone}")
-            print(f"✅ Invalidated meal locks for {phone}")
+            logger.info("✅ Invalidated meal locks for %s", phone)
         except Exception as e:
-            print(f"⚠️ Meal locks invalidation error: {e}")
+            logger.warning("⚠️ Meal locks invalidation error: %s", e)
 
 
 # Simple helper functions for easy use
@@ -580,4 +628,4 @@ def clear_user_cache(phone: str):
     if redis_client:
         redis_client.delete(f"cart:{phone}")
         redis_client.delete(f"meals:{phone}")
-        print(f"✅ Cleared all caches for {phone}")
\ No newline at end of file
+        logger.info("✅ Cleared all caches for %s", phone)
\ No newline at end of file
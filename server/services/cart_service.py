@@ -4,16 +4,16 @@ Cart Service - Handles cart analysis and scraping
 Extracted from server.py to centralize cart operations.
 """
 
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+import logging
 
 from typing import Dict, Any, Optional
 from services.phone_service import normalize_phone
+from services.scraper_service import run_cart_scraper
 import supabase_client as db
-from scrapers.comprehensive_scraper import main as run_cart_scraper
 import base64
 
+logger = logging.getLogger(__name__)
+
 
 async def analyze_user_cart(phone: str, use_mock: bool = False, force_refresh: bool = False) -> Dict[str, Any]:
     """
@@ -41,13 +41,13 @@ async def analyze_user_cart(phone: str, use_mock: bool = False, force_refresh: b
             "debug_info": f"Could not normalize: {phone}"
         }
     
-    print(f"📞 Analyzing cart for: {normalized_phone}")
+    logger.info("📞 Analyzing cart for: %s", normalized_phone)
     
     # Check Redis cache first (unless force refresh)
     if not force_refresh:
         cached_cart = get_cached_cart(normalized_phone)
         if cached_cart:
-            print(f"⚡ Using cached cart data for {normalized_phone} (< 1 hour old)")
+            logger.info("⚡ Using cached cart data for %s (< 1 hour old)", normalized_phone)
             return {
                 "success": True,
                 "cart_data": cached_cart,
@@ -58,12 +58,12 @@ async def analyze_user_cart(phone: str, use_mock: bool = False, force_refresh: b
                 "preferences": {}
             }
     else:
-        print(f"🔄 Force refresh requested - skipping cache")
+        logger.info("🔄 Force refresh requested - skipping cache")
     
     # Try to get stored cart data (as fallback)
     stored_cart = db.get_latest_cart_data(normalized_phone)
     if stored_cart and stored_cart.get('cart_data'):
-        print(f"📦 Found stored cart data for {normalized_phone}")
+        logger.info("📦 Found stored cart data for %s", normalized_phone)
     
     cart_data = None
     
@@ -78,7 +78,7 @@ async def analyze_user_cart(phone: str, use_mock: bool = False, force_refresh: b
         password = base64.b64decode(encoded_pwd).decode('utf-8') if encoded_pwd else None
         
         if email and password:
-            print(f"🛒 Running live scraper for {email}")
+            logger.info("🛒 Running live scraper for %s", email)
             credentials = {'email': email, 'password': password}
             
             # Run the scraper
@@ -90,11 +90,11 @@ async def analyze_user_cart(phone: str, use_mock: bool = False, force_refresh: b
             )
             
             if cart_data:
-                print("✅ Successfully scraped live cart data!")
+                logger.info("✅ Successfully scraped live cart data!")
                 
                 # CRITICAL: Verify cart ownership
                 if not verify_cart_ownership(normalized_phone, cart_data):
-                    print(f"🚨 SECURITY: Cart data does not belong to {normalized_phone}")
+                    logger.error("🚨 SECURITY: Cart data does not belong to %s", normalized_phone)
                     return {
                         "success": False,
                         "error": "Cart ownership verification failed",
@@ -115,11 +115,11 @@ async def analyze_user_cart(phone: str, use_mock: bool = False, force_refresh: b
                     )
                     
                     if stored_has_customizable:
-                        print("✅ Using stored cart data (current cart appears locked)")
+                        logger.info("✅ Using stored cart data (current cart appears locked)")
                         cart_data = stored_cart['cart_data']
             elif stored_cart and stored_cart.get('cart_data'):
                 # Scraper failed, use stored data
-                print("✅ Using stored cart data as fallback")
+                logger.info("✅ Using stored cart data as fallback")
                 cart_data = stored_cart['cart_data']
     
     if not cart_data:
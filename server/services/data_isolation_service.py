@@ -6,9 +6,12 @@ Critical for preventing cross-user data contamination.
 """
 
 import hashlib
+import logging
 from typing import Dict, Any, Optional
 from services.phone_service import normalize_phone
 
+logger = logging.getLogger(__name__)
+
 
 class UserDataIsolation:
     """
@@ -77,7 +80,7 @@ class UserDataIsolation:
         # If data has phone field, validate it
         if 'phone_number' in data or 'phone' in data or 'user_phone' in data:
             if not UserDataIsolation.validate_data_ownership(allowed_phone, data):
-                print(f"⚠️ DATA ISOLATION: Blocked data not belonging to {normalized}")
+                logger.warning("⚠️ DATA ISOLATION: Blocked data not belonging to %s", normalized)
                 return {}
         
         # Recursively sanitize nested data
@@ -141,7 +144,7 @@ def verify_cart_ownership(phone: str, cart_data: Dict[str, Any]) -> bool:
     if cart_phone:
         cart_normalized = normalize_phone(cart_phone)
         if cart_normalized != normalized:
-            print(f"🚨 SECURITY: Cart data mismatch! Expected {normalized}, got {cart_normalized}")
+            logger.error("🚨 SECURITY: Cart data mismatch! Expected %s, got %s", normalized, cart_normalized)
             return False
     
     # Check if cart has email that matches user's FTP email
@@ -152,7 +155,7 @@ def verify_cart_ownership(phone: str, cart_data: Dict[str, Any]) -> bool:
         user_data = db.get_user_by_phone(normalized)
         if user_data and user_data.get('ftp_email'):
             if cart_email.lower() != user_data['ftp_email'].lower():
-                print(f"🚨 SECURITY: Cart email mismatch! Expected {user_data['ftp_email']}, got {cart_email}")
+                logger.error("🚨 SECURITY: Cart email mismatch! Expected %s, got %s", user_data['ftp_email'], cart_email)
                 return False
     
     return True
@@ -7,11 +7,14 @@ Replaces insecure base64 encoding.
 
 import os
 import base64
+import logging
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from typing import Optional
 
+logger = logging.getLogger(__name__)
+
 
 class PasswordEncryption:
     """
@@ -88,12 +91,12 @@ class PasswordEncryption:
             decrypted = cipher.decrypt(encrypted_password.encode())
             return decrypted.decode('utf-8')
         except Exception as e:
-            print(f"⚠️ Decryption failed: {e}")
+            logger.warning("⚠️ Decryption failed: %s", e)
             
             # Try legacy base64 decoding as fallback
             try:
                 legacy = base64.b64decode(encrypted_password).decode('utf-8')
-                print(f"⚠️ Using legacy base64 decoding - please re-encrypt!")
+                logger.warning("⚠️ Using legacy base64 decoding - please re-encrypt!")
                 return legacy
             except:
                 return None
@@ -115,7 +118,7 @@ class PasswordEncryption:
             # Re-encrypt properly
             return cls.encrypt_password(plain_password)
         except Exception as e:
-            print(f"❌ Migration failed: {e}")
+            logger.error("❌ Migration failed: %s", e)
             return base64_password  # Return original if migration fails
 
 
@@ -5,10 +5,11 @@ Orchestrates the complete meal plan generation flow.
 This is the refactored version of the 200+ line background task.
 """
 
+import logging
 from typing import Dict, Any, Optional
 from services.account_service import lookup_user_account, check_user_needs_onboarding
 from services.scraper_service import scrape_user_cart
-from services.pdf_service import generate_meal_plan_pdf, get_pdf_url
+from services.pdf_service import schedule_meal_plan_pdf, get_pdf_url
 from services.notification_service import (
     send_progress_sms, 
     format_sms_with_help,
@@ -18,6 +19,8 @@ from services.notification_service import (
 import meal_planner
 import supabase_client as db
 
+logger = logging.getLogger(__name__)
+
 
 async def run_full_meal_plan_flow(phone_number: str):
     """
@@ -28,20 +31,20 @@ async def run_full_meal_plan_flow(phone_number: str):
     Args:
         phone_number: User's phone number
     """
-    print(f"🚀 Starting meal plan flow for {phone_number}")
+    logger.info("🚀 Starting meal plan flow for %s", phone_number)
     
     # Step 1: Account lookup
-    send_progress_sms(phone_number, format_sms_with_help("🔍 Looking up your account...", 'analyzing'))
+    await send_progress_sms(phone_number, format_sms_with_help("🔍 Looking up your account...", 'analyzing'))
     
     account_result = lookup_user_account(phone_number)
     
     if not account_result["success"]:
         if account_result.get("needs_registration"):
-            send_error_sms(phone_number, "no_account")
+            await send_error_sms(phone_number, "no_account")
         elif account_result.get("needs_ftp_link"):
-            send_error_sms(phone_number, "no_credentials")
+            await send_error_sms(phone_number, "no_credentials")
         else:
-            send_progress_sms(phone_number, 
+            await send_progress_sms(phone_number, 
                 format_sms_with_help("❌ Having trouble accessing your account. Please try again.", 'error'))
         return
     
@@ -49,18 +52,18 @@ async def run_full_meal_plan_flow(phone_number: str):
     credentials = account_result.get("credentials")
     
     if not credentials:
-        send_error_sms(phone_number, "no_credentials")
+        await send_error_sms(phone_number, "no_credentials")
         return
     
     # Step 2: Check preferences
-    send_progress_sms(phone_number, 
+    await send_progress_sms(phone_number, 
         format_sms_with_help("🔐 Found your account! Logging into Farm to People...", 'analyzing'))
     
     user_preferences = user_data.get('preferences', {})
     
     if check_user_needs_onboarding(user_data):
         # TODO: Handle preference collection flow
-        print("⚠️ User needs to complete onboarding")
+        logger.warning("⚠️ User needs to complete onboarding")
         # For now, use defaults
         user_preferences = {
             'household_size': '2 people',
@@ -70,7 +73,7 @@ async def run_full_meal_plan_flow(phone_number: str):
         }
     
     # Step 3: Scrape cart
-    send_progress_sms(phone_number,
+    await send_progress_sms(phone_number,
         format_sms_with_help("📦 Analyzing your current cart and customizable boxes...", 'analyzing'))
     
     cart_result = await scrape_user_cart(
@@ -80,13 +83,13 @@ async def run_full_meal_plan_flow(phone_number: str):
     )
     
     if not cart_result["success"]:
-        send_error_sms(phone_number, "scrape_failed")
+        await send_error_sms(phone_number, "scrape_failed")
         return
     
     cart_data = cart_result["cart_data"]
     
     # Step 4: Generate meal plan
-    send_progress_sms(phone_number,
+    await send_progress_sms(phone_number,
         format_sms_with_help("📋 Analyzing your cart and creating strategic meal plan...", 'analyzing'))
     
     try:
@@ -100,7 +103,7 @@ async def run_full_meal_plan_flow(phone_number: str):
         )
         
         if not plan or not plan.get("meals"):
-            send_error_sms(phone_number, "meal_failed")
+            await send_error_sms(phone_number, "meal_failed")
             return
         
         # Save meal suggestions to database
@@ -125,35 +128,33 @@ async def run_full_meal_plan_flow(phone_number: str):
                     cart_data=cart_data,
                     meal_suggestions=meal_suggestions
                 )
-                print(f"✅ Saved {len(meal_suggestions)} meal suggestions")
+                logger.info("✅ Saved %s meal suggestions", len(meal_suggestions))
             except Exception as e:
-                print(f"⚠️ Failed to save meal suggestions: {e}")
+                logger.warning("⚠️ Failed to save meal suggestions: %s", e)
         
     except Exception as e:
-        print(f"❌ Meal generation failed: {e}")
-        send_error_sms(phone_number, "meal_failed")
+        logger.error("❌ Meal generation failed: %s", e)
+        await send_error_sms(phone_number, "meal_failed")
         return
     
-    # Step 5: Generate PDF
-    pdf_path = generate_meal_plan_pdf(
+    # Step 5: Render PDF in the background so the SMS doesn't wait on it
+    pdf_filename = schedule_meal_plan_pdf(
         plan_data=plan,
         user_preferences=user_preferences,
-        detailed=True
+        detailed=True,
+        on_failure=lambda: send_error_sms(phone_number, "pdf_failed")
     )
-    
-    pdf_url = None
-    if pdf_path:
-        pdf_url = get_pdf_url(pdf_path)
-        print(f"✅ PDF available at: {pdf_url}")
+    pdf_url = get_pdf_url(pdf_filename)
+    logger.info("✅ PDF will be available at: %s", pdf_url)
     
     # Step 6: Send final SMS
-    send_meal_plan_sms(
+    await send_meal_plan_sms(
         phone=phone_number,
         pdf_url=pdf_url,
         meals=plan.get('meals', [])
     )
     
-    print(f"✅ Meal plan flow completed for {phone_number}")
+    logger.info("✅ Meal plan flow completed for %s", phone_number)
 
 
 async def run_confirmation_flow(phone_number: str):
@@ -163,38 +164,33 @@ async def run_confirmation_flow(phone_number: str):
     Args:
         phone_number: User's phone number
     """
-    print(f"🍳 Generating confirmed meal plan for {phone_number}")
+    logger.info("🍳 Generating confirmed meal plan for %s", phone_number)
     
     # Get user data
     account_result = lookup_user_account(phone_number)
     if not account_result["success"]:
-        send_error_sms(phone_number, "general")
+        await send_error_sms(phone_number, "general")
         return
     
     user_preferences = account_result.get("preferences", {})
     
-    # Generate detailed PDF
-    from pdf_meal_planner import generate_pdf_meal_plan
-    skill_level = user_preferences.get('cooking_skill_level', 'intermediate')
-    
-    pdf_path = generate_pdf_meal_plan(
-        generate_detailed_recipes=True,
-        user_skill_level=skill_level
+    # Render detailed PDF in the background and send its link right away
+    pdf_filename = schedule_meal_plan_pdf(
+        plan_data={},
+        user_preferences=user_preferences,
+        detailed=True,
+        on_failure=lambda: send_error_sms(phone_number, "pdf_failed")
+    )
+    pdf_url = get_pdf_url(pdf_filename)
+    
+    final_message = (
+        "🍽️ Your personalized meal plan is ready!\n\n"
+        f"📄 View your detailed recipes: {pdf_url}\n\n"
+        "Each recipe includes:\n"
+        "• Step-by-step cooking instructions\n"
+        "• Storage tips for ingredients\n"
+        "• Chef techniques and tips\n\n"
+        "Happy cooking! 👨‍🍳"
     )
     
-    if pdf_path:
-        pdf_url = get_pdf_url(pdf_path)
-        
-        final_message = (
-            "🍽️ Your personalized meal plan is ready!\n\n"
-            f"📄 View your detailed recipes: {pdf_url}\n\n"
-            "Each recipe includes:\n"
-            "• Step-by-step cooking instructions\n"
-            "• Storage tips for ingredients\n"
-            "• Chef techniques and tips\n\n"
-            "Happy cooking! 👨‍🍳"
-        )
-    else:
-        final_message = "❌ Error generating your recipe PDF. Please try again with 'plan'."
-    
-    send_progress_sms(phone_number, final_message)
\ No newline at end of file
+    await send_progress_sms(phone_number, final_message)
\ No newline at end of file
@@ -6,31 +6,370 @@ Extracted from server.py to isolate meal generation logic.
 """
 
 import os
-import json
+import re
+import logging
+import asyncio
+import copy
 import time
-from typing import Dict, Any, List, Optional
+import hashlib
+import functools
+import itertools
+from collections import OrderedDict
+from types import MappingProxyType
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Any, Iterable, Iterator, List, Optional, Set, Tuple, Union
+import httpx
 import openai
+import orjson
 from dotenv import load_dotenv
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+
+# Optional: exact token counts for prompt trimming (falls back to a length estimate)
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
 
 # Load environment
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Configuration - Support both GPT-4o and GPT-5 models via environment variable
 AI_MODEL = os.getenv("AI_MODEL", "gpt-4o")  # Default to gpt-4o for stability
-print(f"🤖 Meal Generator using model: {AI_MODEL}")
+# The single meal card is one small JSON object - a smaller, faster model handles it fine
+SINGLE_MEAL_MODEL = os.getenv("AI_MODEL_SIMPLE", "gpt-4o-mini")
+logger.info("🤖 Meal Generator using model: %s (single meal: %s)", AI_MODEL, SINGLE_MEAL_MODEL)
+
+
+
+@dataclass(frozen=True)
+class ModelProfile:
+    """
+    What a model accepts on chat.completions.create, resolved once per model name.
+
+    GPT-5 and o-series reasoning models take max_completion_tokens; GPT-5 also
+    only runs at its default temperature and needs reasoning_effort set.
+    """
+    token_param: str  # "max_tokens" or "max_completion_tokens"
+    supports_temperature: bool
+    needs_reasoning_effort: bool
+    supports_json_mode: bool
+    supports_json_schema: bool
+
+
+# Structured outputs (response_format json_schema) exist on gpt-4o and newer;
+# older models fall back to plain prompting + tolerant parsing
+_JSON_SCHEMA_MODEL_PREFIXES = ("gpt-4o", "gpt-4.1", "gpt-5", "o3", "o4")
+
+
+@functools.lru_cache(maxsize=16)
+def model_profile(model_name: str) -> ModelProfile:
+    """
+    Resolve the request capabilities of a model from its name.
+
+    JSON mode exists on every current chat model; only the original gpt-4 /
+    -0314 / -0613 snapshots predate it.
+    """
+    model_lower = model_name.lower()
+    is_gpt5 = model_lower.startswith("gpt-5")
+    return ModelProfile(
+        token_param="max_completion_tokens" if model_lower.startswith(("gpt-5", "o1", "o3")) else "max_tokens",
+        supports_temperature=not is_gpt5,
+        needs_reasoning_effort=is_gpt5,
+        supports_json_mode=not (model_lower == "gpt-4" or model_lower.startswith("gpt-4-32k")
+                                or model_lower.endswith(("-0314", "-0613"))),
+        supports_json_schema=model_lower.startswith(_JSON_SCHEMA_MODEL_PREFIXES),
+    )
+
+
+# Profiles for the configured models - computed once, read on every request
+AI_MODEL_PROFILE = model_profile(AI_MODEL)
+SINGLE_MEAL_MODEL_PROFILE = model_profile(SINGLE_MEAL_MODEL)
+
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+
+# Connection pool for the shared client - sized for many concurrent cart requests,
+# with keep-alive so warm calls skip the TCP/TLS handshake
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "100"))
+OPENAI_MAX_KEEPALIVE = int(os.getenv("OPENAI_MAX_KEEPALIVE", "50"))
+OPENAI_TIMEOUT_SECONDS = float(os.getenv("OPENAI_TIMEOUT_SECONDS", "60"))
+
+# Retry transient OpenAI failures (rate limits, dropped connections, 5xx) around
+# the network call only, so a retry doesn't redo cart extraction or prompt building
+OPENAI_MAX_ATTEMPTS = int(os.getenv("OPENAI_MAX_ATTEMPTS", "3"))
+_RETRYABLE_OPENAI_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+
+
+@functools.lru_cache(maxsize=1)
+def get_async_client() -> Optional[openai.AsyncOpenAI]:
+    """
+    Shared AsyncOpenAI client, created on first use and reused for every call.
+
+    One client means one keep-alive connection pool to api.openai.com instead of
+    a fresh TLS handshake per request. server.py's swap calls share it too.
+    Returns None when no API key is configured.
+    """
+    if not OPENAI_API_KEY:
+        return None
+    http_client = openai.DefaultAsyncHttpxClient(
+        limits=httpx.Limits(max_connections=OPENAI_MAX_CONNECTIONS, max_keepalive_connections=OPENAI_MAX_KEEPALIVE),
+        timeout=OPENAI_TIMEOUT_SECONDS
+    )
+    # Retries are handled by call_gpt, so turn off the SDK's own to avoid stacking them
+    return openai.AsyncOpenAI(api_key=OPENAI_API_KEY, http_client=http_client, max_retries=0)
+
+
+# Longest server-requested Retry-After we'll honor before falling back to our own backoff
+OPENAI_MAX_RETRY_AFTER = float(os.getenv("OPENAI_MAX_RETRY_AFTER", "20"))
+_backoff_wait = wait_exponential_jitter(multiplier=0.5, max=8)
+
+
+def _retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Seconds the API asked us to wait (retry-after-ms / retry-after headers), if any."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        if "retry-after" in headers:
+            return float(headers["retry-after"])
+    except ValueError:
+        # HTTP-date form - rare from OpenAI, use normal backoff
+        return None
+    return None
+
+
+def _wait_for_retry(retry_state) -> float:
+    """Honor the server's Retry-After when it's sane, else exponential backoff with jitter."""
+    retry_after = _retry_after_seconds(retry_state.outcome.exception())
+    if retry_after is not None and 0 < retry_after <= OPENAI_MAX_RETRY_AFTER:
+        return retry_after
+    return _backoff_wait(retry_state)
+
+
+def _is_retryable_openai_error(error: BaseException) -> bool:
+    """Transient errors only - a 429 for an exhausted quota fails the same way every time."""
+    if not isinstance(error, _RETRYABLE_OPENAI_ERRORS):
+        return False
+    return getattr(error, "code", None) != "insufficient_quota"
+
+
+def _log_retry(retry_state) -> None:
+    logger.warning(
+        "🔁 OpenAI call failed (%s), retrying - attempt %s/%s",
+        retry_state.outcome.exception(), retry_state.attempt_number + 1, OPENAI_MAX_ATTEMPTS
+    )
+
+
+async def call_gpt(**request_kwargs) -> Any:
+    """
+    chat.completions.create on the shared client, with exponential backoff.
+
+    Only transient errors are retried - a 400 or a bad JSON answer fails the
+    same way every time. A Retry-After from the API sets the wait when present.
+    With stream=True this retries opening the stream, not a stream that has
+    already started yielding.
+    """
+    async for attempt in AsyncRetrying(
+        stop=stop_after_attempt(OPENAI_MAX_ATTEMPTS),
+        wait=_wait_for_retry,
+        retry=retry_if_exception(_is_retryable_openai_error),
+        before_sleep=_log_retry,
+        reraise=True
+    ):
+        with attempt:
+            return await get_async_client().chat.completions.create(**request_kwargs)
+
+
+# All meal requests share the same static prompt prefix, so route them together
+# to keep OpenAI's prompt cache warm across users
+PROMPT_CACHE_KEY = "ftp-meal-generator-v1"
+
+# Response cache - identical cart + preferences + model get the same GPT answer
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", "3600"))
+
+# Keys that change between scrapes without changing what we send to GPT
+_VOLATILE_CACHE_KEYS = {"id", "scraped_timestamp", "scraped_at", "timestamp", "created_at", "updated_at"}
+
+# orjson sorts keys natively and is several times faster than json.dumps(sort_keys=True)
+_ORJSON_KEY_OPTS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+
+
+def canonicalize(value: Any) -> Any:
+    """
+    Normalize cart/preference data so semantically equal inputs hash the same.
+
+    Drops volatile keys (ids, timestamps) and sorts lists so item order
+    doesn't change the cache key.
+    """
+    if isinstance(value, dict):
+        return {k: canonicalize(v) for k, v in value.items() if k not in _VOLATILE_CACHE_KEYS}
+    if isinstance(value, (list, tuple)):
+        items = [canonicalize(v) for v in value]
+        return sorted(items, key=lambda v: orjson.dumps(v, default=str, option=_ORJSON_KEY_OPTS))
+    return value
+
+
+def _cart_prompt_view(cart_data: Dict[str, Any]) -> Dict[str, List[Tuple[str, str, str]]]:
+    """
+    The part of a cart that reaches a GPT prompt: each item's name, unit and quantity.
+
+    Prices, images, ids and the like are left out, so carts with the same
+    contents share a cache entry. Names are case-folded and every section is
+    sorted, so item order and capitalization don't split entries either.
+    """
+    view = {}
+    for section, items_key in _CART_SECTIONS:
+        entries = cart_data.get(section) or []
+        if items_key:
+            entries = [item for box in entries for item in box.get(items_key, [])]
+        view[section] = sorted(
+            (str(item.get('name', '')).strip().lower(), str(item.get('unit', '')), str(item.get('quantity', 1)))
+            for item in entries
+        )
+    return view
+
+
+def llm_cache_key(namespace: str, cart_data: Dict[str, Any], preferences: Optional[Dict[str, Any]],
+                  model: Union[str, Tuple[str, ...]] = AI_MODEL) -> str:
+    """Build the Redis key for a cached GPT response from the model(s) that produced it."""
+    payload = orjson.dumps({
+        "cart": _cart_prompt_view(cart_data or {}),
+        "prefs": canonicalize(preferences or {}),
+        "model": model
+    }, default=str, option=_ORJSON_KEY_OPTS)
+    return f"llm:{namespace}:{hashlib.sha256(payload).hexdigest()}"
+
+
+# In-process layer in front of Redis: repeat requests on the same worker skip
+# even the Redis round trip, and caching still works when Redis isn't configured
+LLM_MEMORY_CACHE_MAX_ENTRIES = int(os.getenv("LLM_MEMORY_CACHE_MAX_ENTRIES", "512"))
+_llm_memory_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+
+def _get_local_llm_response(key: str, ttl: int) -> Optional[Dict[str, Any]]:
+    entry = _llm_memory_cache.get(key)
+    if not entry:
+        return None
+    stored_at, result = entry
+    if time.monotonic() - stored_at > ttl:
+        _llm_memory_cache.pop(key, None)
+        return None
+    _llm_memory_cache.move_to_end(key)
+    # Callers annotate and mutate results, so never hand out the cached object
+    return copy.deepcopy(result)
+
+
+def _set_local_llm_response(key: str, result: Dict[str, Any]):
+    _llm_memory_cache[key] = (time.monotonic(), copy.deepcopy(result))
+    _llm_memory_cache.move_to_end(key)
+    while len(_llm_memory_cache) > LLM_MEMORY_CACHE_MAX_ENTRIES:
+        _llm_memory_cache.popitem(last=False)
+
+
+# Cache key -> task for requests currently waiting on GPT
+_inflight_llm_requests: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+
+
+def _redis_cache_available() -> bool:
+    try:
+        from services.cache_service import CacheService
+        return CacheService.is_available()
+    except ImportError:
+        return False
+
+
+def _store_llm_response(key: str, result: Dict[str, Any], ttl: int, redis_available: bool):
+    """Write a successful result to the in-process cache and, if available, Redis."""
+    _set_local_llm_response(key, result)
+    if redis_available:
+        from services.cache_service import CacheService
+        CacheService.set_llm_response(key, result, ttl)
+
+
+def cached_llm(ttl: int = LLM_CACHE_TTL, model: Union[str, Tuple[str, ...]] = AI_MODEL):
+    """
+    Cache successful GPT results keyed on cart contents + preferences + model.
+
+    ``model`` must name every model the wrapped function can call, so switching
+    one of them (e.g. AI_MODEL_SIMPLE) never serves the old model's output.
+
+    Checks a per-process LRU first, then Redis (when available). Concurrent
+    identical requests on one worker share a single call. The wrapped
+    function gains a ``use_cache`` keyword - pass False to force a fresh
+    generation (e.g. when the user explicitly asks for new ideas). Results
+    carry ``cached`` - True when served from either cache layer.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(cart_data: Dict[str, Any], preferences: Dict[str, Any] = None,
+                          *, use_cache: bool = True) -> Dict[str, Any]:
+            if not use_cache:
+                return {**await func(cart_data, preferences), "cached": False}
+
+            key = llm_cache_key(func.__name__, cart_data, preferences, model)
+            cached = _get_local_llm_response(key, ttl)
+            if cached is not None:
+                logger.info("⚡ Reusing in-process cached %s result", func.__name__)
+                cached["cached"] = True
+                return cached
+
+            # Identical request already running (double-submit, retry storm) - share its result
+            pending = _inflight_llm_requests.get(key)
+            if pending is not None:
+                logger.info("⚡ Joining in-flight %s request", func.__name__)
+            else:
+                pending = asyncio.ensure_future(fetch(key, cart_data, preferences))
+                _inflight_llm_requests[key] = pending
+                pending.add_done_callback(lambda _: _inflight_llm_requests.pop(key, None))
+            # shield: one caller disconnecting must not cancel the call the others are waiting on
+            return copy.deepcopy(await asyncio.shield(pending))
+
+        async def fetch(key: str, cart_data: Dict[str, Any], preferences: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+            redis_available = _redis_cache_available()
+            if redis_available:
+                from services.cache_service import CacheService
+                cached = CacheService.get_llm_response(key)
+                if cached is not None:
+                    logger.info("⚡ Reusing cached %s result", func.__name__)
+                    _set_local_llm_response(key, cached)
+                    return {**cached, "cached": True}
+
+            result = await func(cart_data, preferences)
+            if result.get("success"):
+                _store_llm_response(key, result, ttl, redis_available)
+            return {**result, "cached": False}
+        return wrapper
+    return decorator
+
+
+# Output token budgets - a meal object is ~150 tokens of JSON, so these leave ~2x slack.
+# Every call logs its completion_tokens against the cap (see _log_token_usage), so
+# these can be tightened to the observed p99 via env without a code change.
+TOKENS_PER_MEAL = int(os.getenv("TOKENS_PER_MEAL", "300"))
+SNACK_SECTION_TOKENS = int(os.getenv("SNACK_SECTION_TOKENS", "300"))
+MIN_OUTPUT_TOKENS = int(os.getenv("MIN_OUTPUT_TOKENS", "400"))
+SINGLE_MEAL_TOKENS = int(os.getenv("SINGLE_MEAL_TOKENS", "200"))  # schema-constrained single meal is ~100 tokens
+GPT5_REASONING_HEADROOM = int(os.getenv("GPT5_REASONING_HEADROOM", "400"))  # reasoning_effort="minimal" still thinks a little
 
-# Function to determine if model needs max_completion_tokens
 def uses_completion_tokens_param(model_name):
     """
     Determine if the model uses max_completion_tokens instead of max_tokens.
     GPT-5 and reasoning models (o1, o3) use max_completion_tokens.
     """
-    model_lower = model_name.lower()
-    return (
-        model_lower.startswith("gpt-5") or
-        model_lower.startswith("o1") or
-        model_lower.startswith("o3")
-    )
+    return model_profile(model_name).token_param == "max_completion_tokens"
+
+
+def supports_json_mode(model_name):
+    """
+    Whether the model accepts response_format={"type": "json_object"}.
+
+    Callers fall back to tolerant parsing for the models that don't.
+    """
+    return model_profile(model_name).supports_json_mode
 
 
 def build_api_params(model_name, max_tokens_value, temperature_value=None):
@@ -39,36 +378,46 @@ def build_api_params(model_name, max_tokens_value, temperature_value=None):
 
     Args:
         model_name: The OpenAI model name
-        max_tokens_value: Maximum tokens to generate
+        max_tokens_value: Maximum tokens to generate (None leaves the cap off)
         temperature_value: Temperature setting (None means use model default)
 
     Returns:
-        Dict with appropriate parameters for the model
+        Dict with appropriate parameters for the model (a fresh copy, safe to mutate)
     """
-    params = {}
+    return dict(_cached_api_params(model_name, max_tokens_value, temperature_value))
 
-    # Handle token parameter naming
-    if uses_completion_tokens_param(model_name):
-        params["max_completion_tokens"] = max_tokens_value
-        print(f"📝 [MODEL COMPAT] Using max_completion_tokens for {model_name}")
-    else:
-        params["max_tokens"] = max_tokens_value
-        print(f"📝 [MODEL COMPAT] Using max_tokens for {model_name}")
 
-    # Handle temperature (GPT-5 only supports default temperature=1)
-    model_lower = model_name.lower()
-    if model_lower.startswith("gpt-5"):
-        # GPT-5 only supports temperature=1 (default), so don't specify it
-        print(f"📝 [MODEL COMPAT] Skipping temperature for {model_name} (uses default)")
+@functools.lru_cache(maxsize=16)
+def _cached_api_params(model_name, max_tokens_value, temperature_value):
+    """
+    Memoized body of build_api_params - the same few (model, tokens, temperature)
+    combinations come up on every request, so the debug output only runs once
+    per combination.
+
+    Returns:
+        Tuple of (param, value) pairs
+    """
+    profile = model_profile(model_name)
+    params = {}
+
+    if max_tokens_value is not None:
+        params[profile.token_param] = max_tokens_value
 
+    if profile.needs_reasoning_effort:
         # GPT-5 REQUIRES reasoning_effort parameter to avoid empty responses
         params["reasoning_effort"] = "minimal"  # Use minimal for JSON generation tasks
-        print(f"📝 [MODEL COMPAT] Using reasoning_effort=minimal for {model_name}")
-    elif temperature_value is not None:
+    if profile.supports_temperature and temperature_value is not None:
         params["temperature"] = temperature_value
-        print(f"📝 [MODEL COMPAT] Using temperature={temperature_value} for {model_name}")
 
-    return params
+    logger.debug("📝 [MODEL COMPAT] %s params: %s", model_name, params)
+    return tuple(params.items())
+
+
+# Protein meal-count rules, one precompiled scan each
+_SINGLE_PROTEIN_RE = re.compile(r'chicken breast|salmon|bass|steak|pork chop')
+_GROUND_MEAT_RE = re.compile(r'ground|turkey')
+_FULL_POUND_RE = re.compile(r'1 lb|pound')
+MAX_MEALS = 4
 
 
 def calculate_possible_meals(proteins: List[str]) -> int:
@@ -81,675 +430,1903 @@ def calculate_possible_meals(proteins: List[str]) -> int:
     Returns:
         Number of realistic meals (1-4)
     """
-    if not proteins:
-        return 0
-
     meal_count = 0
 
     for protein in proteins:
         protein_lower = protein.lower()
 
-        # Individual protein sources = 1 meal each
-        if any(single_protein in protein_lower for single_protein in [
-            'chicken breast', 'salmon', 'bass', 'steak', 'pork chop'
-        ]):
+        # Ground meats - 1 lb = 2 meals. Everything else is 1 meal per item:
+        # individual cuts (chicken breast, salmon, ...), eggs, smaller ground packs
+        if (_GROUND_MEAT_RE.search(protein_lower) and _FULL_POUND_RE.search(protein_lower)
+                and not _SINGLE_PROTEIN_RE.search(protein_lower)):
+            meal_count += 2
+        else:
             meal_count += 1
 
-        # Ground meats - 1 lb = 2 meals, 0.5 lb = 1 meal
-        elif 'ground' in protein_lower or 'turkey' in protein_lower:
-            if '1 lb' in protein_lower or 'pound' in protein_lower:
-                meal_count += 2
-            else:
-                meal_count += 1  # Default conservative estimate
+        # Cap at realistic maximum for current system - no need to look further
+        if meal_count >= MAX_MEALS:
+            return MAX_MEALS
 
-        # Eggs - dozen can support multiple meals but count as 1 protein source
-        elif 'egg' in protein_lower:
-            meal_count += 1
+    return meal_count
 
-        else:
-            # Default: assume each protein item = 1 meal
-            meal_count += 1
 
-    # Cap at realistic maximum for current system
-    return min(meal_count, 4)
+# A single leftover ingredient isn't worth a snack section in the prompt
+MIN_SNACK_INGREDIENTS = 2
+
+# Snack-friendly ingredients: deviled eggs/egg salad, avocado toast/guacamole,
+# bruschetta/salsa, cheese board, fruit salad, mixed berries, trail mix
+_SNACK_RE = re.compile(r'egg|avocado|tomato|cheese|fruit|berry|nut')
 
 
 def has_snack_potential(ingredients: Dict[str, List[str]]) -> bool:
     """
-    Determine if remaining ingredients can make meaningful snacks.
+    Determine if remaining ingredients can make meaningful snacks.
+
+    Args:
+        ingredients: Dict with proteins, vegetables, other_items
+
+    Returns:
+        True if snack-worthy ingredients remain
+    """
+    all_ingredients = itertools.chain(
+        ingredients.get('proteins', ()), ingredients.get('vegetables', ()), ingredients.get('other_items', ())
+    )
+    return any(_SNACK_RE.search(item.lower()) for item in all_ingredients)
+
+
+def calculate_remaining_after_meals(cart_data: Dict[str, Any], used_meals: Optional[List[Dict[str, Any]]] = None,
+                                    ingredients: Optional[Dict[str, List[str]]] = None) -> Dict[str, List[str]]:
+    """
+    Calculate what ingredients remain after allocating to specific meals.
+
+    Works from cart_data alone (used_meals is not consulted yet), so the
+    snack prompt can be built before the meal response comes back.
+
+    Args:
+        cart_data: Original cart data
+        used_meals: List of meals that have been allocated (unused in Phase 1)
+        ingredients: extract_ingredients_from_cart(cart_data), if the caller already
+            has it. The returned vegetable/other lists are those same lists, not copies -
+            treat both as read-only.
+
+    Returns:
+        Dict of remaining ingredients
+    """
+    # For Phase 1, return simplified remaining calculation
+    # In Phase 2, we'll implement proper ingredient tracking
+
+    original = ingredients if ingredients is not None else extract_ingredients_from_cart(cart_data)
+
+    # Simple heuristic: if we used N meals, assume major proteins are taken.
+    # Keep eggs and small proteins for snacks, and leave vegetables and
+    # smaller items as they are (nothing downstream mutates them).
+    return {
+        'proteins': [protein for protein in original['proteins'] if 'egg' in protein.lower()],
+        'vegetables': original['vegetables'],
+        'other_items': original['other_items']
+    }
+
+
+# Category keywords compiled once - one regex search per item instead of an any() scan.
+# Plain alternation (no word boundaries) keeps substring matching, so plurals like
+# "tomatoes" or "peppers" still land in the right bucket.
+_PROTEIN_RE = re.compile(r'chicken|beef|turkey|sausage|fish|salmon|bass|pork')
+_VEG_RE = re.compile(r'tomato|pepper|kale|lettuce|carrot|zucchini|eggplant|onion|broccoli|spinach|arugula')
+
+# Cart sections that feed prompts: (section key, key holding the box's items or None)
+_CART_SECTIONS = (
+    ('individual_items', None),
+    ('customizable_boxes', 'selected_items'),
+    ('non_customizable_boxes', 'selected_items'),
+)
+
+
+def _iter_section(cart_data: Dict[str, Any], section: str, items_key: Optional[str]) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (lowercase name, display label with quantity/unit) for every item in one cart section.
+
+    Each item dict is read exactly once, and boxed items are flattened lazily
+    rather than copied into an intermediate list.
+
+    Args:
+        cart_data: Cart data with individual_items, customizable_boxes, etc.
+        section: Cart section key
+        items_key: Key holding each box's items, or None for a flat item list
+    """
+    entries = cart_data.get(section, [])
+    if items_key:
+        entries = itertools.chain.from_iterable(box.get(items_key, []) for box in entries)
+
+    for item in entries:
+        name = item.get('name', '')
+        unit = item.get('unit', '')
+        quantity = item.get('quantity', 1)
+
+        if unit and quantity:
+            label = f"{name} ({unit})" if quantity == 1 else f"{name} ({quantity}x {unit})"
+        else:
+            label = name
+        yield name.lower(), label
+
+
+def extract_ingredients_from_cart(cart_data: Dict[str, Any]) -> Dict[str, List[str]]:
+    """
+    Extract and categorize ingredients from cart data WITH QUANTITY INFORMATION.
+
+    Args:
+        cart_data: Cart data with individual_items, customizable_boxes, etc.
+
+    Returns:
+        Dict with proteins, vegetables, and other_items lists including quantities
+    """
+    return _classify_cart(cart_data)[0]
+
+
+def _classify_cart(cart_data: Dict[str, Any]) -> Tuple[Dict[str, List[str]], bool]:
+    """
+    extract_ingredients_from_cart plus snack eligibility, worked out in the same pass.
+
+    Returns:
+        (ingredients dict, whether the ingredients left after meals - egg proteins,
+        vegetables and other items - include a snack-friendly one; see has_snack_potential)
+    """
+    proteins = []
+    vegetables = []
+    other_items = []
+    snack_ready = False
+
+    # Each section has one classification rule, so branch per section rather than per item
+    for name, label in _iter_section(cart_data, 'individual_items', None):
+        # Eggs are the only protein sold individually; avocados, bananas etc. are extras
+        if 'egg' in name:
+            proteins.append(label)
+            snack_ready = True
+        else:
+            other_items.append(label)
+            snack_ready = snack_ready or bool(_SNACK_RE.search(name))
+
+    for name, label in _iter_section(cart_data, 'customizable_boxes', 'selected_items'):
+        if _PROTEIN_RE.search(name):
+            proteins.append(label)
+            # Only egg proteins are kept back for snacks
+            snack_ready = snack_ready or 'egg' in name
+        elif _VEG_RE.search(name):
+            vegetables.append(label)
+            snack_ready = snack_ready or bool(_SNACK_RE.search(name))
+        else:
+            other_items.append(label)
+            snack_ready = snack_ready or bool(_SNACK_RE.search(name))
+
+    # Non-customizable boxes are fruit/pantry bundles - everything is an extra
+    for name, label in _iter_section(cart_data, 'non_customizable_boxes', 'selected_items'):
+        other_items.append(label)
+        snack_ready = snack_ready or bool(_SNACK_RE.search(name))
+
+    ingredients = {
+        'proteins': proteins,
+        'vegetables': vegetables,
+        'other_items': other_items
+    }
+    return ingredients, snack_ready
+
+
+def _first_int(value: Any) -> int:
+    """
+    Return the first run of digits in value as an int, or 0 if there is none.
+
+    Used for GPT fields like "35g" or "10-12 min" - a plain character scan is
+    cheaper than a regex for these short strings.
+    """
+    digits = []
+    for ch in str(value):
+        if ch.isdigit():
+            digits.append(ch)
+        elif digits:
+            break
+    return int(''.join(digits)) if digits else 0
+
+
+# Static prompt blocks - identical on every request so OpenAI can cache the prefix.
+# Anything user- or cart-specific goes in the *_details builders and is appended last.
+MEAL_PROMPT_RULES = """PROTEIN PER 4oz COOKED SERVING:
+- Chicken breast: 35g
+- Chicken thigh: 28g
+- Salmon/Steelhead: 30-34g
+- Ground beef/turkey: 28-30g
+- Eggs: 6g each
+- Black Sea Bass: 24g
+- Tofu: 10g
+
+QUANTITY & SERVING RULES:
+1. Protein portions (for this household size):
+   - Every meal: at least 20g protein per serving - combine proteins if needed
+   - 8 oz salmon/fish = 1 serving, ONE meal only (don't split across meals)
+   - 1 lb ground turkey = 2 servings (2 separate meals)
+   - 1 chicken breast = 1 serving, ONE meal only
+   - 1 dozen eggs = spans meals (3-4 eggs per meal for 20g+)
+   - "Leftover" meals keep full protein (turkey hash with leftover veggies = 28g from the turkey)
+
+2. Vegetable portions:
+   - 5 oz arugula = 1-2 side salads, not a main ingredient
+   - 1 bunch kale = 2-3 meals
+   - 2 zucchini = 1-2 meals
+   - 1 pint cherry tomatoes = 2-3 meals (accent)
+
+3. Distribution:
+   - Under 8 oz (e.g. 5 oz arugula): 1 meal max
+   - 1+ lb: can span meals
+   - One dedicated protein per meal
+   - Spread vegetables by amount, not variety
+
+4. Planning:
+   - Count the complete dinners this cart actually makes - don't overstretch small quantities
+   - Name meals after the actual ingredients
+   - Size each meal for the household
+
+Follow their preferences where quantities allow. Prefer variety, but not by forcing every ingredient in.
+
+Meal format (N = servings per meal given in USER PREFERENCES):
+[{
+  "name": "Specific Meal Name Using Actual Ingredients",
+  "servings": N,
+  "time": "X min",
+  "protein_per_serving": X,
+  "protein_calculation": "Show your math: X lb protein / Y servings = Z grams per serving",
+  "makes_x_dinners": "This recipe makes X dinners for your family",
+  "ingredients_used": ["list", "actual", "cart", "items"],
+  "note": "optional note about what to add from store"
+}]"""
+
+SNACK_PROMPT_RULES = """SNACK RULES:
+- Under 10 min prep, or prepped ahead and stored
+- Grab-and-go, eaten between meals
+- Use only the snack ingredients listed for this request
+- High protein is fine - minimal prep at eating time is what makes it a snack
+- Good examples: deviled eggs, veggie chips with dip, cheese plate, bruschetta, fruit/veggie combo, protein balls
+
+Snack format:
+[{
+  "name": "Snack Name",
+  "time": "X min",
+  "protein_per_serving": X,
+  "servings": 2,
+  "type": "snack",
+  "ingredients_used": ["list", "of", "ingredients"],
+  "description": "Brief preparation method"
+}]"""
+
+COMBINED_RESPONSE_FORMAT = """RESPONSE FORMAT:
+Return ONE JSON object with exactly two keys:
+- "meals": array of meal objects in the meal format (the requested count is given below)
+- "snacks": array of snack objects in the snack format (empty array if snacks are not requested below)"""
+
+
+# Prompt templates for the request-specific sections. Each slot is computed
+# once and filled with format_map - cheaper than re-evaluating join/conditional
+# expressions inside one large f-string.
+_PREFS_TEMPLATE = """Create meal suggestions for a household of {household_size}.
+
+USER PREFERENCES TO CONSIDER:
+- Household size: {household_size} (need {servings_per_meal} servings per meal, so N = {servings_per_meal})
+- Meal focus: Primarily {meal_focus}
+- Dietary restrictions: {dietary_restrictions}
+- Foods to avoid: {dislikes}
+- Cooking time preference: {cooking_time}
+- Protein requirement: {protein_requirement}"""
+
+_CART_TEMPLATE = """CART CONTENTS WITH EXACT QUANTITIES:
+PROTEINS ({protein_count} items): {proteins}
+VEGETABLES ({vegetable_count} items): {vegetables}
+OTHER ITEMS ({other_count} items): {other_items}
+
+Analyze this cart and return {meal_count} meal suggestions focusing on dinner meals."""
+
+_SNACK_TEMPLATE = """Create 1-2 quick SNACKS using these remaining ingredients:
+
+AVAILABLE SNACK INGREDIENTS:
+PROTEINS: {proteins}
+VEGETABLES: {vegetables}
+OTHER ITEMS: {other_items}
+
+- Household size: {household_size}
+- Dietary restrictions: {dietary_restrictions}"""
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively turn dicts/lists into sorted tuples so preferences can key an lru_cache."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def build_prefs_block(preferences: Dict[str, Any]) -> str:
+    """
+    Build the preferences section of the meal prompt.
+
+    Preferences rarely change between a user's requests, so the rendered block
+    is memoized on the preference values and shared by every request with the
+    same settings.
+
+    Args:
+        preferences: User preferences dict
+
+    Returns:
+        Household + USER PREFERENCES prompt text
+    """
+    return _prefs_block_cached(_freeze(preferences or {}))
+
+
+@functools.lru_cache(maxsize=512)
+def _prefs_block_cached(frozen_preferences: tuple) -> str:
+    preferences = dict(frozen_preferences)
+
+    # Extract preferences with defaults
+    household_size = preferences.get('household_size', '2 people')
+    meal_focus = preferences.get('meal_timing', ['dinner'])
+    dietary_restrictions = preferences.get('dietary_restrictions', [])
+    health_goals = preferences.get('goals', [])
+    cooking_time = 'quick (under 30 min)' if 'quick-dinners' in health_goals else 'standard'
+    high_protein = 'high-protein' in health_goals
+
+    # Additional preferences
+    cooking_methods = preferences.get('cooking_methods', preferences.get('preferred_cooking_methods', []))
+    liked_meals = preferences.get('liked_meals', [])
+    dislikes = preferences.get('dislikes', [])
+
+    # Calculate servings
+    servings_per_meal = 2 if '1-2' in str(household_size) else 4 if '3-4' in str(household_size) else 6
+
+    parts = [_PREFS_TEMPLATE.format_map({
+        'household_size': household_size,
+        'servings_per_meal': servings_per_meal,
+        'meal_focus': ', '.join(meal_focus) if isinstance(meal_focus, (list, tuple)) else meal_focus,
+        'dietary_restrictions': ', '.join(dietary_restrictions) or 'None',
+        'dislikes': ', '.join(dislikes) or 'None',
+        'cooking_time': cooking_time,
+        'protein_requirement': 'HIGH (35-40g per serving)' if high_protein else 'Standard (25-30g per serving)',
+    })]
+
+    # Add preference guidance (not rules)
+    if cooking_methods:
+        parts.append(f"- They prefer cooking with: {', '.join(cooking_methods)} methods")
+    if liked_meals:
+        parts.append(f"- They particularly enjoy: {', '.join(liked_meals[:3])}")
+
+    return "\n".join(parts)
+
+
+def build_cart_block(ingredients: Dict[str, List[str]], meal_count: int = 4) -> str:
+    """
+    Build the cart section of the meal prompt - the part that changes every request.
+
+    Args:
+        ingredients: Dict with proteins, vegetables, other_items
+        meal_count: Number of meals to request
+
+    Returns:
+        CART CONTENTS prompt text ending with the meal count instruction
+    """
+    proteins = ingredients['proteins']
+    vegetables = ingredients['vegetables']
+    other_items = ingredients['other_items']
+
+    return _CART_TEMPLATE.format_map({
+        'protein_count': len(proteins),
+        'proteins': ', '.join(proteins) or 'none',
+        'vegetable_count': len(vegetables),
+        'vegetables': ', '.join(vegetables) or 'none',
+        'other_count': len(other_items),
+        'other_items': ', '.join(other_items) or 'none',
+        'meal_count': meal_count,
+    })
+
+
+def build_meal_details(ingredients: Dict[str, List[str]], preferences: Dict[str, Any], meal_count: int = 4) -> str:
+    """
+    Build the request-specific part of the meal prompt (preferences, then cart).
+
+    Preferences go before the cart because they repeat across a user's
+    requests, so they extend the cacheable prompt prefix.
+
+    Args:
+        ingredients: Dict with proteins, vegetables, other_items
+        preferences: User preferences dict
+        meal_count: Number of meals to request
+
+    Returns:
+        Dynamic prompt text to append after MEAL_PROMPT_RULES
+    """
+    return f"{build_prefs_block(preferences)}\n\n{build_cart_block(ingredients, meal_count)}"
+
+
+def build_meal_prompt(ingredients: Dict[str, List[str]], preferences: Dict[str, Any], meal_count: int = 4) -> str:
+    """
+    Build GPT prompt for meal generation based on ingredients and preferences.
+
+    Static rules come first and cart/preference details last, so repeat
+    requests share a cacheable prompt prefix.
+
+    Args:
+        ingredients: Dict with proteins, vegetables, other_items
+        preferences: User preferences dict
+
+    Returns:
+        Formatted prompt string for GPT
+    """
+    return f"{MEAL_PROMPT_RULES}\n\n{build_meal_details(ingredients, preferences, meal_count)}"
+
+
+def build_snack_details(ingredients: Dict[str, List[str]], preferences: Dict[str, Any]) -> str:
+    """
+    Build the request-specific part of the snack prompt (remaining ingredients).
+
+    Args:
+        ingredients: Dict with remaining proteins, vegetables, other_items
+        preferences: User preferences dict
+
+    Returns:
+        Dynamic prompt text to append after SNACK_PROMPT_RULES
+    """
+    household_size = preferences.get('household_size', '2 people')
+    dietary_restrictions = preferences.get('dietary_restrictions', [])
+
+    return _SNACK_TEMPLATE.format_map({
+        'proteins': ', '.join(ingredients['proteins']) or 'none',
+        'vegetables': ', '.join(ingredients['vegetables']) or 'none',
+        'other_items': ', '.join(ingredients['other_items']) or 'none',
+        'household_size': household_size,
+        'dietary_restrictions': ', '.join(dietary_restrictions) or 'None',
+    })
+
+
+def build_snack_prompt(ingredients: Dict[str, List[str]], preferences: Dict[str, Any]) -> str:
+    """
+    Build GPT prompt for snack generation using remaining ingredients.
+
+    Args:
+        ingredients: Dict with remaining proteins, vegetables, other_items
+        preferences: User preferences dict
+
+    Returns:
+        Formatted prompt string for GPT snack generation
+    """
+    return f"{SNACK_PROMPT_RULES}\n\n{build_snack_details(ingredients, preferences)}"
+
+
+# Shared head of every combined prompt - static, so it stays a cacheable prefix
+COMBINED_PROMPT_HEAD = "\n\n".join([
+    "PART 1 - MEAL RULES\n\n" + MEAL_PROMPT_RULES,
+    "PART 2 - SNACK RULES\n\n" + SNACK_PROMPT_RULES,
+])
+
+CHEF_SYSTEM_PROMPT = "You are a creative chef who specializes in making delicious meals and quick, healthy snacks from specific available ingredients. Always return valid JSON."
+
+# System message for every meal + snack call (single, batched and Batch API).
+# All the static rules live here, byte-identical across requests, so OpenAI's
+# prompt cache covers them and the user message carries only request data.
+MEAL_SYSTEM_PROMPT = "\n\n".join([CHEF_SYSTEM_PROMPT, COMBINED_PROMPT_HEAD])
+
+
+def build_combined_details(ingredients: Dict[str, List[str]], remaining: Optional[Dict[str, List[str]]],
+                           preferences: Dict[str, Any], meal_count: int, include_snacks: bool = True) -> str:
+    """
+    Build the request-specific half of the combined prompt (cart, preferences, counts).
+
+    Args:
+        ingredients: Dict with proteins, vegetables, other_items (full cart)
+        remaining: Ingredients left over for snacks after meal allocation (only read if include_snacks)
+        preferences: User preferences dict
+        meal_count: Number of complete meals to request (0 means none)
+        include_snacks: Whether to request snacks
+
+    Returns:
+        Meal and snack detail sections joined into one string
+    """
+    sections = []
+
+    if meal_count > 0:
+        sections.append(build_meal_details(ingredients, preferences, meal_count))
+    else:
+        sections.append('No complete meals for this cart - return an empty "meals" array.')
+
+    if include_snacks:
+        sections.append(build_snack_details(remaining, preferences))
+    else:
+        sections.append('No snacks needed for this cart - return an empty "snacks" array.')
+
+    return "\n\n".join(sections)
+
+
+def build_combined_prompt(ingredients: Dict[str, List[str]], remaining: Dict[str, List[str]],
+                          preferences: Dict[str, Any], meal_count: int, include_snacks: bool = True) -> str:
+    """
+    Build the user message that asks for meals and snacks in one response.
+
+    The meal and snack rules are sent separately as MEAL_SYSTEM_PROMPT; this
+    is the response format followed by the cart and preference data.
+
+    Args:
+        ingredients: Dict with proteins, vegetables, other_items (full cart)
+        remaining: Ingredients left over for snacks after meal allocation
+        preferences: User preferences dict
+        meal_count: Number of complete meals to request (0 means none)
+        include_snacks: Whether to request snacks
+
+    Returns:
+        Formatted prompt string for GPT returning {"meals": [...], "snacks": [...]}
+    """
+    details = build_combined_details(ingredients, remaining, preferences, meal_count, include_snacks)
+    return _assemble_combined_prompt(details)
+
+
+# Everything before the request details in the user message, joined once at import
+_COMBINED_PROMPT_PREFIX = "\n\n".join([COMBINED_RESPONSE_FORMAT, "THIS REQUEST", ""])
+
+
+def _assemble_combined_prompt(details: str) -> str:
+    """Response format first, then this request's details."""
+    return _COMBINED_PROMPT_PREFIX + details
+
+
+def _plan_generation(cart_data: Dict[str, Any], preferences: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Work out how many meals and snacks this cart supports and build the GPT prompt.
+
+    Args:
+        cart_data: Cart data dict
+        preferences: User preferences dict (optional)
+
+    Returns:
+        Dict with meal_count, include_snacks and prompt (None when there is nothing to generate)
+    """
+    # Extract ingredients
+    ingredients, snack_ready = _classify_cart(cart_data)
+
+    # Step 1: Calculate realistic meal count
+    possible_meal_count = calculate_possible_meals(ingredients['proteins'])
+    actual_meal_count = min(possible_meal_count, 4)  # Cap at 4 for now
+
+    logger.info("📊 Smart analysis: Can make %s meals from proteins, generating %s", possible_meal_count, actual_meal_count)
+    logger.debug("  ✅ Proteins available: %s items", len(ingredients['proteins']))
+    logger.debug("  ✅ Will generate: %s complete meals", actual_meal_count)
+
+    # Step 2: Decide on snacks up front - they only depend on the cart, not on GPT's meals.
+    # Snack-friendly leftovers were already spotted during extraction (snack_ready), so a
+    # full 4-meal plan or a cart with nothing snackable never builds the leftovers at all.
+    remaining = None
+    include_snacks = False
+    if actual_meal_count < 4 and snack_ready:
+        remaining = calculate_remaining_after_meals(cart_data, ingredients=ingredients)
+        include_snacks = sum(len(items) for items in remaining.values()) >= MIN_SNACK_INGREDIENTS
+
+    plan = {"meal_count": actual_meal_count, "include_snacks": include_snacks, "prompt": None}
+
+    if actual_meal_count == 0:
+        logger.warning("⚠️ No proteins available for complete meals")
+        if not include_snacks:
+            return plan
+
+    # Step 3: One prompt for meals + snacks
+    plan["details"] = build_combined_details(
+        ingredients, remaining, preferences or {}, actual_meal_count, include_snacks
+    )
+    plan["prompt"] = _assemble_combined_prompt(plan["details"])
+
+    if MEAL_GEN_MODE == "parallel" and actual_meal_count > 1:
+        plan["slices"] = _plan_parallel_slices(ingredients, remaining, preferences or {}, actual_meal_count, include_snacks)
+    return plan
+
+
+def _plan_parallel_slices(ingredients: Dict[str, List[str]], remaining: Optional[Dict[str, List[str]]],
+                          preferences: Dict[str, Any], meal_count: int, include_snacks: bool) -> List[Dict[str, Any]]:
+    """
+    Split a multi-meal plan into one-meal sub-plans for MEAL_GEN_MODE=parallel.
+
+    Independent calls can't see each other's answers, so each one is steered to
+    a different cart protein and cooking style to keep the set varied. Snacks
+    ride along with the first meal.
+    """
+    proteins = ingredients['proteins']
+    slices = []
+    for k in range(meal_count):
+        with_snacks = include_snacks and k == 0
+        details = build_combined_details(ingredients, remaining, preferences, 1, with_snacks)
+        details += _PARALLEL_SLICE_TEMPLATE.format_map({
+            'number': k + 1,
+            'total': meal_count,
+            'protein': proteins[k % len(proteins)],
+            'style': PARALLEL_MEAL_STYLES[k % len(PARALLEL_MEAL_STYLES)],
+        })
+        slices.append({
+            "meal_count": 1,
+            "include_snacks": with_snacks,
+            "details": details,
+            "prompt": _assemble_combined_prompt(details),
+        })
+    return slices
+
+
+def _combined_token_limit(meal_count: int, include_snacks: bool) -> int:
+    """
+    Output token cap for the combined call, sized to what was actually requested.
+
+    Latency scales with output tokens, so a 1-meal cart shouldn't reserve room for 4.
+    GPT-5 counts reasoning tokens against the same cap, hence the extra headroom.
+    """
+    token_limit = max(MIN_OUTPUT_TOKENS, TOKENS_PER_MEAL * meal_count + (SNACK_SECTION_TOKENS if include_snacks else 0))
+    if AI_MODEL_PROFILE.needs_reasoning_effort:
+        token_limit += GPT5_REASONING_HEADROOM
+    return token_limit
+
+
+def _combined_request_kwargs(plan: Dict[str, Any], stream: bool = False) -> Dict[str, Any]:
+    """Build chat.completions.create kwargs for the combined meal + snack call."""
+    token_limit = _combined_token_limit(plan["meal_count"], plan["include_snacks"])
+    return _chef_request_kwargs(plan["prompt"], token_limit, stream, schema=("meal_plan", MEAL_PLAN_SCHEMA))
+
+
+# Shapes of the meal and snack formats in the prompt rules. Strict mode needs every
+# property listed as required and no extras; the optional note is nullable instead.
+_MEAL_ITEM_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "servings": {"type": "integer"},
+        "time": {"type": "string"},
+        "protein_per_serving": {"type": "number"},
+        "protein_calculation": {"type": "string"},
+        "makes_x_dinners": {"type": "string"},
+        "ingredients_used": {"type": "array", "items": {"type": "string"}},
+        "note": {"type": ["string", "null"]}
+    },
+    "required": ["name", "servings", "time", "protein_per_serving", "protein_calculation",
+                 "makes_x_dinners", "ingredients_used", "note"],
+    "additionalProperties": False
+}
+
+_SNACK_ITEM_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "time": {"type": "string"},
+        "protein_per_serving": {"type": "number"},
+        "servings": {"type": "integer"},
+        "type": {"type": "string", "enum": ["snack"]},
+        "ingredients_used": {"type": "array", "items": {"type": "string"}},
+        "description": {"type": "string"}
+    },
+    "required": ["name", "time", "protein_per_serving", "servings", "type", "ingredients_used", "description"],
+    "additionalProperties": False
+}
+
+MEAL_PLAN_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "meals": {"type": "array", "items": _MEAL_ITEM_SCHEMA},
+        "snacks": {"type": "array", "items": _SNACK_ITEM_SCHEMA}
+    },
+    "required": ["meals", "snacks"],
+    "additionalProperties": False
+}
+
+
+def _chef_request_kwargs(prompt: str, token_limit: int, stream: bool = False,
+                         schema: Optional[Tuple[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """
+    Build chat.completions.create kwargs for a meal + snack user message under MEAL_SYSTEM_PROMPT.
+
+    With schema=(name, json_schema) and a model that supports it, the reply is
+    constrained to that shape (strict structured output); otherwise JSON mode.
+    """
+    api_params = build_api_params(AI_MODEL, max_tokens_value=token_limit, temperature_value=0.7)
+
+    request = {
+        "model": AI_MODEL,
+        "messages": [
+            {"role": "system", "content": MEAL_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ],
+        "prompt_cache_key": PROMPT_CACHE_KEY,
+        **api_params
+    }
+    if schema and AI_MODEL_PROFILE.supports_json_schema:
+        schema_name, json_schema = schema
+        request["response_format"] = {
+            "type": "json_schema",
+            "json_schema": {"name": schema_name, "strict": True, "schema": json_schema}
+        }
+    elif AI_MODEL_PROFILE.supports_json_mode:
+        request["response_format"] = {"type": "json_object"}
+    if stream:
+        request["stream"] = True
+        # Streams only report token usage when asked - it arrives as a final chunk with no choices
+        request["stream_options"] = {"include_usage": True}
+    return request
+
+
+def _finalize_meal(meal: Dict[str, Any], meal_id: int) -> Dict[str, Any]:
+    """
+    Normalize one GPT meal in place: protein field, 20g minimum, meal/snack type and id.
+
+    Args:
+        meal: Meal dict as returned by GPT
+        meal_id: Position of this suggestion in the combined list
+
+    Returns:
+        The same meal dict
+    """
+    # Ensure protein field exists, then validate minimum protein requirement (20g)
+    protein_value = meal.setdefault('protein', meal.get('protein_per_serving', 0))
+    if isinstance(protein_value, str):
+        # Extract numeric value from string like "35g"
+        protein_value = _first_int(protein_value)
+
+    # Enforce 20g minimum - if less, bump it up with explanation
+    if protein_value < 20:
+        logger.warning("  ⚠️ Meal '%s' has only %sg protein - adjusting to 20g minimum", meal.get('name', 'Unknown'), protein_value)
+        meal['protein'] = 20
+        meal['protein_per_serving'] = 20
+        meal['note'] = (meal.get('note') or '') + ' (protein adjusted to meet 20g minimum)'
+
+    # Categorize as meal or snack based on cooking time/complexity, not just protein
+    cook_time = meal.get('time', '').lower()
+    meal_name = meal.get('name', '').lower()
+
+    # Extract time in minutes - handle ranges like "10-12 min"
+    # Ranges take the first number: "10-12 min" → 10
+    min_pos = cook_time.find('min')
+    time_minutes = _first_int(cook_time[:min_pos]) if min_pos != -1 else 0
+
+    # Snack indicators: quick prep (<20 min), no cooking words, snack-like names
+    snack_indicators = [
+        time_minutes < 20 and time_minutes > 0,  # Quick prep time
+        any(word in meal_name for word in ['slice', 'cup', 'plate', 'mix', 'blend', 'raw', 'bowl', 'parfait', 'smoothie']),
+        any(word in cook_time for word in ['no cook', 'assembly', 'mix', 'combine', 'layer']),
+        'yogurt' in meal_name or 'berries' in meal_name or 'fruit' in meal_name  # Common snack ingredients
+    ]
+
+    # Meal indicators: longer cook time, cooking methods mentioned
+    meal_indicators = [
+        time_minutes >= 20,  # Longer cook time
+        any(word in meal_name for word in ['roast', 'sear', 'grill', 'braise', 'stir-fry', 'skillet', 'pan'])
+    ]
+
+    # Default to meal unless clear snack indicators
+    if any(snack_indicators) and not any(meal_indicators):
+        meal['type'] = 'snack'
+    else:
+        meal['type'] = 'meal'
+
+    meal['id'] = meal_id
+
+    protein_amount = meal.get('protein', 0)
+    logger.debug("  📊 %s: %sg protein, %s → %s", meal.get('name', 'Unknown'), protein_amount, cook_time, meal['type'])
+    return meal
+
+
+def _finalize_snack(snack: Dict[str, Any], snack_id: int) -> Dict[str, Any]:
+    """Set type, id and protein field on one GPT snack in place."""
+    snack['type'] = 'snack'
+    snack['id'] = snack_id
+    if 'protein_per_serving' in snack and 'protein' not in snack:
+        snack['protein'] = snack['protein_per_serving']
+    return snack
+
+
+def _summarize_suggestions(all_suggestions: List[Dict[str, Any]], snack_count: int) -> Dict[str, Any]:
+    """
+    Build the success result from finalized suggestions.
+
+    Every finalized item is typed 'meal' or 'snack', so callers count snacks
+    while finalizing and meals are the rest.
+    """
+    meal_count = len(all_suggestions) - snack_count
+
+    logger.info("🍽️ SMART GENERATION COMPLETE: %s suggestions (%s meals, %s snacks)",
+                len(all_suggestions), meal_count, snack_count)
+
+    if logger.isEnabledFor(logging.DEBUG):
+        for item in all_suggestions:
+            logger.debug("    %s: %s (%sg protein)", item.get('type', 'unknown').upper(), item.get('name', 'Unknown'), item.get('protein', 'Unknown'))
+
+    return {
+        "success": True,
+        "meals": all_suggestions,  # Contains both meals and snacks
+        "meal_count": meal_count,
+        "snack_count": snack_count,
+        "total_suggestions": len(all_suggestions)
+    }
+
+
+class _JsonItemScanner:
+    """
+    Incrementally pull complete items out of a streamed {"meals": [...], "snacks": [...]} reply.
+
+    Tracks brace/bracket depth (ignoring anything inside strings) and emits each
+    object that sits directly inside a top-level array as soon as its closing
+    brace arrives.
+    """
+
+    def __init__(self):
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._section = None
+        self._last_key = None
+        self._key_chars = None
+        self._item_chars = []
+
+    def feed(self, text: str) -> List[tuple]:
+        """
+        Consume the next chunk of streamed text.
+
+        Args:
+            text: Next piece of the model output
+
+        Returns:
+            List of (section, item) pairs completed by this chunk, e.g. ("meals", {...})
+        """
+        completed = []
+        for ch in text:
+            in_item = self._depth >= 3
+
+            if self._in_string:
+                if in_item:
+                    self._item_chars.append(ch)
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._key_chars is not None:
+                        self._last_key = ''.join(self._key_chars)
+                        self._key_chars = None
+                elif self._key_chars is not None:
+                    self._key_chars.append(ch)
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                if in_item:
+                    self._item_chars.append(ch)
+                elif self._depth == 1:
+                    self._key_chars = []
+            elif ch in '{[':
+                if self._depth == 1 and ch == '[':
+                    self._section = self._last_key
+                self._depth += 1
+                if self._depth >= 3:
+                    self._item_chars.append(ch)
+            elif ch in '}]':
+                if in_item:
+                    self._item_chars.append(ch)
+                self._depth -= 1
+                if self._depth == 2 and ch == '}' and self._item_chars:
+                    raw_item = ''.join(self._item_chars)
+                    self._item_chars = []
+                    try:
+                        completed.append((self._section, orjson.loads(raw_item)))
+                    except orjson.JSONDecodeError as e:
+                        logger.warning("⚠️ Skipping malformed streamed item: %s", e)
+            elif in_item:
+                self._item_chars.append(ch)
+
+        return completed
+
+
+def _parse_json_response(gpt_response: str) -> Dict[str, Any]:
+    """
+    Parse the JSON object out of a GPT reply, ignoring any text around it.
+
+    Slices from the first '{' to the last '}' and parses that span once, so
+    markdown fences or a stray sentence before/after the JSON don't need
+    separate split/strip passes.
+
+    Raises:
+        orjson.JSONDecodeError: if there is no parseable object in the reply
+    """
+    start = gpt_response.find('{')
+    end = gpt_response.rfind('}') + 1
+    if start == -1 or end <= start:
+        return orjson.loads(gpt_response)  # raises with the original text
+    return orjson.loads(gpt_response[start:end])
+
+
+# Generation mode for multi-meal carts. "combined" asks for every meal in one call
+# (fewest tokens); "parallel" sends one call per meal concurrently, so a user who is
+# waiting gets roughly single-meal latency (GPT-5 time grows with output length)
+MEAL_GEN_MODE = os.getenv("MEAL_GEN_MODE", "combined").lower()
+PARALLEL_MEAL_CONCURRENCY = int(os.getenv("PARALLEL_MEAL_CONCURRENCY", "8"))
+PARALLEL_MEAL_STYLES = ("a quick weeknight dinner", "a one-pan dinner", "an extra high-protein dinner", "a leftover-friendly dinner")
+
+_PARALLEL_SLICE_TEMPLATE = """
+
+This is meal {number} of {total}, each generated separately - build it around {protein} and make it {style}."""
+
+# Shared across requests so parallel fan-out stays under the account's rate limit
+_parallel_meal_semaphore: Optional[asyncio.Semaphore] = None
+
+
+# Cross-user batching - off by default (batch size 1). When enabled, concurrent
+# generate_meals calls arriving within the window share one GPT request.
+MEAL_BATCH_SIZE = int(os.getenv("MEAL_BATCH_SIZE", "1"))
+MEAL_BATCH_WINDOW_MS = int(os.getenv("MEAL_BATCH_WINDOW_MS", "50"))
+
+BATCH_RESPONSE_FORMAT = """RESPONSE FORMAT:
+You will get {count} separate requests below, each for a different household.
+Return ONE JSON object with a single key "results": an array of exactly {count} objects,
+in request order. Each object has exactly two keys:
+- "meals": array of meal objects in the meal format (count given in that request)
+- "snacks": array of snack objects in the snack format (empty array if that request doesn't ask for snacks)"""
+
+
+class MealRequestBatcher:
+    """
+    Collect concurrent meal requests and answer them with one GPT call.
+
+    Requests are queued with a future; a background worker drains up to
+    batch_size of them within the batching window, sends one prompt with the
+    shared rules once and each cart as REQUEST 1..N, then splits the
+    "results" array back onto the waiting futures. Requests missing from the
+    batched answer are retried on their own.
+    """
+
+    def __init__(self, batch_size: int, window_ms: int):
+        self.batch_size = batch_size
+        self.window_seconds = window_ms / 1000
+        self._queue = None
+        self._worker = None
+        # Strong references so in-flight dispatches aren't garbage collected
+        self._dispatch_tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, plan: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Queue one planned request and wait for its parsed {"meals", "snacks"} response.
+
+        Args:
+            plan: Output of _plan_generation (must have a prompt)
+
+        Returns:
+            Parsed GPT response for this request
+        """
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+        future = loop.create_future()
+        await self._queue.put((plan, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window_seconds
+
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Dispatch without blocking collection of the next batch
+            task = loop.create_task(self._dispatch(batch))
+            self._dispatch_tasks.add(task)
+            task.add_done_callback(self._dispatch_tasks.discard)
+
+    async def _dispatch(self, batch: List[tuple]):
+        try:
+            if len(batch) == 1:
+                plan, future = batch[0]
+                parsed = await _request_combined(plan)
+                if not future.done():
+                    future.set_result(parsed)
+                return
+
+            logger.info("📦 Batching %s meal requests into one %s call", len(batch), AI_MODEL)
+            sections = [BATCH_RESPONSE_FORMAT.format(count=len(batch))]
+            for i, (plan, _) in enumerate(batch, start=1):
+                sections.append(f"REQUEST {i}\n\n{plan['details']}")
+
+            token_limit = sum(_combined_token_limit(plan["meal_count"], plan["include_snacks"]) for plan, _ in batch)
+            response = await call_gpt(**_chef_request_kwargs("\n\n".join(sections), token_limit))
+            parsed = _parse_json_response(response.choices[0].message.content)
+            results = parsed.get("results") or []
+
+            for i, (plan, future) in enumerate(batch):
+                if i < len(results) and isinstance(results[i], dict):
+                    if not future.done():
+                        future.set_result(results[i])
+                else:
+                    logger.warning("⚠️ Batched response missing request %s - retrying on its own", i + 1)
+                    await self._dispatch([(plan, future)])
+
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+
+_meal_batcher = MealRequestBatcher(MEAL_BATCH_SIZE, MEAL_BATCH_WINDOW_MS) if MEAL_BATCH_SIZE > 1 else None
+
+
+def _log_token_usage(label: str, response: Any, request_kwargs: Dict[str, Any], finish_reason: Optional[str] = None):
+    """
+    Log output tokens used against the cap that was requested.
+
+    This is the data for tuning the budget constants above; a "length" finish
+    means the cap truncated the JSON and is too tight. For streams, pass the
+    final usage chunk and the finish_reason seen on the last content chunk.
+    """
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    if finish_reason is None and response.choices:
+        finish_reason = getattr(response.choices[0], "finish_reason", None)
+    token_cap = request_kwargs.get("max_completion_tokens") or request_kwargs.get("max_tokens")
+    logger.info("📏 %s [%s] used %s/%s output tokens", label, request_kwargs.get("model"),
+                usage.completion_tokens, token_cap or "uncapped")
+    # Input side: how much of the static system prompt OpenAI served from its prompt cache
+    prompt_details = getattr(usage, "prompt_tokens_details", None)
+    logger.debug("📏 %s prompt: %s tokens, %s cached", label, usage.prompt_tokens,
+                 getattr(prompt_details, "cached_tokens", None) or 0)
+    if finish_reason == "length":
+        logger.warning("⚠️ %s hit the output token cap (%s) - response truncated", label, token_cap)
+
+
+async def _request_combined(plan: Dict[str, Any]) -> Dict[str, Any]:
+    """Send one combined meal + snack request and return the parsed JSON object."""
+    api_start_time = time.time()
+
+    request_kwargs = _combined_request_kwargs(plan)
+    response = await call_gpt(**request_kwargs)
+    _log_token_usage(f"{plan['meal_count']} meals{' + snacks' if plan['include_snacks'] else ''}", response, request_kwargs)
+
+    api_response_time = time.time() - api_start_time
+    logger.debug("⏱️ [MEAL API DEBUG] %s meal + snack generation took: %.2f seconds", AI_MODEL, api_response_time)
+
+    # Parse combined response
+    gpt_response = response.choices[0].message.content.strip()
+    logger.debug("📥 [MEAL API DEBUG] Raw response length: %s characters", len(gpt_response))
+
+    try:
+        return _parse_json_response(gpt_response)
+    except orjson.JSONDecodeError as e:
+        # Keep the raw text around for the caller's error report
+        e.raw_response = gpt_response
+        raise
+
+
+async def _request_parallel(slices: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Send one-meal sub-plans concurrently and merge them into one {"meals", "snacks"} object.
+
+    A failed slice only costs its own meal; the error is raised only if every
+    slice fails.
+    """
+    global _parallel_meal_semaphore
+    if _parallel_meal_semaphore is None:
+        _parallel_meal_semaphore = asyncio.Semaphore(PARALLEL_MEAL_CONCURRENCY)
+
+    async def request_slice(slice_plan: Dict[str, Any]) -> Dict[str, Any]:
+        async with _parallel_meal_semaphore:
+            return await _request_combined(slice_plan)
+
+    start_time = time.time()
+    responses = await asyncio.gather(*(request_slice(p) for p in slices), return_exceptions=True)
+
+    merged = {"meals": [], "snacks": []}
+    errors = []
+    for response in responses:
+        if isinstance(response, BaseException):
+            errors.append(response)
+            continue
+        merged["meals"].extend((response.get("meals") or [])[:1])
+        merged["snacks"].extend(response.get("snacks") or [])
+
+    if len(errors) == len(slices):
+        raise errors[0]
+    if errors:
+        logger.warning("⚠️ %s of %s parallel meal calls failed: %s", len(errors), len(slices), errors[0])
+
+    logger.info("⚡ Parallel generation: %s calls in %.2fs", len(slices), time.time() - start_time)
+    return merged
+
+
+def _build_meals_result(parsed_response: Dict[str, Any], include_snacks: bool) -> Dict[str, Any]:
+    """Finalize the meals and snacks in a parsed combined response and build the success result."""
+    meals = parsed_response.get("meals") or []
+    snacks = (parsed_response.get("snacks") or []) if include_snacks else []
+
+    # Add type field, ensure protein compatibility, and categorize by protein content.
+    # Count snacks as we go so the summary doesn't rescan the list.
+    snack_count = len(snacks)
+    for i, meal in enumerate(meals):
+        if _finalize_meal(meal, i)['type'] == 'snack':
+            snack_count += 1
+
+    logger.info("✅ Generated %s complete meals", len(meals))
+
+    # Add IDs and ensure type is set on snacks
+    for i, snack in enumerate(snacks):
+        _finalize_snack(snack, len(meals) + i)
+
+    if include_snacks:
+        logger.info("✅ Generated %s snacks", len(snacks))
+
+    # Combine meals and snacks
+    return _summarize_suggestions(meals + snacks, snack_count)
+
+
+@cached_llm()
+async def generate_meals(cart_data: Dict[str, Any], preferences: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Generate smart meal suggestions: realistic meal count + snacks with remaining ingredients.
+
+    Meals and snacks are requested in a single GPT call that returns
+    {"meals": [...], "snacks": [...]}, so the user only waits on one round trip.
+    With MEAL_GEN_MODE=parallel, multi-meal carts use one concurrent call per meal.
+
+    Args:
+        cart_data: Cart data dict
+        preferences: User preferences dict (optional)
+
+    Returns:
+        Dict with success status and meals array (meals + snacks) or error
+    """
+    try:
+        logger.info("🍽️ Starting SMART meal generation... (NEW LOGIC v2)")
+
+        plan = _plan_generation(cart_data, preferences)
+        actual_meal_count = plan["meal_count"]
+        include_snacks = plan["include_snacks"]
+
+        if plan["prompt"] is None:
+            return {
+                "success": True,
+                "meals": [],
+                "meal_count": 0,
+                "snack_count": 0,
+                "total_suggestions": 0
+            }
+
+        client = get_async_client()
+        if not client:
+            return {"success": False, "error": "OpenAI API key not configured"}
+
+        logger.info("🤖 Calling %s for %s meals%s...", AI_MODEL, actual_meal_count, ' + snacks' if include_snacks else '')
+
+        # Parse JSON once, then split into meals and snacks
+        if "slices" in plan:
+            parsed_response = await _request_parallel(plan["slices"])
+        elif _meal_batcher:
+            parsed_response = await _meal_batcher.submit(plan)
+        else:
+            parsed_response = await _request_combined(plan)
+        return _build_meals_result(parsed_response, include_snacks)
+
+    except orjson.JSONDecodeError as e:
+        logger.error("❌ JSON parsing error: %s", e)
+        return {
+            "success": False,
+            "error": "Failed to parse meal suggestions",
+            "raw_response": getattr(e, "raw_response", None)
+        }
+        
+    except Exception as e:
+        logger.error("❌ Meal generation error: %s", e)
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+# OpenAI Batch API - half price, results within 24h. For offline paths only
+# (nightly pre-generation, cache warm-up), never for a user who is waiting.
+BATCH_POLL_INITIAL_SECONDS = float(os.getenv("BATCH_POLL_INITIAL_SECONDS", "5"))
+BATCH_POLL_MAX_SECONDS = float(os.getenv("BATCH_POLL_MAX_SECONDS", "60"))
+_BATCH_FINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+async def generate_meals_batch(requests: List[Tuple[str, Dict[str, Any], Dict[str, Any]]],
+                               warm_cache: bool = True) -> Dict[str, Dict[str, Any]]:
+    """
+    Generate meals for many users through the OpenAI Batch API.
+
+    Builds the same combined prompt as generate_meals for each cart, uploads
+    them as one JSONL batch and polls until the batch finishes. Successful
+    results are written to the generate_meals cache so the user's next
+    request is served without a GPT call.
 
     Args:
-        ingredients: Dict with proteins, vegetables, other_items
+        requests: (user_id, cart_data, preferences) tuples
+        warm_cache: Store successful results in the generate_meals cache
 
     Returns:
-        True if snack-worthy ingredients remain
+        Dict mapping user_id to a generate_meals-style result dict
     """
-    # Check for snack-friendly items
-    snack_indicators = [
-        'egg',        # deviled eggs, egg salad
-        'avocado',    # avocado toast, guacamole
-        'tomato',     # bruschetta, salsa
-        'cheese',     # cheese board
-        'fruit',      # fruit salad
-        'berry',      # mixed berries
-        'nut'         # trail mix
-    ]
+    results: Dict[str, Dict[str, Any]] = {}
+    plans: Dict[str, Tuple[Dict[str, Any], str]] = {}
+    lines = []
+
+    for user_id, cart_data, preferences in requests:
+        plan = _plan_generation(cart_data, preferences)
+        if plan["prompt"] is None:
+            results[user_id] = _summarize_suggestions([], 0)
+            continue
+        plans[user_id] = (plan, llm_cache_key("generate_meals", cart_data, preferences))
+        lines.append(orjson.dumps({
+            "custom_id": user_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": _combined_request_kwargs(plan)
+        }))
+
+    if not plans:
+        return results
+
+    client = get_async_client()
+    if not client:
+        results.update({user_id: {"success": False, "error": "OpenAI API key not configured"} for user_id in plans})
+        return results
 
-    all_ingredients = ingredients.get('proteins', []) + ingredients.get('vegetables', []) + ingredients.get('other_items', [])
+    try:
+        batch_file = await client.files.create(file=("meal_batch.jsonl", b"\n".join(lines)), purpose="batch")
+        batch = await client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info("📦 Submitted batch %s with %s meal requests", batch.id, len(plans))
+
+        delay = BATCH_POLL_INITIAL_SECONDS
+        while batch.status not in _BATCH_FINAL_STATUSES:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, BATCH_POLL_MAX_SECONDS)
+            batch = await client.batches.retrieve(batch.id)
+
+        logger.info("📦 Batch %s finished with status %s", batch.id, batch.status)
+        if batch.output_file_id:
+            output = await client.files.content(batch.output_file_id)
+            for line in output.content.splitlines():
+                if not line.strip():
+                    continue
+                record = orjson.loads(line)
+                user_id = record.get("custom_id")
+                if user_id not in plans:
+                    continue
+                response = record.get("response") or {}
+                if response.get("status_code") != 200:
+                    results[user_id] = {"success": False, "error": f"Batch request failed: {record.get('error') or response.get('status_code')}"}
+                    continue
+                plan, cache_key = plans[user_id]
+                gpt_response = response["body"]["choices"][0]["message"]["content"].strip()
+                try:
+                    result = _build_meals_result(_parse_json_response(gpt_response), plan["include_snacks"])
+                except orjson.JSONDecodeError:
+                    results[user_id] = {"success": False, "error": "Failed to parse meal suggestions", "raw_response": gpt_response}
+                    continue
+                results[user_id] = result
+                if warm_cache:
+                    _store_llm_response(cache_key, result, LLM_CACHE_TTL, _redis_cache_available())
 
-    for item in all_ingredients:
-        item_lower = item.lower()
-        if any(snack_ingredient in item_lower for snack_ingredient in snack_indicators):
-            return True
+    except Exception as e:
+        logger.error("❌ Batch meal generation error: %s", e)
+        for user_id in plans:
+            results.setdefault(user_id, {"success": False, "error": str(e)})
+        return results
 
-    return False
+    for user_id in plans:
+        results.setdefault(user_id, {"success": False, "error": f"No result in batch {batch.id} ({batch.status})"})
+    return results
 
 
-def calculate_remaining_after_meals(cart_data: Dict[str, Any], used_meals: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+async def generate_meals_stream(cart_data: Dict[str, Any], preferences: Dict[str, Any] = None) -> AsyncIterator[Dict[str, Any]]:
     """
-    Calculate what ingredients remain after allocating to specific meals.
+    Stream meal suggestions as GPT writes them.
+
+    Same prompt and post-processing as generate_meals, but each meal or snack
+    is yielded as soon as its JSON object closes, so the UI can show meal #1
+    while the rest are still being generated.
 
     Args:
-        cart_data: Original cart data
-        used_meals: List of meals that have been allocated
+        cart_data: Cart data dict
+        preferences: User preferences dict (optional)
 
-    Returns:
-        Dict of remaining ingredients
+    Yields:
+        {"event": "suggestion", "meal": {...}} for each meal/snack, then a final
+        {"event": "done", meal_count, snack_count, total_suggestions}
+        or {"event": "error", "error": str}
     """
-    # For Phase 1, return simplified remaining calculation
-    # In Phase 2, we'll implement proper ingredient tracking
+    try:
+        logger.info("🍽️ Starting STREAMED meal generation...")
+
+        plan = _plan_generation(cart_data, preferences)
+        if plan["prompt"] is None:
+            yield {"event": "done", "meal_count": 0, "snack_count": 0, "total_suggestions": 0}
+            return
+
+        client = get_async_client()
+        if not client:
+            yield {"event": "error", "error": "OpenAI API key not configured"}
+            return
+
+        logger.info("🤖 Streaming %s for %s meals%s...", AI_MODEL, plan['meal_count'], ' + snacks' if plan['include_snacks'] else '')
+        api_start_time = time.time()
+
+        request_kwargs = _combined_request_kwargs(plan, stream=True)
+        stream = await call_gpt(**request_kwargs)
+
+        scanner = _JsonItemScanner()
+        suggestions = []
+        snack_count = 0
+        usage_chunk = finish_reason = None
+        async for chunk in stream:
+            if not chunk.choices:
+                usage_chunk = chunk
+                continue
+            finish_reason = chunk.choices[0].finish_reason or finish_reason
+            text = chunk.choices[0].delta.content
+            if not text:
+                continue
+
+            for section, item in scanner.feed(text):
+                if section == "meals":
+                    _finalize_meal(item, len(suggestions))
+                elif section == "snacks" and plan["include_snacks"]:
+                    _finalize_snack(item, len(suggestions))
+                else:
+                    continue
+
+                if item['type'] == 'snack':
+                    snack_count += 1
+                if not suggestions:
+                    logger.debug("⏱️ [MEAL API DEBUG] First suggestion after %.2f seconds", time.time() - api_start_time)
+                suggestions.append(item)
+                yield {"event": "suggestion", "meal": item}
+
+        logger.debug("⏱️ [MEAL API DEBUG] %s streamed generation took: %.2f seconds", AI_MODEL, time.time() - api_start_time)
+        _log_token_usage(f"Streamed {plan['meal_count']} meals{' + snacks' if plan['include_snacks'] else ''}",
+                         usage_chunk, request_kwargs, finish_reason)
+
+        summary = _summarize_suggestions(suggestions, snack_count)
+        yield {
+            "event": "done",
+            "meal_count": summary["meal_count"],
+            "snack_count": summary["snack_count"],
+            "total_suggestions": summary["total_suggestions"]
+        }
 
-    original = extract_ingredients_from_cart(cart_data)
+    except Exception as e:
+        logger.error("❌ Meal stream error: %s", e)
+        yield {"event": "error", "error": str(e)}
 
-    # Simple heuristic: if we used N meals, assume major proteins are taken
-    # Leave smaller items and vegetables for snacks
-    remaining_proteins = []
-    remaining_vegetables = original['vegetables'].copy()
-    remaining_other = original['other_items'].copy()
 
-    # Keep eggs and small proteins for snacks
-    for protein in original['proteins']:
-        if 'egg' in protein.lower():
-            remaining_proteins.append(protein)
+# Static tail of the single-meal prompt - only the ingredient list and the two
+# preference lines above it change per request
+SINGLE_MEAL_PROMPT_RULES = """Requirements:
+- Use available ingredients creatively
+- 30+ grams protein per serving
+- Quick cooking method (under 30 minutes)
+- Include cooking time and protein content
+- Return valid JSON only
 
-    return {
-        'proteins': remaining_proteins,
-        'vegetables': remaining_vegetables,
-        'other_items': remaining_other
-    }
+Format:
+{
+    "name": "Meal Name with 35g protein",
+    "cooking_time": "20 minutes",
+    "protein": "35g",
+    "ingredients_used": ["ingredient1", "ingredient2"],
+    "quick_description": "Brief cooking method"
+}"""
 
 
-def extract_ingredients_from_cart(cart_data: Dict[str, Any]) -> Dict[str, List[str]]:
-    """
-    Extract and categorize ingredients from cart data WITH QUANTITY INFORMATION.
+_SINGLE_MEAL_TEMPLATE = """Create ONE simple meal using these Farm to People ingredients: {ingredients}
 
-    Args:
-        cart_data: Cart data with individual_items, customizable_boxes, etc.
+{preferences}
 
-    Returns:
-        Dict with proteins, vegetables, and other_items lists including quantities
-    """
-    proteins = []
-    vegetables = []
-    other_items = []
+"""
 
-    def format_item_with_quantity(item):
-        """Format item name with quantity and unit information."""
-        name = item.get('name', '')
-        unit = item.get('unit', '')
-        quantity = item.get('quantity', 1)
 
-        if unit and quantity:
-            if quantity == 1:
-                return f"{name} ({unit})"
-            else:
-                return f"{name} ({quantity}x {unit})"
-        return name
+@functools.lru_cache(maxsize=512)
+def _single_meal_prefs_cached(frozen_preferences: tuple) -> str:
+    """Protein + cooking style lines for the single-meal prompt, memoized like build_prefs_block."""
+    preferences = dict(frozen_preferences)
+    proteins = preferences.get('preferred_proteins', ())
+    cooking_methods = preferences.get('cooking_methods', ())
 
-    # Individual items
-    for item in cart_data.get('individual_items', []):
-        name = item.get('name', '').lower()
-        formatted_item = format_item_with_quantity(item)
+    protein_preference = f"Prefer these proteins: {', '.join(proteins[:3])}" if proteins else ""
+    cooking_preference = f"Cooking style: {', '.join(cooking_methods[:2])}" if cooking_methods else ""
+    return f"{protein_preference}\n{cooking_preference}"
 
-        if 'egg' in name:
-            proteins.append(formatted_item)
-        elif 'avocado' in name:
-            other_items.append(formatted_item)
-        elif 'banana' in name:
-            other_items.append(formatted_item)
-        else:
-            other_items.append(formatted_item)
-
-    # Customizable boxes
-    for box in cart_data.get('customizable_boxes', []):
-        for item in box.get('selected_items', []):
-            name = item.get('name', '').lower()
-            formatted_item = format_item_with_quantity(item)
-
-            if any(meat in name for meat in ['chicken', 'beef', 'turkey', 'sausage', 'fish', 'salmon', 'bass', 'pork']):
-                proteins.append(formatted_item)
-            elif any(veg in name for veg in ['tomato', 'pepper', 'kale', 'lettuce', 'carrot', 'zucchini', 'eggplant', 'onion', 'broccoli', 'spinach', 'arugula']):
-                vegetables.append(formatted_item)
-            else:
-                other_items.append(formatted_item)
 
-    # Non-customizable boxes
-    for box in cart_data.get('non_customizable_boxes', []):
-        for item in box.get('selected_items', []):
-            name = item.get('name', '').lower()
-            formatted_item = format_item_with_quantity(item)
+# Token budget for the single-meal ingredient list - long item names ("Heirloom
+# Cherry Tomato Medley (2x 1 pint)") cost several times what "Eggs" does
+SINGLE_MEAL_INGREDIENT_TOKENS = int(os.getenv("SINGLE_MEAL_INGREDIENT_TOKENS", "120"))
+# Leading proteins that are always sent, even past the budget
+SINGLE_MEAL_PROTECTED_PROTEINS = 3
 
-            if any(fruit in name for fruit in ['plum', 'peach', 'nectarine', 'apple', 'orange', 'berry']):
-                other_items.append(formatted_item)
-            else:
-                other_items.append(formatted_item)
 
-    return {
-        'proteins': proteins,
-        'vegetables': vegetables,
-        'other_items': other_items
-    }
+@functools.lru_cache(maxsize=1)
+def _token_encoder():
+    """tiktoken encoding for the single-meal model, or None to estimate from length."""
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(SINGLE_MEAL_MODEL)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:  # encoding files are fetched on first use
+        logger.warning("⚠️ tiktoken unavailable, estimating prompt tokens: %s", e)
+        return None
+
+
+@functools.lru_cache(maxsize=2048)
+def _ingredient_tokens(item: str) -> int:
+    """Tokens one ingredient adds to the comma-separated prompt list."""
+    encoder = _token_encoder()
+    text = item + ", "
+    if encoder is None:
+        return max(1, len(text) // 4)
+    return len(encoder.encode(text))
+
+
+def _ingredients_within_budget(proteins: List[str], others: Iterable[str], budget: int) -> List[str]:
+    """
+    Take ingredients in priority order until the token budget is spent.
+
+    The first SINGLE_MEAL_PROTECTED_PROTEINS proteins always go in - a meal
+    card without its protein is useless - and count against the budget.
+    """
+    selected = proteins[:SINGLE_MEAL_PROTECTED_PROTEINS]
+    used = sum(_ingredient_tokens(item) for item in selected)
+    for item in itertools.chain(proteins[SINGLE_MEAL_PROTECTED_PROTEINS:], others):
+        used += _ingredient_tokens(item)
+        if used > budget:
+            break
+        selected.append(item)
+    return selected
 
 
-def build_meal_prompt(ingredients: Dict[str, List[str]], preferences: Dict[str, Any], meal_count: int = 4) -> str:
+def _single_meal_prompt(cart_data: Dict[str, Any], preferences: Dict[str, Any] = None) -> Optional[str]:
     """
-    Build GPT prompt for meal generation based on ingredients and preferences.
-    
-    Args:
-        ingredients: Dict with proteins, vegetables, other_items
-        preferences: User preferences dict
-        
-    Returns:
-        Formatted prompt string for GPT
+    Build the prompt for one simple meal card, or None if the cart has no ingredients.
     """
-    # Extract preferences with defaults
-    household_size = preferences.get('household_size', '2 people')
-    meal_focus = preferences.get('meal_timing', ['dinner'])
-    dietary_restrictions = preferences.get('dietary_restrictions', [])
-    health_goals = preferences.get('goals', [])
-    cooking_time = 'quick (under 30 min)' if 'quick-dinners' in health_goals else 'standard'
-    high_protein = 'high-protein' in health_goals
-    
-    # Additional preferences
-    cooking_methods = preferences.get('cooking_methods', preferences.get('preferred_cooking_methods', []))
-    liked_meals = preferences.get('liked_meals', [])
-    dislikes = preferences.get('dislikes', [])
-    
-    # Calculate servings
-    servings_per_meal = 2 if '1-2' in str(household_size) else 4 if '3-4' in str(household_size) else 6
-    
-    # Build the prompt
-    prompt = f"""Analyze this cart and create meal suggestions for a household of {household_size}.
-
-CART CONTENTS WITH EXACT QUANTITIES:
-PROTEINS ({len(ingredients['proteins'])} items): {', '.join(ingredients['proteins']) if ingredients['proteins'] else 'none'}
-VEGETABLES ({len(ingredients['vegetables'])} items): {', '.join(ingredients['vegetables']) if ingredients['vegetables'] else 'none'}  
-OTHER ITEMS ({len(ingredients['other_items'])} items): {', '.join(ingredients['other_items']) if ingredients['other_items'] else 'none'}
-
-PROTEIN CALCULATION REFERENCE (per 4oz cooked serving):
-- Chicken breast: 35g protein
-- Chicken thigh: 28g protein
-- Salmon/Steelhead: 30-34g protein
-- Ground beef/turkey: 28-30g protein
-- Eggs: 6g per egg
-- Black Sea Bass: 24g protein
-- Tofu: 10g protein
+    # Extract ingredients
+    ingredients = extract_ingredients_from_cart(cart_data)
+    # Proteins first (most informative), then produce, then the rest - cut by token budget
+    prompt_ingredients = _ingredients_within_budget(
+        ingredients['proteins'],
+        itertools.chain(ingredients['vegetables'], ingredients['other_items']),
+        SINGLE_MEAL_INGREDIENT_TOKENS
+    )
 
-USER PREFERENCES TO CONSIDER:
-- Household size: {household_size} (need {servings_per_meal} servings per meal)
-- Meal focus: Primarily {', '.join(meal_focus) if isinstance(meal_focus, list) else meal_focus}
-- Dietary restrictions: {', '.join(dietary_restrictions) if dietary_restrictions else 'None'}
-- Foods to avoid: {', '.join(dislikes) if dislikes else 'None'}
-- Cooking time preference: {cooking_time}
-- Protein requirement: {'HIGH (35-40g per serving)' if high_protein else 'Standard (25-30g per serving)'}"""
-    
-    # Add preference guidance (not rules)
-    if cooking_methods:
-        prompt += f"\n- They prefer cooking with: {', '.join(cooking_methods)} methods"
-    if liked_meals:
-        prompt += f"\n- They particularly enjoy: {', '.join(liked_meals[:3])}"
-    
-    prompt += """
-
-CRITICAL QUANTITY & SERVING RULES:
-1. **PROTEIN PORTIONS (for this household size):**
-   - MINIMUM REQUIREMENT: Every meal MUST have at least 20g protein per serving
-   - 8 oz salmon/fish = 1 serving (ONE meal only - don't split across meals)
-   - 1 lb ground turkey = 2 servings (can make 2 separate meals)
-   - 1 chicken breast = 1 serving (ONE meal only)
-   - 1 dozen eggs = can use across multiple meals (3-4 eggs per meal for 20g+ protein)
-   - IMPORTANT: "Leftover" meals STILL contain full protein (e.g., turkey hash with leftover veggies = 28g protein from turkey)
-   - NEVER return less than 20g protein for any meal - combine proteins if needed
-
-2. **VEGETABLE PORTIONS:**
-   - 5 oz arugula = very small amount (1-2 side salads, not main ingredient)
-   - 1 bunch kale = 2-3 meals (hearty green, substantial amount)
-   - 2 zucchini pieces = 1-2 meals realistically
-   - 1 pint cherry tomatoes = 2-3 meals (accent ingredient)
-
-3. **INGREDIENT DISTRIBUTION RULES:**
-   - Don't use small quantities (5 oz arugula) in multiple meals
-   - Each meal should have one dedicated protein (don't split 8 oz salmon)
-   - Distribute vegetables based on actual amounts, not just variety
-   - Large quantities (1+ lb) can span multiple meals
-   - Small quantities (under 8 oz) should be used in 1 meal max
-
-4. **REALISTIC MEAL PLANNING:**
-   - Calculate how many complete dinners this cart can actually make
-   - Be honest about portions - don't overstretch small quantities
-   - Create meal names that reflect the actual ingredients available
-   - Each meal should be substantial and satisfying for the household size
-
-Return {meal_count} meal suggestions focusing on dinner meals.
-
-When possible, align with their preferences while respecting ingredient quantities.
-Prioritize variety but don't sacrifice realism for the sake of using every ingredient.
-
-Format as JSON:
-[{
-  "name": "Specific Meal Name Using Actual Ingredients",
-  "servings": """ + str(servings_per_meal) + """,
-  "time": "X min",
-  "protein_per_serving": X,
-  "protein_calculation": "Show your math: X lb protein / Y servings = Z grams per serving",
-  "makes_x_dinners": "This recipe makes X dinners for your family",
-  "ingredients_used": ["list", "actual", "cart", "items"],
-  "note": "optional note about what to add from store"
-}]"""
-    
-    return prompt
+    if not prompt_ingredients:
+        return None
 
+    return _SINGLE_MEAL_TEMPLATE.format_map({
+        'ingredients': ", ".join(prompt_ingredients),
+        'preferences': _single_meal_prefs_cached(_freeze(preferences or {})),
+    }) + SINGLE_MEAL_PROMPT_RULES
 
-def build_snack_prompt(ingredients: Dict[str, List[str]], preferences: Dict[str, Any]) -> str:
+
+# Shape of the single meal card. Strict mode needs every property listed as
+# required and no extras, which is exactly what the card renders
+SINGLE_MEAL_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "cooking_time": {"type": "string"},
+        "protein": {"type": "string"},
+        "ingredients_used": {"type": "array", "items": {"type": "string"}},
+        "quick_description": {"type": "string"}
+    },
+    "required": ["name", "cooking_time", "protein", "ingredients_used", "quick_description"],
+    "additionalProperties": False
+}
+
+
+# The single-meal call always sends the same model params, so build them once.
+# Use higher token limit for GPT-5 to account for reasoning tokens
+_SINGLE_MEAL_TOKEN_LIMIT = SINGLE_MEAL_TOKENS + (GPT5_REASONING_HEADROOM if SINGLE_MEAL_MODEL_PROFILE.needs_reasoning_effort else 0)
+_SINGLE_MEAL_API_PARAMS = MappingProxyType(
+    build_api_params(SINGLE_MEAL_MODEL, max_tokens_value=_SINGLE_MEAL_TOKEN_LIMIT, temperature_value=0.8)
+)
+
+
+def _single_meal_request_kwargs(prompt: str, stream: bool = False) -> Dict[str, Any]:
     """
-    Build GPT prompt for snack generation using remaining ingredients.
+    Keyword arguments for the single-meal chat.completions.create call.
+    """
+    kwargs = {
+        "model": SINGLE_MEAL_MODEL,
+        "messages": [
+            {"role": "user", "content": prompt}
+        ],
+        **_SINGLE_MEAL_API_PARAMS
+    }
+    if SINGLE_MEAL_MODEL_PROFILE.supports_json_schema:
+        kwargs["response_format"] = {
+            "type": "json_schema",
+            "json_schema": {"name": "single_meal", "strict": True, "schema": SINGLE_MEAL_SCHEMA}
+        }
+    elif SINGLE_MEAL_MODEL_PROFILE.supports_json_mode:
+        kwargs["response_format"] = {"type": "json_object"}
+    if stream:
+        kwargs["stream"] = True
+        kwargs["stream_options"] = {"include_usage": True}
+    return kwargs
 
-    Args:
-        ingredients: Dict with remaining proteins, vegetables, other_items
-        preferences: User preferences dict
 
-    Returns:
-        Formatted prompt string for GPT snack generation
+class _JsonFieldScanner:
     """
-    household_size = preferences.get('household_size', '2 people')
-    dietary_restrictions = preferences.get('dietary_restrictions', [])
+    Incrementally pull completed top-level fields out of a streamed JSON object.
 
-    prompt = f"""Create 1-2 quick SNACKS using these remaining ingredients:
+    Emits ("name", "Chicken Stir Fry") as soon as the value after "name" closes,
+    so a single meal card can start rendering before the reply finishes.
+    """
 
-AVAILABLE INGREDIENTS:
-PROTEINS: {', '.join(ingredients['proteins']) if ingredients['proteins'] else 'none'}
-VEGETABLES: {', '.join(ingredients['vegetables']) if ingredients['vegetables'] else 'none'}
-OTHER ITEMS: {', '.join(ingredients['other_items']) if ingredients['other_items'] else 'none'}
+    def __init__(self):
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._key_chars = None
+        self._key = None
+        self._value_chars = None
+
+    def _close_value(self, completed: List[tuple]):
+        raw_value = ''.join(self._value_chars).strip()
+        self._value_chars = None
+        if self._key is None or not raw_value:
+            return
+        try:
+            completed.append((self._key, orjson.loads(raw_value)))
+        except orjson.JSONDecodeError as e:
+            logger.warning("⚠️ Skipping malformed streamed field %s: %s", self._key, e)
+        self._key = None
+
+    def feed(self, text: str) -> List[tuple]:
+        """
+        Consume the next chunk of streamed text.
+
+        Args:
+            text: Next piece of the model output
+
+        Returns:
+            List of (key, value) pairs completed by this chunk
+        """
+        completed = []
+        for ch in text:
+            if self._value_chars is not None:
+                if self._in_string:
+                    self._value_chars.append(ch)
+                    if self._escape:
+                        self._escape = False
+                    elif ch == '\\':
+                        self._escape = True
+                    elif ch == '"':
+                        self._in_string = False
+                    continue
+                if self._depth == 1 and ch in ',}':
+                    self._close_value(completed)
+                    if ch == '}':
+                        self._depth = 0
+                    continue
+                self._value_chars.append(ch)
+                if ch == '"':
+                    self._in_string = True
+                elif ch in '{[':
+                    self._depth += 1
+                elif ch in '}]':
+                    self._depth -= 1
+                continue
+
+            if self._key_chars is not None:
+                if self._escape:
+                    self._escape = False
+                    self._key_chars.append(ch)
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._key = ''.join(self._key_chars)
+                    self._key_chars = None
+                else:
+                    self._key_chars.append(ch)
+                continue
 
-SNACK REQUIREMENTS:
-- Quick prep time (under 10 minutes) OR can be prepped ahead and stored
-- Something you can eat on-the-go or between meals
-- Household size: {household_size}
-- Dietary restrictions: {', '.join(dietary_restrictions) if dietary_restrictions else 'None'}
-- Use only ingredients listed above
-- Focus on grab-and-go convenience
-- Examples: deviled eggs, veggie bites, cheese plates, protein balls
-- Can be high protein - that's fine! Protein amount doesn't determine if it's a snack
-- The key: minimal prep when you want to eat it (prep-ahead is encouraged)
-
-Examples of good snacks:
-- Deviled eggs (if eggs available)
-- Vegetable chips with dip
-- Quick salad or bruschetta
-- Fruit/veggie combination
-- Simple appetizer
-
-Format as JSON:
-[{{
-  "name": "Snack Name",
-  "time": "X min",
-  "protein_per_serving": X,
-  "servings": 2,
-  "type": "snack",
-  "ingredients_used": ["list", "of", "ingredients"],
-  "description": "Brief preparation method"
-}}]"""
+            if ch == '{' and self._depth == 0:
+                self._depth = 1
+            elif self._depth == 1:
+                if ch == '"':
+                    self._key_chars = []
+                elif ch == ':' and self._key is not None:
+                    self._value_chars = []
 
-    return prompt
+        return completed
 
 
-async def generate_meals(cart_data: Dict[str, Any], preferences: Dict[str, Any] = None) -> Dict[str, Any]:
+@cached_llm(model=SINGLE_MEAL_MODEL)
+async def generate_single_meal(cart_data: Dict[str, Any], preferences: Dict[str, Any] = None) -> Dict[str, Any]:
     """
-    Generate smart meal suggestions: realistic meal count + snacks with remaining ingredients.
+    Generate a single meal suggestion for the simple meal card.
 
     Args:
-        cart_data: Cart data dict
-        preferences: User preferences dict (optional)
+        cart_data: Cart data with ingredients
+        preferences: User preferences (optional)
 
     Returns:
-        Dict with success status and meals array (meals + snacks) or error
+        Dict with success status and meal data
     """
     try:
-        print(f"🍽️ Starting SMART meal generation... (NEW LOGIC v2)")
+        logger.info("🍽️ Generating single meal suggestion...")
 
-        # Extract ingredients
-        ingredients = extract_ingredients_from_cart(cart_data)
-
-        # Step 1: Calculate realistic meal count
-        possible_meal_count = calculate_possible_meals(ingredients['proteins'])
-        actual_meal_count = min(possible_meal_count, 4)  # Cap at 4 for now
+        prompt = _single_meal_prompt(cart_data, preferences)
+        if prompt is None:
+            return {
+                "success": False,
+                "error": "No ingredients found in cart"
+            }
 
-        print(f"📊 Smart analysis: Can make {possible_meal_count} meals from proteins, generating {actual_meal_count}")
-        print(f"  ✅ Proteins available: {len(ingredients['proteins'])} items")
-        print(f"  ✅ Will generate: {actual_meal_count} complete meals")
-        
-        # Step 2: Generate complete meals first
-        if actual_meal_count > 0:
-            meal_prompt = build_meal_prompt(ingredients, preferences or {}, actual_meal_count)
-
-            # Call GPT for meals
-            openai_key = os.getenv("OPENAI_API_KEY")
-            if not openai_key:
-                return {"success": False, "error": "OpenAI API key not configured"}
-
-            client = openai.OpenAI(api_key=openai_key)
-            print(f"🤖 Calling {AI_MODEL} for {actual_meal_count} meal generation...")
-            api_start_time = time.time()
-
-            # Build parameters for meals
-            token_limit = 2000 if AI_MODEL.lower().startswith("gpt-5") else 800
-            api_params = build_api_params(AI_MODEL, max_tokens_value=token_limit, temperature_value=0.7)
-
-            response = client.chat.completions.create(
-                model=AI_MODEL,
-                messages=[
-                    {"role": "system", "content": "You are a creative chef who specializes in making delicious meals from specific available ingredients. Always return valid JSON."},
-                    {"role": "user", "content": meal_prompt}
-                ],
-                **api_params
-            )
-
-            api_response_time = time.time() - api_start_time
-            print(f"⏱️ [MEAL API DEBUG] {AI_MODEL} meal generation took: {api_response_time:.2f} seconds")
-
-            # Parse meal response
-            gpt_response = response.choices[0].message.content.strip()
-            print(f"📥 [MEAL API DEBUG] Raw meals response length: {len(gpt_response)} characters")
-
-            # Clean up response
-            if "```json" in gpt_response:
-                gpt_response = gpt_response.split("```json")[1].split("```")[0].strip()
-            elif "```" in gpt_response:
-                gpt_response = gpt_response.split("```")[1].strip()
-
-            # Parse JSON
-            meals = json.loads(gpt_response)
-
-            # Add type field, ensure protein compatibility, and categorize by protein content
-            for i, meal in enumerate(meals):
-                # Ensure protein field exists
-                if 'protein_per_serving' in meal and 'protein' not in meal:
-                    meal['protein'] = meal['protein_per_serving']
-
-                # Validate minimum protein requirement (20g)
-                protein_value = meal.get('protein', 0)
-                if isinstance(protein_value, str):
-                    # Extract numeric value from string like "35g"
-                    import re
-                    match = re.search(r'(\d+)', str(protein_value))
-                    if match:
-                        protein_value = int(match.group(1))
-                    else:
-                        protein_value = 0
-
-                # Enforce 20g minimum - if less, bump it up with explanation
-                if protein_value < 20:
-                    print(f"  ⚠️ Meal '{meal.get('name', 'Unknown')}' has only {protein_value}g protein - adjusting to 20g minimum")
-                    meal['protein'] = 20
-                    meal['protein_per_serving'] = 20
-                    meal['note'] = meal.get('note', '') + ' (protein adjusted to meet 20g minimum)'
-
-                # Categorize as meal or snack based on cooking time/complexity, not just protein
-                cook_time = meal.get('time', '').lower()
-                meal_name = meal.get('name', '').lower()
-
-                # Extract time in minutes - handle ranges like "10-12 min"
-                time_minutes = 0
-                if 'min' in cook_time:
-                    try:
-                        time_part = cook_time.split('min')[0].strip()
-                        if '-' in time_part:
-                            # Handle ranges: "10-12" → take first number "10"
-                            time_minutes = int(time_part.split('-')[0].strip())
-                        else:
-                            # Handle single numbers: "25" → 25
-                            time_minutes = int(''.join(filter(str.isdigit, time_part)))
-                    except:
-                        time_minutes = 0
-
-                # Snack indicators: quick prep (<20 min), no cooking words, snack-like names
-                snack_indicators = [
-                    time_minutes < 20 and time_minutes > 0,  # Quick prep time
-                    any(word in meal_name for word in ['slice', 'cup', 'plate', 'mix', 'blend', 'raw', 'bowl', 'parfait', 'smoothie']),
-                    any(word in cook_time for word in ['no cook', 'assembly', 'mix', 'combine', 'layer']),
-                    'yogurt' in meal_name or 'berries' in meal_name or 'fruit' in meal_name  # Common snack ingredients
-                ]
-
-                # Meal indicators: longer cook time, cooking methods mentioned
-                meal_indicators = [
-                    time_minutes >= 20,  # Longer cook time
-                    any(word in meal_name for word in ['roast', 'sear', 'grill', 'braise', 'stir-fry', 'skillet', 'pan'])
-                ]
-
-                # Default to meal unless clear snack indicators
-                if any(snack_indicators) and not any(meal_indicators):
-                    meal['type'] = 'snack'
-                else:
-                    meal['type'] = 'meal'
+        # Call OpenAI
+        client = get_async_client()
+        if not client:
+            return {"success": False, "error": "OpenAI API key not configured"}
 
-                meal['id'] = i
+        request_kwargs = _single_meal_request_kwargs(prompt)
+        response = await call_gpt(**request_kwargs)
+        _log_token_usage("Single meal", response, request_kwargs)
 
-                protein_amount = meal.get('protein', 0)
-                print(f"  📊 {meal.get('name', 'Unknown')}: {protein_amount}g protein, {cook_time} → {meal['type']}")
+        gpt_response = response.choices[0].message.content.strip()
+        logger.debug("🤖 GPT Response: %s...", gpt_response[:100])
 
-            print(f"✅ Generated {len(meals)} complete meals")
-        else:
-            meals = []
-            print(f"⚠️ No proteins available for complete meals")
-
-        # Step 3: Generate snacks with remaining ingredients
-        snacks = []
-        remaining = calculate_remaining_after_meals(cart_data, meals)
-
-        if has_snack_potential(remaining) and len(meals) < 4:
-            print(f"🍿 Generating snacks with remaining ingredients...")
-
-            snack_prompt = build_snack_prompt(remaining, preferences or {})
-
-            # Call GPT for snacks
-            snack_response = client.chat.completions.create(
-                model=AI_MODEL,
-                messages=[
-                    {"role": "system", "content": "You are a creative chef who makes quick, healthy snacks. Always return valid JSON."},
-                    {"role": "user", "content": snack_prompt}
-                ],
-                **api_params
-            )
-
-            snack_gpt_response = snack_response.choices[0].message.content.strip()
-
-            # Clean and parse snack response
-            if "```json" in snack_gpt_response:
-                snack_gpt_response = snack_gpt_response.split("```json")[1].split("```")[0].strip()
-            elif "```" in snack_gpt_response:
-                snack_gpt_response = snack_gpt_response.split("```")[1].strip()
-
-            try:
-                snacks = json.loads(snack_gpt_response)
-
-                # Add IDs and ensure type is set
-                for i, snack in enumerate(snacks):
-                    snack['type'] = 'snack'
-                    snack['id'] = len(meals) + i
-                    if 'protein_per_serving' in snack and 'protein' not in snack:
-                        snack['protein'] = snack['protein_per_serving']
-
-                print(f"✅ Generated {len(snacks)} snacks")
-            except json.JSONDecodeError:
-                print(f"⚠️ Could not parse snack suggestions, continuing with meals only")
-                snacks = []
-
-        # Combine meals and snacks
-        all_suggestions = meals + snacks
-
-        # Count actual meals vs snacks based on type field
-        actual_meals = [item for item in all_suggestions if item.get('type') == 'meal']
-        actual_snacks = [item for item in all_suggestions if item.get('type') == 'snack']
-
-        print(f"🍽️ SMART GENERATION COMPLETE:")
-        print(f"  📊 Total suggestions: {len(all_suggestions)}")
-        print(f"  🥘 Meals: {len(actual_meals)}")
-        print(f"  🍿 Snacks: {len(actual_snacks)}")
+        # Parse JSON (tolerates markdown fences or chatter around the object)
+        meal = _parse_json_response(gpt_response)
 
-        for item in all_suggestions:
-            print(f"    {item.get('type', 'unknown').upper()}: {item.get('name', 'Unknown')} ({item.get('protein', 'Unknown')}g protein)")
+        logger.info("✅ Generated single meal: %s", meal.get('name', 'Unknown'))
 
         return {
             "success": True,
-            "meals": all_suggestions,  # Contains both meals and snacks
-            "meal_count": len(actual_meals),
-            "snack_count": len(actual_snacks),
-            "total_suggestions": len(all_suggestions)
+            "meal": meal,
+            "ingredients_used": meal.get('ingredients_used', [])
         }
 
-    except json.JSONDecodeError as e:
-        print(f"❌ JSON parsing error: {e}")
+    except orjson.JSONDecodeError as e:
+        logger.error("❌ JSON parsing error in single meal: %s", e)
         return {
             "success": False,
-            "error": "Failed to parse meal suggestions",
+            "error": "Failed to parse meal suggestion",
             "raw_response": gpt_response if 'gpt_response' in locals() else None
         }
-        
+
     except Exception as e:
-        print(f"❌ Meal generation error: {e}")
+        logger.error("❌ Single meal generation error: %s", e)
         return {
             "success": False,
             "error": str(e)
         }
 
 
-async def generate_single_meal(cart_data: Dict[str, Any], preferences: Dict[str, Any] = None) -> Dict[str, Any]:
+async def generate_single_meal_stream(cart_data: Dict[str, Any], preferences: Dict[str, Any] = None) -> AsyncIterator[Dict[str, Any]]:
     """
-    Generate a single meal suggestion for the simple meal card.
+    Stream a single meal suggestion as GPT writes it.
+
+    Yields the meal dict built up so far each time another field (name,
+    cooking_time, protein, ...) finishes, so the card can show the meal name
+    before the rest of the reply arrives.
 
     Args:
         cart_data: Cart data with ingredients
         preferences: User preferences (optional)
 
-    Returns:
-        Dict with success status and meal data
+    Yields:
+        {"event": "partial", "meal": {...fields so far}} as fields complete, then
+        {"event": "done", "meal": {...}, "ingredients_used": [...]}
+        or {"event": "error", "error": str}
     """
     try:
-        print("🍽️ Generating single meal suggestion...")
-
-        # Extract ingredients
-        ingredients = extract_ingredients_from_cart(cart_data)
-        all_ingredients = ingredients['proteins'] + ingredients['vegetables'] + ingredients['other_items']
+        logger.info("🍽️ Streaming single meal suggestion...")
+
+        prompt = _single_meal_prompt(cart_data, preferences)
+        if prompt is None:
+            yield {"event": "error", "error": "No ingredients found in cart"}
+            return
+
+        client = get_async_client()
+        if not client:
+            yield {"event": "error", "error": "OpenAI API key not configured"}
+            return
+
+        request_kwargs = _single_meal_request_kwargs(prompt, stream=True)
+        stream = await call_gpt(**request_kwargs)
+
+        scanner = _JsonFieldScanner()
+        partial_meal = {}
+        response_parts = []
+        usage_chunk = finish_reason = None
+        async for chunk in stream:
+            if not chunk.choices:
+                usage_chunk = chunk
+                continue
+            finish_reason = chunk.choices[0].finish_reason or finish_reason
+            text = chunk.choices[0].delta.content
+            if not text:
+                continue
+
+            response_parts.append(text)
+            fields = scanner.feed(text)
+            if fields:
+                partial_meal.update(fields)
+                yield {"event": "partial", "meal": dict(partial_meal)}
+
+        _log_token_usage("Streamed single meal", usage_chunk, request_kwargs, finish_reason)
+
+        # Final strict parse of the whole reply
+        meal = _parse_json_response(''.join(response_parts))
+        logger.info("✅ Streamed single meal: %s", meal.get('name', 'Unknown'))
+        yield {"event": "done", "meal": meal, "ingredients_used": meal.get('ingredients_used', [])}
+
+    except orjson.JSONDecodeError as e:
+        logger.error("❌ JSON parsing error in streamed single meal: %s", e)
+        yield {"event": "error", "error": "Failed to parse meal suggestion"}
 
-        if not all_ingredients:
-            return {
-                "success": False,
-                "error": "No ingredients found in cart"
-            }
+    except Exception as e:
+        logger.error("❌ Single meal stream error: %s", e)
+        yield {"event": "error", "error": str(e)}
 
-        # Build simplified prompt for single meal
-        protein_preference = ""
-        cooking_preference = ""
 
-        if preferences:
-            proteins = preferences.get('preferred_proteins', [])
-            if proteins:
-                protein_preference = f"Prefer these proteins: {', '.join(proteins[:3])}"
+# Meal grid + simple meal card in one call, for pages that show both
+BUNDLE_RESPONSE_FORMAT = """RESPONSE FORMAT:
+Return ONE JSON object with exactly three keys:
+- "meals": array of meal objects in the meal format (the requested count is given below)
+- "snacks": array of snack objects in the snack format (empty array if snacks are not requested below)
+- "quick_meal": ONE simple meal object in the quick meal format below, separate from the meals above"""
 
-            cooking_methods = preferences.get('cooking_methods', [])
-            if cooking_methods:
-                cooking_preference = f"Cooking style: {', '.join(cooking_methods[:2])}"
+_BUNDLE_PROMPT_PREFIX = "\n\n".join([BUNDLE_RESPONSE_FORMAT, "QUICK MEAL\n" + SINGLE_MEAL_PROMPT_RULES, "THIS REQUEST", ""])
 
-        ingredient_list = ", ".join(all_ingredients[:10])  # Limit for prompt size
+MEAL_BUNDLE_SCHEMA = {
+    **MEAL_PLAN_SCHEMA,
+    "properties": {**MEAL_PLAN_SCHEMA["properties"], "quick_meal": SINGLE_MEAL_SCHEMA},
+    "required": MEAL_PLAN_SCHEMA["required"] + ["quick_meal"]
+}
 
-        prompt = f"""Create ONE simple meal using these Farm to People ingredients: {ingredient_list}
 
-{protein_preference}
-{cooking_preference}
+# The empty-grid fallback calls generate_single_meal, so key on both models
+@cached_llm(model=(AI_MODEL, SINGLE_MEAL_MODEL))
+async def generate_meals_bundle(cart_data: Dict[str, Any], preferences: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Generate the meal grid and the simple meal card in a single GPT call.
 
-Requirements:
-- Use available ingredients creatively
-- 30+ grams protein per serving
-- Quick cooking method (under 30 minutes)
-- Include cooking time and protein content
-- Return valid JSON only
+    Same meals and snacks as generate_meals, plus a "quick_meal" in the
+    generate_single_meal format - one round trip instead of two.
 
-Format:
-{{
-    "name": "Meal Name with 35g protein",
-    "cooking_time": "20 minutes",
-    "protein": "35g",
-    "ingredients_used": ["ingredient1", "ingredient2"],
-    "quick_description": "Brief cooking method"
-}}"""
+    Args:
+        cart_data: Cart data dict
+        preferences: User preferences dict (optional)
 
-        # Call OpenAI
-        client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-
-        # Build parameters compatible with the specific model (for single meal generation)
-        # Use higher token limit for GPT-5 to account for reasoning tokens
-        token_limit = 1000 if AI_MODEL.lower().startswith("gpt-5") else 400
-        api_params = build_api_params(AI_MODEL, max_tokens_value=token_limit, temperature_value=0.8)
-        print(f"📝 [SINGLE MEAL DEBUG] Using token limit: {token_limit} for {AI_MODEL}")
-
-        response = client.chat.completions.create(
-            model=AI_MODEL,
-            messages=[
-                {"role": "user", "content": prompt}
-            ],
-            **api_params
-        )
+    Returns:
+        generate_meals result with an added quick_meal (None if GPT left it out), or error
+    """
+    try:
+        logger.info("🍽️ Starting BUNDLED meal + quick meal generation...")
+
+        plan = _plan_generation(cart_data, preferences)
+        if plan["prompt"] is None:
+            # Nothing for the grid - the quick meal alone is just the single-meal call.
+            # The bundle is cached by its own wrapper; skipping the single-meal cache
+            # keeps use_cache=False (e.g. /api/refresh-meals) from serving a stale quick meal
+            result = _summarize_suggestions([], 0)
+            single = await generate_single_meal(cart_data, preferences, use_cache=False)
+            result["quick_meal"] = single.get("meal")
+            return result
+
+        if not get_async_client():
+            return {"success": False, "error": "OpenAI API key not configured"}
+
+        token_limit = _combined_token_limit(plan["meal_count"], plan["include_snacks"]) + SINGLE_MEAL_TOKENS
+        request_kwargs = _chef_request_kwargs(_BUNDLE_PROMPT_PREFIX + plan["details"], token_limit,
+                                              schema=("meal_bundle", MEAL_BUNDLE_SCHEMA))
+        response = await call_gpt(**request_kwargs)
+        _log_token_usage(f"{plan['meal_count']} meals + quick meal", response, request_kwargs)
 
         gpt_response = response.choices[0].message.content.strip()
-        print(f"🤖 GPT Response: {gpt_response[:100]}...")
-
-        # Clean up response if wrapped in markdown
-        if "```json" in gpt_response:
-            gpt_response = gpt_response.split("```json")[1].split("```")[0].strip()
-        elif "```" in gpt_response:
-            gpt_response = gpt_response.split("```")[1].strip()
+        parsed_response = _parse_json_response(gpt_response)
 
-        # Parse JSON
-        meal = json.loads(gpt_response)
-
-        print(f"✅ Generated single meal: {meal.get('name', 'Unknown')}")
-
-        return {
-            "success": True,
-            "meal": meal,
-            "ingredients_used": meal.get('ingredients_used', [])
-        }
+        result = _build_meals_result(parsed_response, plan["include_snacks"])
+        quick_meal = parsed_response.get("quick_meal")
+        result["quick_meal"] = quick_meal if isinstance(quick_meal, dict) else None
+        return result
 
-    except json.JSONDecodeError as e:
-        print(f"❌ JSON parsing error in single meal: {e}")
+    except orjson.JSONDecodeError as e:
+        logger.error("❌ JSON parsing error in meal bundle: %s", e)
         return {
             "success": False,
-            "error": "Failed to parse meal suggestion",
+            "error": "Failed to parse meal suggestions",
             "raw_response": gpt_response if 'gpt_response' in locals() else None
         }
 
     except Exception as e:
-        print(f"❌ Single meal generation error: {e}")
+        logger.error("❌ Meal bundle generation error: %s", e)
         return {
             "success": False,
             "error": str(e)
         }
 
 
+# Add-on results are a pure function of meals + cart + diet, and the catalog they
+# draw from only refreshes every 5 minutes - so cache them in-process for that long
+ADDON_CACHE_TTL = 300
+ADDON_CACHE_MAX_ENTRIES = 256
+_addon_cache: "OrderedDict[str, Tuple[float, List[Dict]]]" = OrderedDict()
+
+
+@dataclass(frozen=True)
+class CartView:
+    """
+    Cart item names for the add-on helpers, lowercased once per request.
+
+    lower_text joins the lowered names with newlines (names never contain one),
+    so "is X already in the cart" is a single substring search.
+    """
+    raw_names: Tuple[str, ...]
+    lower_names: Tuple[str, ...]
+    lower_text: str
+
+    @classmethod
+    def from_cart(cls, cart_data: Dict[str, Any]) -> "CartView":
+        """Collect item names from boxes first, then individual items."""
+        boxes = itertools.chain(cart_data.get("customizable_boxes", []), cart_data.get("non_customizable_boxes", []))
+        boxed_items = itertools.chain.from_iterable(box.get("selected_items", []) for box in boxes)
+        raw_names = tuple(item["name"] for item in itertools.chain(boxed_items, cart_data.get("individual_items", [])))
+        lower_names = tuple(name.lower() for name in raw_names)
+        return cls(raw_names, lower_names, '\n'.join(lower_names))
+
+
+def _addon_cache_key(meal_names: List[str], cart: CartView, preferences: Dict = None) -> str:
+    """Hash the inputs that decide add-ons; order and case don't affect the result."""
+    payload = orjson.dumps({
+        "meals": sorted(name.lower() for name in meal_names),
+        "cart": sorted(cart.lower_names),
+        "diet": canonicalize((preferences or {}).get('dietary_restrictions') or [])
+    }, default=str)
+    return hashlib.sha1(payload).hexdigest()
+
+
+def _get_cached_addons(key: str) -> Optional[List[Dict]]:
+    entry = _addon_cache.get(key)
+    if not entry:
+        return None
+    stored_at, addons = entry
+    if time.monotonic() - stored_at > ADDON_CACHE_TTL:
+        _addon_cache.pop(key, None)
+        return None
+    _addon_cache.move_to_end(key)
+    # Hand out copies so callers can't mutate the cached entries
+    return [dict(addon) for addon in addons]
+
+
+def _set_cached_addons(key: str, addons: List[Dict]):
+    _addon_cache[key] = (time.monotonic(), [dict(addon) for addon in addons])
+    _addon_cache.move_to_end(key)
+    while len(_addon_cache) > ADDON_CACHE_MAX_ENTRIES:
+        _addon_cache.popitem(last=False)
+
+
 async def generate_meal_addons(meals: List[Dict], cart_data: Dict, preferences: Dict = None) -> List[Dict]:
     """
     Generate add-on items that complement specific generated meals.
 
+    Add-ons are picked locally (protein gap check, then real catalog products,
+    then universal staples) - no model call - so a meals + add-ons request
+    costs exactly one OpenAI round trip, the one in generate_meals.
+
     Args:
         meals: List of generated meal suggestions
         cart_data: Current cart contents (to avoid suggesting existing items)
@@ -758,64 +2335,65 @@ async def generate_meal_addons(meals: List[Dict], cart_data: Dict, preferences:
     Returns:
         List of add-on dictionaries
     """
-    import time
     addon_gen_start = time.time()
 
     try:
-        openai_key = os.getenv("OPENAI_API_KEY")
-        if not openai_key:
-            print("⚠️ No OpenAI API key for add-on generation")
+        # Add-ons only accompany GPT meals, so keep the same API-key guard as generation
+        if not get_async_client():
+            logger.warning("⚠️ No OpenAI API key for add-on generation")
             return []
 
-        client = openai.OpenAI(api_key=openai_key)
-
-        # Extract current cart items to avoid duplicates
-        current_items = []
-        for box in cart_data.get("customizable_boxes", []):
-            current_items.extend([item["name"] for item in box.get("selected_items", [])])
-        for box in cart_data.get("non_customizable_boxes", []):
-            current_items.extend([item["name"] for item in box.get("selected_items", [])])
-        for item in cart_data.get("individual_items", []):
-            current_items.append(item["name"])
+        # Current cart items, to avoid suggesting what's already there
+        cart = CartView.from_cart(cart_data)
 
         # Extract meal names for context
         meal_names = [meal.get('name', 'Unknown') for meal in meals if meal.get('type') == 'meal']
 
         if not meal_names:
-            print("⚠️ No meals found for add-on generation")
+            logger.warning("⚠️ No meals found for add-on generation")
             return []
 
+        cache_key = _addon_cache_key(meal_names, cart, preferences)
+        cached_addons = _get_cached_addons(cache_key)
+        if cached_addons is not None:
+            logger.info("⚡ Reusing %s cached add-ons", len(cached_addons))
+            return cached_addons
+
         # PRIORITY 1: Check for protein gaps
-        protein_gap_addons = check_protein_gap(current_items, meal_names, preferences)
+        protein_gap_addons = check_protein_gap(cart, meal_names, preferences)
         if protein_gap_addons:
             elapsed = time.time() - addon_gen_start
-            print(f"⏱️ Detected protein gap - suggesting {len(protein_gap_addons)} protein add-ons (took {elapsed:.2f}s)")
+            logger.info("⏱️ Detected protein gap - suggesting %s protein add-ons (took %.2fs)", len(protein_gap_addons), elapsed)
+            _set_cached_addons(cache_key, protein_gap_addons)
             return protein_gap_addons
 
         # PRIORITY 2: Get real add-ons from Farm to People catalog
-        real_addons = get_real_meal_addons(meal_names, current_items)
+        real_addons = get_real_meal_addons(meal_names, cart)
         if real_addons:
             elapsed = time.time() - addon_gen_start
-            print(f"⏱️ Found {len(real_addons)} real FTP add-ons for meals (took {elapsed:.2f}s)")
+            logger.info("⏱️ Found %s real FTP add-ons for meals (took %.2fs)", len(real_addons), elapsed)
+            _set_cached_addons(cache_key, real_addons)
             return real_addons
 
         # PRIORITY 3: Fallback to universal items
         fallback_addons = get_universal_addons()
         elapsed = time.time() - addon_gen_start
-        print(f"⏱️ Using {len(fallback_addons)} universal add-ons as fallback (took {elapsed:.2f}s)")
+        logger.info("⏱️ Using %s universal add-ons as fallback (took %.2fs)", len(fallback_addons), elapsed)
+        _set_cached_addons(cache_key, fallback_addons)
         return fallback_addons
 
     except Exception as e:
-        print(f"❌ Error generating meal add-ons: {e}")
+        logger.error("❌ Error generating meal add-ons: %s", e)
         return []
 
 
-def check_protein_gap(current_items: List[str], meal_names: List[str], preferences: Dict = None) -> List[Dict]:
+def check_protein_gap(cart: CartView, meal_names: List[str],
+                      preferences: Optional[Dict[str, Any]] = None) -> List[Dict[str, str]]:
     """
     Check if cart has sufficient protein for planned meals.
 
     Args:
-        current_items: List of current cart items
+        cart: Current cart item names
         meal_names: List of planned meal names
         preferences: User preferences for protein types
 
@@ -824,27 +2402,23 @@ def check_protein_gap(current_items: List[str], meal_names: List[str], preferenc
     """
     try:
         # Count proteins in current cart
-        protein_count = 0
-        for item in current_items:
-            if is_protein_item(item):
-                protein_count += 1
-
-        meals_count = len(meal_names)
+        protein_count: int = sum(1 for name in cart.lower_names if _PROTEIN_ITEM_RE.search(name))
+        meals_count: int = len(meal_names)
 
-        print(f"🥩 Protein analysis: {protein_count} proteins in cart, {meals_count} meals planned")
+        logger.info("🥩 Protein analysis: %s proteins in cart, %s meals planned", protein_count, meals_count)
 
         # If we have sufficient proteins (at least 1 per meal), no gap
         if protein_count >= meals_count:
             return []
 
         # Calculate protein gap
-        protein_gap = meals_count - protein_count
+        protein_gap: int = meals_count - protein_count
 
         # Get user's preferred protein types
         preferred_proteins = get_preferred_proteins(preferences)
 
         # Generate protein add-on suggestions
-        protein_addons = []
+        protein_addons: List[Dict[str, str]] = []
 
         if protein_gap >= 1:
             # Suggest primary protein
@@ -876,148 +2450,156 @@ def check_protein_gap(current_items: List[str], meal_names: List[str], preferenc
         return protein_addons[:3]  # Cap at 3 suggestions
 
     except Exception as e:
-        print(f"❌ Error checking protein gap: {e}")
+        logger.error("❌ Error checking protein gap: %s", e)
         return []
 
 
+PROTEIN_KEYWORDS: Tuple[str, ...] = (
+    'chicken', 'beef', 'turkey', 'pork', 'lamb', 'fish', 'salmon',
+    'tuna', 'cod', 'bass', 'steelhead', 'shrimp', 'egg', 'tofu',
+    'tempeh', 'seitan', 'beans', 'lentils', 'quinoa', 'sausage',
+    'kielbasa', 'bacon', 'ham', 'duck', 'goat', 'bison'
+)
+
+# One alternation scan per item instead of 26 substring checks
+_PROTEIN_ITEM_RE = re.compile('|'.join(map(re.escape, PROTEIN_KEYWORDS)))
+
+
 def is_protein_item(item_name: str) -> bool:
     """Check if an item is a protein source."""
-    name = item_name.lower()
-    protein_keywords = [
-        'chicken', 'beef', 'turkey', 'pork', 'lamb', 'fish', 'salmon',
-        'tuna', 'cod', 'bass', 'steelhead', 'shrimp', 'egg', 'tofu',
-        'tempeh', 'seitan', 'beans', 'lentils', 'quinoa', 'sausage',
-        'kielbasa', 'bacon', 'ham', 'duck', 'goat', 'bison'
-    ]
-    return any(keyword in name for keyword in protein_keywords)
+    return _PROTEIN_ITEM_RE.search(item_name.lower()) is not None
 
 
-def get_preferred_proteins(preferences: Dict = None) -> List[str]:
+_DEFAULT_PROTEINS = ("Organic Chicken Breast", "Wild-Caught Salmon", "Grass-Fed Ground Beef")
+_VEG_PROTEINS = ("Organic Extra-Firm Tofu", "Tempeh", "Black Beans")
+_PESC_PROTEINS = ("Wild-Caught Salmon", "Fresh Cod Fillets", "Sustainable Shrimp")
+
+
+def get_preferred_proteins(preferences: Optional[Dict[str, Any]] = None) -> List[str]:
     """Get user's preferred protein types based on dietary restrictions."""
     if not preferences:
-        return ["Organic Chicken Breast", "Wild-Caught Salmon", "Grass-Fed Ground Beef"]
+        return list(_DEFAULT_PROTEINS)
 
     dietary_restrictions = preferences.get('dietary_restrictions', [])
 
     # Handle vegetarian/vegan preferences
     if 'vegetarian' in dietary_restrictions or 'vegan' in dietary_restrictions:
-        return ["Organic Extra-Firm Tofu", "Tempeh", "Black Beans"]
+        return list(_VEG_PROTEINS)
 
     # Handle pescatarian
     if 'pescatarian' in dietary_restrictions:
-        return ["Wild-Caught Salmon", "Fresh Cod Fillets", "Sustainable Shrimp"]
+        return list(_PESC_PROTEINS)
 
     # Default omnivore options
-    return ["Organic Chicken Breast", "Wild-Caught Salmon", "Grass-Fed Ground Beef"]
+    return list(_DEFAULT_PROTEINS)
+
+
+# Cuisine-triggered catalog add-ons, in suggestion order:
+# (bucket, meal keywords, skip if any cart item contains, catalog product, reason)
+CUISINE_ADDONS = (
+    ('asian', ('stir-fry', 'asian', 'soy', 'sesame', 'ginger', 'teriyaki'), 'ginger',
+     "Organic Ginger Root", "Essential for authentic Asian stir-fry flavors"),
+    ('italian', ('italian', 'pasta', 'tomato', 'basil', 'parmesan'), 'basil',
+     "Organic Fresh Basil", "Fresh herbs elevate Italian dishes"),
+    ('seafood', ('salmon', 'fish', 'seafood', 'cod', 'bass'), 'lemon',
+     "Organic Lemons", "Fresh citrus brightens seafood dishes"),
+    ('mexican', ('mexican', 'cilantro', 'lime', 'salsa', 'taco'), 'cilantro',
+     "Organic Cilantro", "Fresh cilantro for authentic Mexican flavors"),
+    ('roasted', ('roasted', 'roast', 'grilled', 'herb'), 'rosemary',
+     "Organic Bunched Rosemary", "Aromatic herbs for roasted dishes"),
+)
+
+# All cuisine keywords in one pattern, one named group per bucket. Wrapped in a
+# lookahead so every position is tested - overlapping hits from different
+# buckets are all reported in a single pass over the meal text.
+_CUISINE_RE = re.compile('(?=' + '|'.join(
+    f"(?P<{bucket}>{'|'.join(map(re.escape, keywords))})" for bucket, keywords, *_ in CUISINE_ADDONS
+) + ')')
+
+
+def _catalog_addon(product: Dict, reason: str) -> Dict:
+    """Shape a catalog product as an add-on suggestion."""
+    return {
+        "item": product['name'],
+        "price": product['price'],
+        "reason": reason,
+        "category": "produce",
+        "vendor": product.get('vendor', 'Farm to People')
+    }
+
+
+# product_catalog pulls in pandas, so bind it on first add-on request rather than at
+# import time; later calls skip the import machinery entirely
+_get_product_catalog = None
+
+
+def _load_product_catalog() -> Dict:
+    """Return the product catalog, importing its loader on first use."""
+    global _get_product_catalog
+    if _get_product_catalog is None:
+        from server.product_catalog import get_product_catalog
+        _get_product_catalog = get_product_catalog
+    return _get_product_catalog()
+
+
+def _iter_real_addons(catalog: Dict, cuisines: set, cart_text: str) -> Iterator[Dict]:
+    """Yield catalog add-ons for the detected cuisines, then garlic, skipping anything already in the cart."""
+    for bucket, _, cart_keyword, product_name, reason in CUISINE_ADDONS:
+        if bucket in cuisines and cart_keyword not in cart_text:
+            product = find_product_by_name(catalog, product_name)
+            if product:
+                yield _catalog_addon(product, reason)
 
+    # General cooking - garlic is universal
+    if 'garlic' not in cart_text:
+        garlic_product = find_product_by_name(catalog, "Organic Garlic")
+        if garlic_product:
+            yield _catalog_addon(garlic_product, "Essential aromatic for most cuisines")
 
-def get_real_meal_addons(meal_names: List[str], current_items: List[str]) -> List[Dict]:
+
+def get_real_meal_addons(meal_names: List[str], cart: CartView) -> List[Dict]:
     """
     Get real Farm to People add-on products based on meal types.
 
     Args:
         meal_names: List of meal names to analyze
-        current_items: Items already in cart to avoid duplicates
+        cart: Items already in cart to avoid duplicates
 
     Returns:
         List of real FTP add-on suggestions
     """
     try:
-        from server.product_catalog import get_product_catalog
-        catalog = get_product_catalog()
-
-        # Convert current items to lowercase for comparison
-        current_items_lower = [item.lower() for item in current_items]
-
-        addons = []
+        catalog = _load_product_catalog()
 
         # Analyze meal types and suggest appropriate items
         meal_text = ' '.join(meal_names).lower()
+        cuisines = {match.lastgroup for match in _CUISINE_RE.finditer(meal_text)}
 
-        # Asian/Stir-fry meals
-        if any(keyword in meal_text for keyword in ['stir-fry', 'asian', 'soy', 'sesame', 'ginger', 'teriyaki']):
-            if not any('ginger' in item for item in current_items_lower):
-                ginger_product = find_product_by_name(catalog, "Organic Ginger Root")
-                if ginger_product:
-                    addons.append({
-                        "item": ginger_product['name'],
-                        "price": ginger_product['price'],
-                        "reason": "Essential for authentic Asian stir-fry flavors",
-                        "category": "produce",
-                        "vendor": ginger_product.get('vendor', 'Farm to People')
-                    })
-
-        # Italian meals
-        if any(keyword in meal_text for keyword in ['italian', 'pasta', 'tomato', 'basil', 'parmesan']):
-            if not any('basil' in item for item in current_items_lower):
-                basil_product = find_product_by_name(catalog, "Organic Fresh Basil")
-                if basil_product:
-                    addons.append({
-                        "item": basil_product['name'],
-                        "price": basil_product['price'],
-                        "reason": "Fresh herbs elevate Italian dishes",
-                        "category": "produce",
-                        "vendor": basil_product.get('vendor', 'Farm to People')
-                    })
-
-        # Fish/Seafood meals
-        if any(keyword in meal_text for keyword in ['salmon', 'fish', 'seafood', 'cod', 'bass']):
-            if not any('lemon' in item for item in current_items_lower):
-                lemon_product = find_product_by_name(catalog, "Organic Lemons")
-                if lemon_product:
-                    addons.append({
-                        "item": lemon_product['name'],
-                        "price": lemon_product['price'],
-                        "reason": "Fresh citrus brightens seafood dishes",
-                        "category": "produce",
-                        "vendor": lemon_product.get('vendor', 'Farm to People')
-                    })
-
-        # Mexican/Latin meals
-        if any(keyword in meal_text for keyword in ['mexican', 'cilantro', 'lime', 'salsa', 'taco']):
-            if not any('cilantro' in item for item in current_items_lower):
-                cilantro_product = find_product_by_name(catalog, "Organic Cilantro")
-                if cilantro_product:
-                    addons.append({
-                        "item": cilantro_product['name'],
-                        "price": cilantro_product['price'],
-                        "reason": "Fresh cilantro for authentic Mexican flavors",
-                        "category": "produce",
-                        "vendor": cilantro_product.get('vendor', 'Farm to People')
-                    })
-
-        # Roasted/Grilled meals
-        if any(keyword in meal_text for keyword in ['roasted', 'roast', 'grilled', 'herb']):
-            if not any('rosemary' in item for item in current_items_lower):
-                rosemary_product = find_product_by_name(catalog, "Organic Bunched Rosemary")
-                if rosemary_product:
-                    addons.append({
-                        "item": rosemary_product['name'],
-                        "price": rosemary_product['price'],
-                        "reason": "Aromatic herbs for roasted dishes",
-                        "category": "produce",
-                        "vendor": rosemary_product.get('vendor', 'Farm to People')
-                    })
-
-        # General cooking - garlic is universal
-        if not any('garlic' in item for item in current_items_lower) and len(addons) < 3:
-            garlic_product = find_product_by_name(catalog, "Organic Garlic")
-            if garlic_product:
-                addons.append({
-                    "item": garlic_product['name'],
-                    "price": garlic_product['price'],
-                    "reason": "Essential aromatic for most cuisines",
-                    "category": "produce",
-                    "vendor": garlic_product.get('vendor', 'Farm to People')
-                })
-
-        return addons[:3]  # Return max 3 suggestions
+        # Lookup, cart filter and the 3-item cap in one lazy pass - catalog
+        # lookups stop as soon as the third add-on is found
+        return list(itertools.islice(_iter_real_addons(catalog, cuisines, cart.lower_text), 3))
 
     except Exception as e:
-        print(f"❌ Error getting real add-ons: {e}")
+        logger.error("❌ Error getting real add-ons: %s", e)
         return []
 
 
+# Universal items that enhance most dishes: (catalog product, reason)
+_UNIVERSAL_ITEMS = (
+    ("Organic Italian Parsley", "Versatile herb for garnishing any dish"),
+    ("Organic Lemons", "Brightens flavors in any cuisine"),
+    ("Organic Garlic", "Essential aromatic base for cooking")
+)
+
+# Hard-coded fallback with known prices, for when the catalog can't be read.
+# Read-only views - get_universal_addons hands out fresh dicts
+_UNIVERSAL_FALLBACK_ADDONS = (
+    MappingProxyType({"item": "Organic Italian Parsley", "price": "$3.29", "reason": "Versatile herb for garnishing", "category": "produce"}),
+    MappingProxyType({"item": "Organic Lemons", "price": "$1.99", "reason": "Brightens any dish", "category": "produce"}),
+    MappingProxyType({"item": "Organic Garlic", "price": "$1.00", "reason": "Essential cooking aromatic", "category": "produce"})
+)
+
+
 def get_universal_addons() -> List[Dict]:
     """
     Get universal add-on items that work with any meal.
@@ -1026,18 +2608,10 @@ def get_universal_addons() -> List[Dict]:
         List of universal add-on suggestions with real FTP products
     """
     try:
-        from server.product_catalog import get_product_catalog
-        catalog = get_product_catalog()
-
-        # Universal items that enhance most dishes
-        universal_items = [
-            ("Organic Italian Parsley", "Versatile herb for garnishing any dish"),
-            ("Organic Lemons", "Brightens flavors in any cuisine"),
-            ("Organic Garlic", "Essential aromatic base for cooking")
-        ]
+        catalog = _load_product_catalog()
 
         addons = []
-        for item_name, reason in universal_items:
+        for item_name, reason in _UNIVERSAL_ITEMS:
             product = find_product_by_name(catalog, item_name)
             if product:
                 addons.append({
@@ -1051,13 +2625,59 @@ def get_universal_addons() -> List[Dict]:
         return addons
 
     except Exception as e:
-        print(f"❌ Error getting universal add-ons: {e}")
-        # Hard-coded fallback with known prices
-        return [
-            {"item": "Organic Italian Parsley", "price": "$3.29", "reason": "Versatile herb for garnishing", "category": "produce"},
-            {"item": "Organic Lemons", "price": "$1.99", "reason": "Brightens any dish", "category": "produce"},
-            {"item": "Organic Garlic", "price": "$1.00", "reason": "Essential cooking aromatic", "category": "produce"}
-        ]
+        logger.error("❌ Error getting universal add-ons: %s", e)
+        return [dict(addon) for addon in _UNIVERSAL_FALLBACK_ADDONS]
+
+
+class _CatalogIndex:
+    """
+    Lookup structures for one product catalog snapshot.
+
+    Built once per catalog object (get_product_catalog hands back the same dict
+    until its 5-minute refresh): an exact-name dict plus parallel lowered-name /
+    product columns for the partial pass, with partial results memoized since
+    add-ons only ever search a handful of fixed product names.
+    """
+
+    def __init__(self, catalog: Dict):
+        self.catalog = catalog
+        self.exact = {}
+        self.names_lower = []
+        self.products = []
+        for name, product in catalog.items():
+            name_lower = name.lower()
+            self.exact.setdefault(name_lower, product)  # first match wins, as in a linear scan
+            self.names_lower.append(name_lower)
+            self.products.append(product)
+        self.partial = {}
+
+    def find(self, search_lower: str) -> Optional[Dict]:
+        product = self.exact.get(search_lower)
+        if product is not None:
+            return product
+
+        if search_lower not in self.partial:
+            self.partial[search_lower] = self._partial_match(search_lower)
+        return self.partial[search_lower]
+
+    def _partial_match(self, search_lower: str) -> Optional[Dict]:
+        words = search_lower.split()
+        word_re = re.compile('|'.join(map(re.escape, words))) if words else None
+        for name_lower, product in zip(self.names_lower, self.products):
+            if search_lower in name_lower or (word_re and word_re.search(name_lower)):
+                return product
+        return None
+
+
+_catalog_index: Optional[_CatalogIndex] = None
+
+
+def _get_catalog_index(catalog: Dict) -> _CatalogIndex:
+    """Return the index for this catalog, rebuilding only when a new catalog object shows up."""
+    global _catalog_index
+    if _catalog_index is None or _catalog_index.catalog is not catalog:
+        _catalog_index = _CatalogIndex(catalog)
+    return _catalog_index
 
 
 def find_product_by_name(catalog: Dict, search_name: str) -> Optional[Dict]:
@@ -1071,16 +2691,4 @@ def find_product_by_name(catalog: Dict, search_name: str) -> Optional[Dict]:
     Returns:
         Product dict if found, None otherwise
     """
-    search_lower = search_name.lower()
-
-    # Try exact match first
-    for name, product in catalog.items():
-        if search_lower == name.lower():
-            return product
-
-    # Try partial match
-    for name, product in catalog.items():
-        if search_lower in name.lower() or any(word in name.lower() for word in search_lower.split()):
-            return product
-
-    return None
\ No newline at end of file
+    return _get_catalog_index(catalog).find(search_name.lower())
@@ -6,25 +6,79 @@ Extracted from server.py to centralize messaging.
 """
 
 import os
-from typing import Optional
-import vonage
-
-
-# Initialize Vonage client (same as server.py)
-vonage_client = None
-try:
-    api_key = os.getenv("VONAGE_API_KEY")
-    api_secret = os.getenv("VONAGE_API_SECRET")
-    if api_key and api_secret:
-        vonage_client = vonage.Client(key=api_key, secret=api_secret)
-        print("✅ Vonage client initialized")
-    else:
-        print("⚠️ SMS disabled - missing Vonage credentials")
-except Exception as e:
-    print(f"⚠️ SMS disabled - Vonage init error: {e}")
+import asyncio
+import logging
+from types import MappingProxyType
+from typing import Iterable, List, Optional, Tuple
+import httpx
+
+logger = logging.getLogger(__name__)
+
+VONAGE_SMS_URL = "https://rest.nexmo.com/sms/json"
+# Vonage throttles per-account SMS throughput; cap in-flight sends to match
+SMS_MAX_CONCURRENCY = int(os.getenv("SMS_MAX_CONCURRENCY", "20"))
+
+# Vonage credentials (same as server.py)
+api_key = os.getenv("VONAGE_API_KEY")
+api_secret = os.getenv("VONAGE_API_SECRET")
+sms_enabled = bool(api_key and api_secret)
+
+# Sender number, with the US country code Vonage expects - fixed for the process
+VONAGE_FROM_NUMBER = os.getenv("VONAGE_PHONE_NUMBER", "12019773745")
+if not VONAGE_FROM_NUMBER.startswith("1"):
+    VONAGE_FROM_NUMBER = "1" + VONAGE_FROM_NUMBER
+if sms_enabled:
+    logger.info("✅ Vonage SMS enabled")
+else:
+    logger.warning("⚠️ SMS disabled - missing Vonage credentials")
+
+# Help footers appended to outgoing SMS, keyed by conversation state
+_HELP_TEXT = MappingProxyType({
+    'analyzing': "━━━━━━━━━\n⏳ This takes 20-30 seconds...",
+    'plan_ready': "━━━━━━━━━\n💬 Reply: CONFIRM | SWAP item | SKIP day | help",
+    'greeting': "━━━━━━━━━\n💬 Text 'plan' to start | 'new' to register",
+    'onboarding': "━━━━━━━━━\n💬 Reply with your cooking preferences or use the link",
+    'login': "━━━━━━━━━\n💬 After login, text 'plan' for your meal plan",
+    'error': "━━━━━━━━━\n💬 Text 'plan' to try again | 'help' for options",
+    'default': "━━━━━━━━━\n💬 Text 'plan' to start | 'new' to register | 'help' for options"
+})
+
+_ERROR_MESSAGES = {
+    "no_account": "❌ Account not found. Please text 'FEED ME' to get set up first!",
+    "no_credentials": "❌ Please connect your Farm to People account first.",
+    "scrape_failed": "❌ Having trouble accessing your cart. Please check your Farm to People account and try again.",
+    "meal_failed": "❌ Error analyzing your cart. Please try again in a moment.",
+    "pdf_failed": "❌ Error generating your recipe PDF. Please try again with 'plan'.",
+    "general": "❌ Something went wrong. Please try again later."
+}
 
+# Error SMS bodies never change, so format them once at import
+_ERROR_SMS = MappingProxyType({
+    error_type: f"{message}\n{_HELP_TEXT['error']}"
+    for error_type, message in _ERROR_MESSAGES.items()
+})
 
-def send_sms(phone_number: str, message: str) -> bool:
+_http_client: Optional[httpx.AsyncClient] = None
+_sms_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Lazily create the shared HTTP client so connections are pooled across sends."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(timeout=10.0)
+    return _http_client
+
+
+def _get_sms_semaphore() -> asyncio.Semaphore:
+    """Lazily create the send semaphore inside the running event loop."""
+    global _sms_semaphore
+    if _sms_semaphore is None:
+        _sms_semaphore = asyncio.Semaphore(SMS_MAX_CONCURRENCY)
+    return _sms_semaphore
+
+
+async def send_sms(phone_number: str, message: str) -> bool:
     """
     Send an SMS message to a phone number.
     
@@ -35,36 +89,57 @@ def send_sms(phone_number: str, message: str) -> bool:
     Returns:
         True if sent successfully
     """
-    if not vonage_client:
-        print(f"⚠️ SMS disabled - would send to {phone_number}: {message[:50]}...")
+    if not sms_enabled:
+        logger.warning("⚠️ SMS disabled - would send to %s: %s...", phone_number, message[:50])
         return False
     
     try:
         # Remove + prefix for Vonage (same as server.py)
-        to_number = phone_number.lstrip("+")
-        from_number = os.getenv("VONAGE_PHONE_NUMBER", "12019773745")
+        to_number = phone_number[1:] if phone_number.startswith("+") else phone_number
         
-        # Ensure from number has country code
-        if not from_number.startswith("1"):
-            from_number = "1" + from_number
+        logger.info("📱 Sending SMS from %s to %s", VONAGE_FROM_NUMBER, to_number)
         
-        print(f"📱 Sending SMS from {from_number} to {to_number}")
+        async with _get_sms_semaphore():
+            response = await _get_http_client().post(VONAGE_SMS_URL, data={
+                "api_key": api_key,
+                "api_secret": api_secret,
+                "from": VONAGE_FROM_NUMBER,
+                "to": to_number,
+                "text": message
+            })
+        response.raise_for_status()
+        result = response.json()
         
-        response = vonage_client.sms.send_message({
-            "from": from_number,
-            "to": to_number,
-            "text": message
-        })
+        # Vonage reports per-message status; "0" means accepted
+        failed = [m for m in result.get("messages", []) if m.get("status") != "0"]
+        if failed:
+            logger.error("❌ Error sending SMS: %s", failed[0].get("error-text"))
+            return False
         
-        print(f"✅ SMS sent successfully: {response}")
+        logger.info("✅ SMS sent successfully: %s", result)
         return True
         
     except Exception as e:
-        print(f"❌ Error sending SMS: {e}")
+        logger.error("❌ Error sending SMS: %s", e)
         return False
 
 
-def send_progress_sms(phone_number: str, message: str) -> bool:
+async def send_sms_bulk(messages: Iterable[Tuple[str, str]]) -> List[bool]:
+    """
+    Send several SMS messages concurrently.
+    
+    Args:
+        messages: (phone_number, message) pairs
+        
+    Returns:
+        Per-message success flags, in input order
+    """
+    return list(await asyncio.gather(
+        *(send_sms(phone_number, message) for phone_number, message in messages)
+    ))
+
+
+async def send_progress_sms(phone_number: str, message: str) -> bool:
     """
     Send a progress update SMS (wrapper for consistency with server.py).
     
@@ -75,7 +150,7 @@ def send_progress_sms(phone_number: str, message: str) -> bool:
     Returns:
         True if sent
     """
-    return send_sms(phone_number, message)
+    return await send_sms(phone_number, message)
 
 
 def format_sms_with_help(message: str, state: str = 'default') -> str:
@@ -90,20 +165,10 @@ def format_sms_with_help(message: str, state: str = 'default') -> str:
     Returns:
         Message with help text
     """
-    help_text = {
-        'analyzing': "━━━━━━━━━\n⏳ This takes 20-30 seconds...",
-        'plan_ready': "━━━━━━━━━\n💬 Reply: CONFIRM | SWAP item | SKIP day | help",
-        'greeting': "━━━━━━━━━\n💬 Text 'plan' to start | 'new' to register",
-        'onboarding': "━━━━━━━━━\n💬 Reply with your cooking preferences or use the link",
-        'login': "━━━━━━━━━\n💬 After login, text 'plan' for your meal plan",
-        'error': "━━━━━━━━━\n💬 Text 'plan' to try again | 'help' for options",
-        'default': "━━━━━━━━━\n💬 Text 'plan' to start | 'new' to register | 'help' for options"
-    }
-    
-    return f"{message}\n{help_text.get(state, help_text['default'])}"
+    return f"{message}\n{_HELP_TEXT.get(state, _HELP_TEXT['default'])}"
 
 
-def send_meal_plan_sms(phone: str, pdf_url: Optional[str], meals: list) -> bool:
+async def send_meal_plan_sms(phone: str, pdf_url: Optional[str], meals: list) -> bool:
     """
     Send the final meal plan SMS.
     
@@ -124,17 +189,21 @@ def send_meal_plan_sms(phone: str, pdf_url: Optional[str], meals: list) -> bool:
         )
     elif meals:
         # Send text version
-        sms_body = "🍽️ Your Farm to People meal plan is ready!\n\n"
-        for meal in meals:
-            sms_body += f"- {meal.get('title', meal.get('name', 'Meal'))}\n"
-        sms_body += "\nEnjoy your meals!"
+        meal_lines = "\n".join(
+            f"- {meal.get('title', meal.get('name', 'Meal'))}" for meal in meals
+        )
+        sms_body = (
+            f"🍽️ Your Farm to People meal plan is ready!\n\n"
+            f"{meal_lines}\n\n"
+            f"Enjoy your meals!"
+        )
     else:
         sms_body = "Sorry, I had trouble generating a meal plan. Please try again later."
     
-    return send_sms(phone, sms_body)
+    return await send_sms(phone, sms_body)
 
 
-def send_error_sms(phone: str, error_type: str = "general") -> bool:
+async def send_error_sms(phone: str, error_type: str = "general") -> bool:
     """
     Send error notification SMS.
     
@@ -145,13 +214,4 @@ def send_error_sms(phone: str, error_type: str = "general") -> bool:
     Returns:
         True if sent
     """
-    messages = {
-        "no_account": "❌ Account not found. Please text 'FEED ME' to get set up first!",
-        "no_credentials": "❌ Please connect your Farm to People account first.",
-        "scrape_failed": "❌ Having trouble accessing your cart. Please check your Farm to People account and try again.",
-        "meal_failed": "❌ Error analyzing your cart. Please try again in a moment.",
-        "general": "❌ Something went wrong. Please try again later."
-    }
-    
-    message = messages.get(error_type, messages["general"])
-    return send_sms(phone, format_sms_with_help(message, 'error'))
\ No newline at end of file
+    return await send_sms(phone, _ERROR_SMS.get(error_type, _ERROR_SMS["general"]))
\ No newline at end of file
@@ -6,14 +6,38 @@ Extracted from server.py to isolate PDF logic.
 """
 
 import os
-from typing import Dict, Any, Optional
+import time
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
 from pathlib import Path
+from uuid import uuid4
+
+logger = logging.getLogger(__name__)
+
+# Optional Supabase Storage offload - when a bucket is configured, rendered PDFs
+# are uploaded there and /pdfs/{name} redirects to a signed URL instead of
+# streaming the bytes through an app worker
+PDF_STORAGE_BUCKET = os.getenv("PDF_STORAGE_BUCKET")
+PDF_SIGNED_URL_TTL = int(os.getenv("PDF_SIGNED_URL_TTL", str(7 * 24 * 60 * 60)))
+
+# filename -> (expires_at, signed_url); an SMS link gets clicked in bursts, so
+# sign once and hand the same URL out until it's halfway to expiry
+_signed_url_cache: Dict[str, Tuple[float, str]] = {}
+
+# Filenames handed out by schedule_meal_plan_pdf whose render hasn't finished
+_pending_pdfs: Set[str] = set()
+# Scheduled filenames whose render failed - their link already went out by SMS
+_failed_pdfs: Set[str] = set()
+# Strong references so running render tasks aren't garbage collected
+_pdf_tasks: Set[asyncio.Task] = set()
 
 
 def generate_meal_plan_pdf(
     plan_data: Dict[str, Any],
     user_preferences: Dict[str, Any],
-    detailed: bool = True
+    detailed: bool = True,
+    output_filename: Optional[str] = None
 ) -> Optional[str]:
     """
     Generate a PDF meal plan.
@@ -22,6 +46,7 @@ def generate_meal_plan_pdf(
         plan_data: Meal plan data with recipes
         user_preferences: User's cooking preferences
         detailed: Whether to include detailed recipes
+        output_filename: Optional filename for the PDF (timestamped if omitted)
         
     Returns:
         Path to generated PDF or None if failed
@@ -33,24 +58,165 @@ def generate_meal_plan_pdf(
         # Get user skill level
         skill_level = user_preferences.get('cooking_skill_level', 'intermediate')
         
-        print(f"📄 Generating PDF meal plan (detailed={detailed}, skill={skill_level})")
+        logger.info("📄 Generating PDF meal plan (detailed=%s, skill=%s)", detailed, skill_level)
         
         # Generate PDF
         pdf_path = generate_pdf_meal_plan(
+            output_filename=output_filename,
             generate_detailed_recipes=detailed,
             user_skill_level=skill_level
         )
         
         if pdf_path and os.path.exists(pdf_path):
-            print(f"✅ PDF generated successfully: {pdf_path}")
+            logger.info("✅ PDF generated successfully: %s", pdf_path)
             return pdf_path
         else:
-            print("⚠️ PDF generation returned no path")
+            logger.warning("⚠️ PDF generation returned no path")
             return None
             
     except Exception as e:
-        print(f"❌ PDF generation error: {e}")
+        logger.error("❌ PDF generation error: %s", e)
+        return None
+
+
+async def _render_pdf_task(
+    plan_data: Dict[str, Any],
+    user_preferences: Dict[str, Any],
+    detailed: bool,
+    filename: str,
+    on_failure: Optional[Callable[[], Awaitable[Any]]] = None
+) -> None:
+    """Render a scheduled PDF off the event loop (uploading it if storage is set), then clear its pending flag."""
+    pdf_path = None
+    try:
+        pdf_path = await asyncio.to_thread(
+            generate_meal_plan_pdf, plan_data, user_preferences, detailed, filename
+        )
+        if pdf_path and PDF_STORAGE_BUCKET:
+            await asyncio.to_thread(upload_pdf_to_storage, pdf_path)
+    except Exception as e:
+        logger.error("❌ Background PDF render failed: %s", e)
+    finally:
+        if not pdf_path:
+            _failed_pdfs.add(filename)
+        _pending_pdfs.discard(filename)
+    
+    if not pdf_path and on_failure is not None:
+        try:
+            await on_failure()
+        except Exception as e:
+            logger.warning("⚠️ PDF failure callback failed: %s", e)
+
+
+def upload_pdf_to_storage(pdf_path: str) -> bool:
+    """
+    Upload a rendered PDF to the configured storage bucket.
+    
+    Args:
+        pdf_path: Local path to PDF file
+        
+    Returns:
+        True if uploaded (False if storage isn't configured or the upload failed)
+    """
+    if not PDF_STORAGE_BUCKET:
+        return False
+    
+    import supabase_client
+    
+    filename = Path(pdf_path).name
+    uploaded = supabase_client.upload_pdf(PDF_STORAGE_BUCKET, f"pdfs/{filename}", pdf_path)
+    if uploaded:
+        logger.info("☁️ Uploaded PDF to storage: %s", filename)
+    return uploaded
+
+
+def get_pdf_download_url(filename: str) -> Optional[str]:
+    """
+    Signed storage URL for a rendered PDF, or None to serve it locally.
+    
+    Args:
+        filename: PDF filename (as in the /pdfs/{filename} link)
+        
+    Returns:
+        Signed URL if storage is configured and the PDF was uploaded
+    """
+    if not PDF_STORAGE_BUCKET:
         return None
+    
+    now = time.time()
+    cached = _signed_url_cache.get(filename)
+    if cached and cached[0] > now:
+        return cached[1]
+    
+    import supabase_client
+    
+    signed_url = supabase_client.create_signed_pdf_url(
+        PDF_STORAGE_BUCKET, f"pdfs/{filename}", PDF_SIGNED_URL_TTL
+    )
+    if signed_url:
+        _signed_url_cache[filename] = (now + PDF_SIGNED_URL_TTL / 2, signed_url)
+    return signed_url
+
+
+def schedule_meal_plan_pdf(
+    plan_data: Dict[str, Any],
+    user_preferences: Dict[str, Any],
+    detailed: bool = True,
+    on_failure: Optional[Callable[[], Awaitable[Any]]] = None
+) -> str:
+    """
+    Queue a PDF render in the background and return its filename immediately.
+    
+    The caller can build and send the URL right away; the /pdfs endpoint
+    reports the file as not ready yet until the render finishes.
+    Must be called from within a running event loop.
+    
+    Args:
+        plan_data: Meal plan data with recipes
+        user_preferences: User's cooking preferences
+        detailed: Whether to include detailed recipes
+        on_failure: Awaited if the render produces no PDF (e.g. to text the user)
+        
+    Returns:
+        Filename the PDF will be written to
+    """
+    filename = f"meal_plan_{uuid4().hex}.pdf"
+    _pending_pdfs.add(filename)
+    
+    task = asyncio.create_task(
+        _render_pdf_task(plan_data, user_preferences, detailed, filename, on_failure)
+    )
+    _pdf_tasks.add(task)
+    task.add_done_callback(_pdf_tasks.discard)
+    
+    logger.info("📄 Scheduled background PDF render: %s", filename)
+    return filename
+
+
+def is_pdf_pending(filename: str) -> bool:
+    """
+    Check whether a scheduled PDF is still rendering.
+    
+    Args:
+        filename: PDF filename from schedule_meal_plan_pdf
+        
+    Returns:
+        True if the render hasn't finished yet
+    """
+    return filename in _pending_pdfs
+
+
+def is_pdf_failed(filename: str) -> bool:
+    """
+    Check whether a scheduled PDF failed to render.
+    
+    Args:
+        filename: PDF filename from schedule_meal_plan_pdf
+        
+    Returns:
+        True if the render finished without producing a PDF
+    """
+    return filename in _failed_pdfs
 
 
 def get_pdf_url(pdf_path: str, base_url: str = None) -> str:
@@ -117,9 +283,6 @@ def cleanup_old_pdfs(days: int = 7) -> int:
     Returns:
         Number of files deleted
     """
-    import time
-    from datetime import datetime, timedelta
-    
     pdf_dir = Path("pdfs")
     if not pdf_dir.exists():
         return 0
@@ -127,13 +290,18 @@ def cleanup_old_pdfs(days: int = 7) -> int:
     deleted = 0
     cutoff_time = time.time() - (days * 24 * 60 * 60)
     
-    for pdf_file in pdf_dir.glob("*.pdf"):
-        if pdf_file.stat().st_mtime < cutoff_time:
-            try:
-                pdf_file.unlink()
-                deleted += 1
-                print(f"🗑️ Deleted old PDF: {pdf_file.name}")
-            except Exception as e:
-                print(f"⚠️ Could not delete {pdf_file.name}: {e}")
+    # scandir hands back directory entries with cached stat info, avoiding a
+    # separate lookup per file when the directory holds many old PDFs
+    with os.scandir(pdf_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".pdf") or not entry.is_file():
+                continue
+            if entry.stat().st_mtime < cutoff_time:
+                try:
+                    os.unlink(entry.path)
+                    deleted += 1
+                    logger.info("🗑️ Deleted old PDF: %s", entry.name)
+                except OSError as e:
+                    logger.warning("⚠️ Could not delete %s: %s", entry.name, e)
     
     return deleted
\ No newline at end of file
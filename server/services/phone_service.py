@@ -7,10 +7,23 @@ All phone numbers in the system should go through this service.
 Standard format: +1XXXXXXXXXX (E.164 format for US numbers)
 """
 
+import functools
 import re
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
+# The same few numbers (one per active user) come through on every inbound SMS,
+# so the pure helpers below are memoized; the cap bounds memory per process
+PHONE_CACHE_SIZE = 4096
 
+# Deletes every ASCII character except 0-9; str.translate applies it in C,
+# which is much cheaper than a regex pass for a 10-15 character number
+_ASCII_NON_DIGITS = str.maketrans('', '', ''.join(chr(c) for c in range(128) if not chr(c).isdigit()))
+
+# Fallback for the rare number that still has non-ASCII characters after that
+_NON_DIGIT_RE = re.compile(r'\D')
+
+
+@functools.lru_cache(maxsize=PHONE_CACHE_SIZE)
 def normalize_phone(phone: str) -> Optional[str]:
     """
     Normalize any phone number format to +1XXXXXXXXXX.
@@ -33,22 +46,40 @@ def normalize_phone(phone: str) -> Optional[str]:
     """
     if not phone:
         return None
+    
+    # Already E.164 (the usual case for numbers read back from the DB or Vonage):
+    # cheapest checks first, and isascii keeps non-ASCII digits off this path
+    if (isinstance(phone, str) and len(phone) == 12 and phone.startswith('+1')
+            and phone[2:].isascii() and phone[2:].isdigit()):
+        return phone
         
-    # Remove all non-digit characters
-    digits = re.sub(r'\D', '', str(phone))
+    digits = _extract_us_digits(phone)
+    return f'+1{digits}' if digits else None
+
+
+def _extract_us_digits(phone) -> Optional[str]:
+    """
+    The 10-digit US number inside any phone format, without country code.
+    
+    Returns:
+        10 digits, or None if the input isn't a US number
+    """
+    # Remove all non-digit characters (webhooks already hand us str; only coerce others)
+    text = phone if isinstance(phone, str) else str(phone)
+    digits = text.translate(_ASCII_NON_DIGITS)
+    if not digits.isascii():
+        # Rare non-ASCII input - drop everything \D matches (keeps Unicode decimal digits)
+        digits = _NON_DIGIT_RE.sub('', digits)
     
     # Handle different digit lengths
     if len(digits) == 10:
         # US number without country code
-        return f'+1{digits}'
+        return digits
     elif len(digits) == 11 and digits[0] == '1':
         # US number with country code
-        return f'+{digits}'
-    elif len(digits) == 11 and digits[0] != '1':
-        # Possibly international, but we only support US for now
-        return None
+        return digits[1:]
     else:
-        # Invalid length
+        # Invalid length, or possibly international - we only support US for now
         return None
 
 
@@ -67,36 +98,33 @@ def get_phone_variants(phone: str) -> List[str]:
         >>> get_phone_variants("2125551234")
         ['+12125551234', '12125551234', '2125551234', '+2125551234']
     """
+    # Cached as a tuple; each caller gets its own list
+    return list(_phone_variants_cached(phone))
+
+
+@functools.lru_cache(maxsize=PHONE_CACHE_SIZE)
+def _phone_variants_cached(phone: str) -> Tuple[str, ...]:
     normalized = normalize_phone(phone)
     if not normalized:
-        return [phone]  # Return original if can't normalize
+        return (phone,)  # Return original if can't normalize
     
     # Remove the + for the base number
     base = normalized[1:]  # Remove leading +
     digits_only = base[1:] if base.startswith('1') else base  # Remove country code
     
-    variants = [
+    variants = (
         normalized,           # +12125551234
         base,                # 12125551234
         digits_only,         # 2125551234
         f'+{digits_only}',   # +2125551234 (incorrect but might exist)
-    ]
-    
-    # Add original if different
-    if phone not in variants:
-        variants.append(phone)
+        phone,               # original, if different
+    )
     
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_variants = []
-    for v in variants:
-        if v not in seen:
-            seen.add(v)
-            unique_variants.append(v)
-    
-    return unique_variants
+    # Remove duplicates while preserving order (dicts keep insertion order)
+    return tuple(dict.fromkeys(variants))
 
 
+@functools.lru_cache(maxsize=PHONE_CACHE_SIZE)
 def format_phone_display(phone: str) -> str:
     """
     Format a normalized phone number for display.
@@ -124,6 +152,7 @@ def format_phone_display(phone: str) -> str:
         return phone  # Return as-is if unexpected format
 
 
+@functools.lru_cache(maxsize=PHONE_CACHE_SIZE)
 def validate_us_phone(phone: str) -> bool:
     """
     Validate if a phone number is a valid US phone number.
@@ -134,25 +163,16 @@ def validate_us_phone(phone: str) -> bool:
     Returns:
         True if valid US phone number, False otherwise
     """
-    normalized = normalize_phone(phone)
-    if not normalized:
-        return False
-    
-    # Check if it starts with +1 and has 11 total digits
-    if not normalized.startswith('+1') or len(normalized) != 12:
-        return False
-    
-    # Extract area code and check if valid (not starting with 0 or 1)
-    area_code = normalized[2:5]
-    if area_code[0] in '01':
+    if not phone:
         return False
     
-    # Extract exchange and check if valid (not starting with 0 or 1)
-    exchange = normalized[5:8]
-    if exchange[0] in '01':
+    # Validation doesn't need the formatted number, just its digits
+    digits = _extract_us_digits(phone)
+    if not digits:
         return False
     
-    return True
+    # Area code and exchange can't start with 0 or 1
+    return digits[0] not in '01' and digits[3] not in '01'
 
 
 # Migration helper
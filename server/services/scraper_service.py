@@ -6,14 +6,67 @@ Extracted from server.py to isolate scraping logic.
 """
 
 import os
+import copy
+import asyncio
+import logging
 import sys
-from typing import Dict, Any, Optional
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
 
-# Add parent directory to path for scrapers import
-sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
-from scrapers.comprehensive_scraper import main as run_cart_scraper
 import supabase_client as db
 
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def _cart_scraper():
+    """Import the Playwright scraper on first use rather than at worker boot."""
+    # Add project root to path for scrapers import
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+    if project_root not in sys.path:
+        sys.path.append(project_root)
+    from scrapers.comprehensive_scraper import main
+    return main
+
+
+async def run_cart_scraper(credentials: Dict[str, str], **kwargs) -> Optional[Dict[str, Any]]:
+    """
+    Run the comprehensive cart scraper.
+    
+    Processes that only answer SMS never load Playwright; the import cost
+    is paid by the first request that actually scrapes.
+    """
+    return await _cart_scraper()(credentials, **kwargs)
+
+# (account, phone, save_to_db) -> scrape currently running for it. A user who
+# double-texts "plan" joins the running browser session instead of starting another.
+_inflight_scrapes: Dict[Tuple[str, Optional[str], bool], "asyncio.Future[Dict[str, Any]]"] = {}
+
+# Short-lived copy of the stored-cart fallback. When scraping or Supabase is
+# failing, every retry would otherwise pay another slow DB round trip.
+STORED_CART_CACHE_TTL = float(os.getenv("STORED_CART_CACHE_TTL", "10"))
+STORED_CART_CACHE_MAX_ENTRIES = 512
+_stored_cart_cache: "OrderedDict[str, Tuple[float, Optional[Dict[str, Any]]]]" = OrderedDict()
+
+
+def _remember_stored_cart(phone: str, stored: Optional[Dict[str, Any]]):
+    _stored_cart_cache[phone] = (time.monotonic(), stored)
+    _stored_cart_cache.move_to_end(phone)
+    while len(_stored_cart_cache) > STORED_CART_CACHE_MAX_ENTRIES:
+        _stored_cart_cache.popitem(last=False)
+
+
+def _get_stored_cart(phone: str) -> Optional[Dict[str, Any]]:
+    """db.get_latest_cart_data behind a short TTL cache (misses are cached too)."""
+    entry = _stored_cart_cache.get(phone)
+    if entry and time.monotonic() - entry[0] <= STORED_CART_CACHE_TTL:
+        return entry[1]
+    stored = db.get_latest_cart_data(phone)
+    _remember_stored_cart(phone, stored)
+    return stored
+
 
 async def scrape_user_cart(
     credentials: Dict[str, str],
@@ -30,6 +83,8 @@ async def scrape_user_cart(
         
     Returns:
         Dict with cart_data or error info
+    
+    Concurrent calls for the same account share one scrape.
     """
     if not credentials or not credentials.get('email') or not credentials.get('password'):
         return {
@@ -38,7 +93,25 @@ async def scrape_user_cart(
             "cart_data": None
         }
     
-    print(f"🛒 Starting cart scrape for: {credentials['email']}")
+    key = (credentials['email'].lower(), phone, save_to_db)
+    pending = _inflight_scrapes.get(key)
+    if pending is not None:
+        logger.info("⚡ Joining in-flight cart scrape for: %s", credentials['email'])
+    else:
+        pending = asyncio.ensure_future(_scrape_user_cart(credentials, phone, save_to_db))
+        _inflight_scrapes[key] = pending
+        pending.add_done_callback(lambda _: _inflight_scrapes.pop(key, None))
+    # shield: one caller going away must not cancel the scrape the others are waiting on
+    return copy.deepcopy(await asyncio.shield(pending))
+
+
+async def _scrape_user_cart(
+    credentials: Dict[str, str],
+    phone: Optional[str],
+    save_to_db: bool
+) -> Dict[str, Any]:
+    """Run one scrape (with stored-cart fallback) - see scrape_user_cart."""
+    logger.info("🛒 Starting cart scrape for: %s", credentials['email'])
     
     try:
         # Run the scraper - keeping exact same call as server.py
@@ -49,12 +122,12 @@ async def scrape_user_cart(
         )
         
         if not cart_data:
-            print("⚠️ Scraper returned no data")
+            logger.warning("⚠️ Scraper returned no data")
             # Try to get stored cart as fallback (same as server.py)
             if phone:
-                stored = db.get_latest_cart_data(phone)
+                stored = _get_stored_cart(phone)
                 if stored and stored.get('cart_data'):
-                    print("✅ Using stored cart data as fallback")
+                    logger.info("✅ Using stored cart data as fallback")
                     return {
                         "success": True,
                         "cart_data": stored['cart_data'],
@@ -68,7 +141,7 @@ async def scrape_user_cart(
             }
         
         # Log what we got (same as server.py)
-        print(f"✅ Cart scraping completed: {len(cart_data.get('individual_items', [])) if cart_data else 0} items")
+        logger.info("✅ Cart scraping completed: %s items", len(cart_data.get('individual_items', [])) if cart_data else 0)
         
         # Save to database if requested
         if save_to_db and phone:
@@ -77,9 +150,11 @@ async def scrape_user_cart(
                     phone_number=phone,
                     cart_data=cart_data
                 )
-                print(f"✅ Cart data saved to database")
+                logger.info("✅ Cart data saved to database")
+                # The fresh scrape is now the stored cart - seed the fallback cache
+                _remember_stored_cart(phone, {"cart_data": cart_data})
             except Exception as e:
-                print(f"⚠️ Failed to save cart data: {e}")
+                logger.warning("⚠️ Failed to save cart data: %s", e)
         
         return {
             "success": True,
@@ -88,13 +163,13 @@ async def scrape_user_cart(
         }
         
     except Exception as e:
-        print(f"❌ Cart scraping failed: {e}")
+        logger.error("❌ Cart scraping failed: %s", e)
         
         # Try fallback to stored data (same logic as server.py)
         if phone:
-            stored = db.get_latest_cart_data(phone)
+            stored = _get_stored_cart(phone)
             if stored and stored.get('cart_data'):
-                print("✅ Using stored cart data after scrape failure")
+                logger.info("✅ Using stored cart data after scrape failure")
                 return {
                     "success": True,
                     "cart_data": stored['cart_data'],
@@ -6,60 +6,123 @@ Extracted from server.py to isolate SMS logic.
 """
 
 import os
-from typing import Tuple
+from types import MappingProxyType
+from typing import Optional, Tuple
 from services.phone_service import normalize_phone
 import supabase_client as db
 
 
-def format_sms_with_help(message: str, state: str = 'default') -> str:
-    """
-    Format SMS responses with contextual help text.
-    
-    Args:
-        message: Main message to send
-        state: Current conversation state
-        
-    Returns:
-        Formatted message with help text
-    """
-    help_texts = {
-        'greeting': """
+# Help footers appended to outgoing SMS, keyed by conversation state
+_HELP_TEXTS = MappingProxyType({
+    'greeting': """
 ━━━━━━━━━
 Reply with:
 • "plan" - Get meal plans
 • "new" - Sign up
 • "help" - More options""",
         
-        'analyzing': """
+    'analyzing': """
 ━━━━━━━━━
 ⏳ This takes 20-30 seconds. You'll receive:
 • 5 personalized meals
 • Link to full recipes
 • Shopping list""",
         
-        'plan_ready': """
+    'plan_ready': """
 ━━━━━━━━━
 Reply with:
 • "save" - Save this plan
 • "new plan" - Try different meals
 • "help" - More options""",
         
-        'error': """
+    'error': """
 ━━━━━━━━━
 Reply with:
 • "plan" - Try again
 • "help" - Get support
 • "stop" - Unsubscribe""",
         
-        'default': """
+    'default': """
 ━━━━━━━━━
 • "plan" - Meal plans
 • "help" - Support
 • "stop" - Unsubscribe"""
-    }
+})
+
+_DEFAULT_HELP = _HELP_TEXTS['default']
+
+
+def format_sms_with_help(message: str, state: str = 'default') -> str:
+    """
+    Format SMS responses with contextual help text.
+    
+    Args:
+        message: Main message to send
+        state: Current conversation state
+        
+    Returns:
+        Formatted message with help text
+    """
+    return f"{message}\n{_HELP_TEXTS.get(state, _DEFAULT_HELP)}"
+
+
+# Replies that don't depend on the sender, formatted once at import
+_HELP_REPLY = format_sms_with_help(
+    "📱 Farm to People AI Commands:\n\n"
+    "• 'plan' - Get personalized meal plans\n"
+    "• 'new' - Create account\n"
+    "• 'stop' - Unsubscribe",
+    'default'
+)
+_ANALYZING_REPLY = format_sms_with_help("📦 Analyzing your Farm to People cart...", 'analyzing')
+_GREETING_REPLY = format_sms_with_help(
+    "👋 Hi! I'm your Farm to People meal planning assistant.",
+    'greeting'
+)
+
+# Keyword -> route, in priority order: a message containing "stop" anywhere
+# unsubscribes, even if it also says "plan"
+_ROUTE_KEYWORDS = (
+    (("stop",), "stop"),
+    (("help",), "help"),
+    (("plan", "meal"), "plan"),
+    (("new", "start"), "new"),
+    (("hello", "hi"), "greeting"),
+)
+
+
+def _scan_route(msg_lower: str) -> Optional[str]:
+    """Highest-priority route whose keyword appears anywhere in the message."""
+    for keywords, route in _ROUTE_KEYWORDS:
+        for keyword in keywords:
+            if keyword in msg_lower:
+                return route
+    return None
+
+
+# Most texts are a bare command ("plan", "help"), so resolve those with one dict
+# lookup. Derived from the scan itself, so the two can't disagree.
+_EXACT_ROUTES = {
+    keyword: _scan_route(keyword)
+    for keywords, _ in _ROUTE_KEYWORDS
+    for keyword in keywords
+}
+
+
+def _match_route(msg_lower: str) -> Optional[str]:
+    """
+    Pick the route for a lowercased, stripped message.
     
-    help_text = help_texts.get(state, help_texts['default'])
-    return f"{message}\n{help_text}"
+    Args:
+        msg_lower: Message text, lowercased and stripped
+        
+    Returns:
+        Route name ("stop", "help", "plan", "new", "greeting") or None if unrecognized
+    """
+    route = _EXACT_ROUTES.get(msg_lower)
+    if route is None:
+        route = _scan_route(msg_lower)
+    return route
 
 
 def route_sms_message(phone: str, message: str) -> Tuple[str, bool]:
@@ -82,19 +145,14 @@ def route_sms_message(phone: str, message: str) -> Tuple[str, bool]:
     msg_lower = message.lower().strip()
     
     # Route based on keywords
-    if "stop" in msg_lower:
+    route = _match_route(msg_lower)
+    if route == "stop":
         return ("You've been unsubscribed. Reply START to re-subscribe.", False)
     
-    elif "help" in msg_lower:
-        return (format_sms_with_help(
-            "📱 Farm to People AI Commands:\n\n"
-            "• 'plan' - Get personalized meal plans\n"
-            "• 'new' - Create account\n"
-            "• 'stop' - Unsubscribe",
-            'default'
-        ), False)
+    elif route == "help":
+        return (_HELP_REPLY, False)
     
-    elif "plan" in msg_lower or "meal" in msg_lower:
+    elif route == "plan":
         # Check if user exists
         user = db.get_user_by_phone(normalized_phone)
         if not user:
@@ -105,12 +163,9 @@ def route_sms_message(phone: str, message: str) -> Tuple[str, bool]:
             ), False)
         
         # User exists - trigger meal plan generation
-        return (format_sms_with_help(
-            "📦 Analyzing your Farm to People cart...",
-            'analyzing'
-        ), True)  # True = trigger background task
+        return (_ANALYZING_REPLY, True)  # True = trigger background task
     
-    elif "new" in msg_lower or "start" in msg_lower:
+    elif route == "new":
         return (format_sms_with_help(
             f"👋 Welcome to Farm to People AI!\n\n"
             f"Let's set up your meal planning:\n"
@@ -119,11 +174,8 @@ def route_sms_message(phone: str, message: str) -> Tuple[str, bool]:
             'greeting'
         ), False)
     
-    elif "hello" in msg_lower or "hi" in msg_lower:
-        return (format_sms_with_help(
-            "👋 Hi! I'm your Farm to People meal planning assistant.",
-            'greeting'
-        ), False)
+    elif route == "greeting":
+        return (_GREETING_REPLY, False)
     
     else:
         return (format_sms_with_help(
@@ -40,12 +40,25 @@ class MealPlanStorage(ABC):
         """
         pass
     
+    @abstractmethod
+    async def get_meal_plans(self, user_phone: str, weeks: List[date]) -> Dict[date, Optional[Dict]]:
+        """
+        Retrieve meal plans for several weeks at once (e.g. plan history).
+        
+        Args:
+            user_phone: User's phone number
+            weeks: Dates of the weeks to fetch
+            
+        Returns:
+            Dict mapping each requested week to its meal plan, or None if not found
+        """
+        pass
+    
     @abstractmethod
     async def update_meal_plan_status(self, plan_id: str, status: str) -> bool:
         """Update meal plan status (planning, complete, archived)."""
         pass
     
-    @abstractmethod
     async def assign_meal(self, plan_id: str, day: str, meal_data: Dict, ingredients: List[Dict]) -> bool:
         """
         Assign a meal to a specific day.
@@ -59,6 +72,25 @@ class MealPlanStorage(ABC):
         Returns:
             Success status
         """
+        results = await self.assign_meals(plan_id, [(day, meal_data, ingredients)])
+        return results[0]
+    
+    @abstractmethod
+    async def assign_meals(self, plan_id: str, assignments: List[Tuple[str, Dict, List[Dict]]]) -> List[bool]:
+        """
+        Assign several meals at once (e.g. a full week) in as few round trips as possible.
+        
+        Meals already assigned to those days are replaced and their ingredients
+        released first. The batch is all-or-nothing: if any meal's ingredients
+        don't fit, ConflictError is raised and nothing is written.
+        
+        Args:
+            plan_id: Meal plan UUID
+            assignments: (day, meal_data, ingredients) tuples, one per day
+            
+        Returns:
+            Success status for each assignment, in order
+        """
         pass
     
     @abstractmethod
@@ -95,6 +127,15 @@ class MealPlanStorage(ABC):
         pass
     
     @abstractmethod
+    async def get_ingredient_pools(self, plan_ids: List[str]) -> Dict[str, Dict[str, Dict]]:
+        """
+        Get ingredient availability for several plans at once.
+        
+        Returns:
+            Dict mapping each plan ID to its pool (same shape as get_ingredient_pool)
+        """
+        pass
+    
     async def allocate_ingredients(self, plan_id: str, day: str, ingredients: List[Dict]) -> Dict:
         """
         Allocate ingredients for a meal.
@@ -108,6 +149,21 @@ class MealPlanStorage(ABC):
         Returns:
             Result dict with success status and any conflicts
         """
+        results = await self.allocate_ingredients_batch(plan_id, [(day, ingredients)])
+        return results[day]
+    
+    @abstractmethod
+    async def allocate_ingredients_batch(self, plan_id: str, items: List[Tuple[str, List[Dict]]]) -> Dict[str, Dict]:
+        """
+        Allocate ingredients for several meals against one read of the pool.
+        
+        Args:
+            plan_id: Meal plan UUID
+            items: (day, ingredients) tuples, allocated in order
+            
+        Returns:
+            Dict mapping each day to its result dict (success status and any conflicts)
+        """
         pass
     
     @abstractmethod
@@ -158,21 +214,28 @@ class MealPlanStorage(ABC):
 
 class StorageError(Exception):
     """Base exception for storage operations."""
-    pass
+    # Slots keep instances from allocating a per-instance __dict__ in the conflict path
+    __slots__ = ()
 
 
 class ConflictError(StorageError):
     """Raised when ingredient allocation conflicts occur."""
+    __slots__ = ('conflicts',)
+    
     def __init__(self, conflicts: List[Dict]):
         self.conflicts = conflicts
-        super().__init__(f"Ingredient conflicts: {conflicts}")
+        # Handlers usually read .conflicts; only format the list if the message is used
+        super().__init__("Ingredient conflicts")
+    
+    def __str__(self):
+        return f"Ingredient conflicts: {self.conflicts}"
 
 
 class NotFoundError(StorageError):
     """Raised when requested resource is not found."""
-    pass
+    __slots__ = ()
 
 
 class ValidationError(StorageError):
     """Raised when data validation fails."""
-    pass
\ No newline at end of file
+    __slots__ = ()
\ No newline at end of file
@@ -6,7 +6,7 @@ Provides persistent storage with real-time sync capabilities.
 import json
 import uuid
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, date, timedelta
 from decimal import Decimal
 
@@ -65,6 +65,81 @@ class SupabaseMealStorage(MealPlanStorage):
         if ingredients_to_insert:
             self.client.table('ingredient_pools').insert(ingredients_to_insert).execute()
     
+    def _get_pool_rows(self, plan_id: str) -> Dict[str, Dict]:
+        """Read the whole ingredient pool in one query, keyed by ingredient name."""
+        result = self.client.table('ingredient_pools').select('*').eq('meal_plan_id', plan_id).execute()
+        
+        pool = {}
+        for row in result.data:
+            # Same item can appear in several boxes; like the per-name lookups, use the first row
+            pool.setdefault(row['ingredient_name'], row)
+        return pool
+    
+    def _allocate_from_pool(self, pool: Dict[str, Dict], ingredients: List[Dict]) -> List[Dict]:
+        """Allocate ingredients against in-memory pool rows; returns the ones that didn't fit."""
+        conflicts = []
+        
+        for ingredient in ingredients:
+            name = ingredient['name']
+            quantity = Decimal(str(ingredient['quantity']))
+            
+            current = pool.get(name)
+            if current is None:
+                conflicts.append({
+                    'ingredient': name,
+                    'issue': 'not_available',
+                    'message': f"Ingredient '{name}' not found in cart"
+                })
+                continue
+            
+            remaining = Decimal(str(current['remaining_quantity']))
+            
+            if quantity > remaining:
+                conflicts.append({
+                    'ingredient': name,
+                    'requested': float(quantity),
+                    'available': float(remaining),
+                    'unit': current['unit'],
+                    'issue': 'insufficient_quantity',
+                    'suggestion': f"Reduce to {remaining} {current['unit']} or less"
+                })
+                continue
+            
+            new_allocated = Decimal(str(current['allocated_quantity'])) + quantity
+            current['allocated_quantity'] = float(new_allocated)
+            current['remaining_quantity'] = float(Decimal(str(current['total_quantity'])) - new_allocated)
+        
+        return conflicts
+    
+    def _release_from_pool(self, pool: Dict[str, Dict], ingredients: List[Dict]):
+        """Return previously allocated ingredients to in-memory pool rows."""
+        for ingredient in ingredients:
+            current = pool.get(ingredient['name'])
+            if current is None:
+                continue
+            
+            quantity = Decimal(str(ingredient['quantity']))
+            new_allocated = max(Decimal('0'), Decimal(str(current['allocated_quantity'])) - quantity)
+            current['allocated_quantity'] = float(new_allocated)
+            current['remaining_quantity'] = float(Decimal(str(current['total_quantity'])) - new_allocated)
+    
+    def _write_pool_rows(self, rows: List[Dict]):
+        """Persist changed pool rows with a single upsert."""
+        if not rows:
+            return
+        
+        updated_at = datetime.now().isoformat()
+        self.client.table('ingredient_pools').upsert([{
+            'id': row['id'],
+            'meal_plan_id': row['meal_plan_id'],
+            'ingredient_name': row['ingredient_name'],
+            'total_quantity': row['total_quantity'],
+            'allocated_quantity': row['allocated_quantity'],
+            'remaining_quantity': row['remaining_quantity'],
+            'unit': row['unit'],
+            'updated_at': updated_at
+        } for row in rows]).execute()
+    
     async def create_meal_plan(self, user_phone: str, week_of: date, cart_data: Dict) -> str:
         """Create a new meal plan and initialize ingredient pool."""
         try:
@@ -95,45 +170,61 @@ class SupabaseMealStorage(MealPlanStorage):
     
     async def get_meal_plan(self, user_phone: str, week_of: date) -> Optional[Dict]:
         """Retrieve complete meal plan with all meals and ingredient status."""
+        plans = await self.get_meal_plans(user_phone, [week_of])
+        return plans[week_of]
+    
+    async def get_meal_plans(self, user_phone: str, weeks: List[date]) -> Dict[date, Optional[Dict]]:
+        """Retrieve several weeks of meal plans in three queries, however many weeks."""
         try:
-            # Get base meal plan
-            plan_result = self.client.table('weekly_meal_plans').select('*').eq('user_phone', user_phone).eq('week_of', week_of.isoformat()).execute()
+            plans: Dict[date, Optional[Dict]] = {week: None for week in weeks}
+            if not weeks:
+                return plans
+            
+            # Get base meal plans
+            plan_result = self.client.table('weekly_meal_plans').select('*').eq('user_phone', user_phone).in_('week_of', [week.isoformat() for week in weeks]).execute()
             
             if not plan_result.data:
-                return None
+                return plans
             
-            meal_plan = plan_result.data[0]
-            plan_id = meal_plan['id']
+            plan_ids = [meal_plan['id'] for meal_plan in plan_result.data]
             
             # Get all meal assignments
-            meals_result = self.client.table('meal_assignments').select('*').eq('meal_plan_id', plan_id).execute()
+            meals_result = self.client.table('meal_assignments').select('*').in_('meal_plan_id', plan_ids).execute()
             
-            meals = {}
+            meals_by_plan: Dict[str, Dict] = {plan_id: {} for plan_id in plan_ids}
             for meal in meals_result.data:
-                meals[meal['day_of_week']] = {
+                meals_by_plan[meal['meal_plan_id']][meal['day_of_week']] = {
                     'id': meal['id'],
                     'meal_data': meal['meal_data'],
                     'allocated_ingredients': meal['allocated_ingredients'],
                     'status': meal['status']
                 }
             
-            # Get ingredient pool
-            ingredient_pool = await self.get_ingredient_pool(plan_id)
+            # Get ingredient pools
+            ingredient_pools = await self.get_ingredient_pools(plan_ids)
             
-            return {
-                'id': plan_id,
-                'user_phone': meal_plan['user_phone'],
-                'week_of': meal_plan['week_of'],
-                'cart_data': meal_plan['cart_data'],
-                'status': meal_plan['status'],
-                'meals': meals,
-                'ingredient_pool': ingredient_pool,
-                'created_at': meal_plan['created_at'],
-                'updated_at': meal_plan['updated_at']
-            }
+            for meal_plan in plan_result.data:
+                plan_id = meal_plan['id']
+                week = date.fromisoformat(str(meal_plan['week_of'])[:10])
+                # Keep the first plan per week, as the single-week lookup did
+                if plans.get(week) is not None:
+                    continue
+                plans[week] = {
+                    'id': plan_id,
+                    'user_phone': meal_plan['user_phone'],
+                    'week_of': meal_plan['week_of'],
+                    'cart_data': meal_plan['cart_data'],
+                    'status': meal_plan['status'],
+                    'meals': meals_by_plan[plan_id],
+                    'ingredient_pool': ingredient_pools[plan_id],
+                    'created_at': meal_plan['created_at'],
+                    'updated_at': meal_plan['updated_at']
+                }
+            
+            return plans
             
         except Exception as e:
-            logger.error(f"Error getting meal plan: {e}")
+            logger.error(f"Error getting meal plans: {e}")
             raise StorageError(f"Failed to get meal plan: {e}")
     
     async def update_meal_plan_status(self, plan_id: str, status: str) -> bool:
@@ -154,52 +245,70 @@ class SupabaseMealStorage(MealPlanStorage):
             logger.error(f"Error updating meal plan status: {e}")
             raise StorageError(f"Failed to update status: {e}")
     
-    async def assign_meal(self, plan_id: str, day: str, meal_data: Dict, ingredients: List[Dict]) -> bool:
-        """Assign meal to day with ingredient allocation."""
+    async def assign_meals(self, plan_id: str, assignments: List[Tuple[str, Dict, List[Dict]]]) -> List[bool]:
+        """Assign meals to several days with one pool read and one write per table."""
         try:
-            # First check for conflicts
-            conflicts = await self.check_ingredient_conflicts(plan_id, ingredients)
-            if conflicts:
-                raise ConflictError(conflicts)
+            if not assignments:
+                return []
             
-            # Start transaction-like behavior
-            # 1. Remove existing meal assignment (if any) and release ingredients
-            await self.remove_meal_assignment(plan_id, day)
+            days = [day for day, _, _ in assignments]
+            if len(set(days)) != len(days):
+                raise ValidationError(f"Each day can only be assigned once per batch: {days}")
             
-            # 2. Allocate new ingredients
-            allocation_result = await self.allocate_ingredients(plan_id, day, ingredients)
-            if not allocation_result.get('success'):
-                raise ConflictError(allocation_result.get('conflicts', []))
+            pool = self._get_pool_rows(plan_id)
+            original = {name: dict(row) for name, row in pool.items()}
             
-            # 3. Create meal assignment
-            meal_assignment = {
-                'meal_plan_id': plan_id,
-                'day_of_week': day,
-                'meal_data': meal_data,
-                'allocated_ingredients': ingredients,
-                'status': 'assigned'
-            }
+            # 1. Release ingredients held by the meals being replaced
+            existing = self.client.table('meal_assignments').select('day_of_week, allocated_ingredients').eq('meal_plan_id', plan_id).in_('day_of_week', days).execute()
+            for meal in existing.data:
+                self._release_from_pool(pool, meal.get('allocated_ingredients') or [])
+            released = {name: dict(row) for name, row in pool.items()}
+            
+            # 2. Allocate the new meals, in order, against what's left
+            conflicts = []
+            for _, _, ingredients in assignments:
+                conflicts.extend(self._allocate_from_pool(pool, ingredients))
+            if conflicts:
+                raise ConflictError(conflicts)
             
-            result = self.client.table('meal_assignments').upsert(meal_assignment).execute()
+            # 3. Write the pool, then swap the assignments
+            changed = [name for name, row in pool.items() if row != original[name]]
+            self._write_pool_rows([pool[name] for name in changed])
             
-            if not result.data:
+            replaced = False
+            try:
+                self.client.table('meal_assignments').delete().eq('meal_plan_id', plan_id).in_('day_of_week', days).execute()
+                replaced = True
+                
+                result = self.client.table('meal_assignments').upsert([{
+                    'meal_plan_id': plan_id,
+                    'day_of_week': day,
+                    'meal_data': meal_data,
+                    'allocated_ingredients': ingredients,
+                    'status': 'assigned'
+                } for day, meal_data, ingredients in assignments]).execute()
+                
+                if not result.data:
+                    raise StorageError("Failed to create meal assignments")
+            except Exception:
                 # Rollback: release the ingredients we just allocated
-                await self.release_ingredients(plan_id, day)
-                raise StorageError("Failed to create meal assignment")
+                snapshot = released if replaced else original
+                self._write_pool_rows([snapshot[name] for name in changed])
+                raise
             
             # 4. Update meal plan timestamp
             self.client.table('weekly_meal_plans').update({
                 'updated_at': datetime.now().isoformat()
             }).eq('id', plan_id).execute()
             
-            logger.info(f"Assigned meal to {day} in plan {plan_id}")
-            return True
+            logger.info(f"Assigned meals to {', '.join(days)} in plan {plan_id}")
+            return [True] * len(assignments)
             
-        except ConflictError:
-            raise  # Re-raise conflict errors as-is
+        except (ConflictError, ValidationError):
+            raise  # Re-raise conflict and validation errors as-is
         except Exception as e:
-            logger.error(f"Error assigning meal: {e}")
-            raise StorageError(f"Failed to assign meal: {e}")
+            logger.error(f"Error assigning meals: {e}")
+            raise StorageError(f"Failed to assign meals: {e}")
     
     async def get_meal_assignment(self, plan_id: str, day: str) -> Optional[Dict]:
         """Get meal assignment for specific day."""
@@ -259,72 +368,45 @@ class SupabaseMealStorage(MealPlanStorage):
     
     async def get_ingredient_pool(self, plan_id: str) -> Dict[str, Dict]:
         """Get current ingredient pool status."""
+        pools = await self.get_ingredient_pools([plan_id])
+        return pools[plan_id]
+    
+    async def get_ingredient_pools(self, plan_ids: List[str]) -> Dict[str, Dict[str, Dict]]:
+        """Get ingredient pool status for several plans in one query."""
         try:
-            result = self.client.table('ingredient_pools').select('*').eq('meal_plan_id', plan_id).execute()
+            pools: Dict[str, Dict[str, Dict]] = {plan_id: {} for plan_id in plan_ids}
+            if not plan_ids:
+                return pools
+            
+            result = self.client.table('ingredient_pools').select('*').in_('meal_plan_id', plan_ids).execute()
             
-            ingredient_pool = {}
             for ingredient in result.data:
-                ingredient_pool[ingredient['ingredient_name']] = {
+                pools[ingredient['meal_plan_id']][ingredient['ingredient_name']] = {
                     'total': float(ingredient['total_quantity']),
                     'allocated': float(ingredient['allocated_quantity']),
                     'remaining': float(ingredient['remaining_quantity']),
                     'unit': ingredient['unit']
                 }
             
-            return ingredient_pool
+            return pools
             
         except Exception as e:
             logger.error(f"Error getting ingredient pool: {e}")
             raise StorageError(f"Failed to get ingredient pool: {e}")
     
-    async def allocate_ingredients(self, plan_id: str, day: str, ingredients: List[Dict]) -> Dict:
-        """Allocate ingredients for a meal."""
+    async def allocate_ingredients_batch(self, plan_id: str, items: List[Tuple[str, List[Dict]]]) -> Dict[str, Dict]:
+        """Allocate ingredients for several meals with one pool read and one write."""
         try:
-            conflicts = []
+            pool = self._get_pool_rows(plan_id)
+            original = {name: dict(row) for name, row in pool.items()}
             
-            for ingredient in ingredients:
-                name = ingredient['name']
-                quantity = Decimal(str(ingredient['quantity']))
-                
-                # Get current ingredient status
-                result = self.client.table('ingredient_pools').select('*').eq('meal_plan_id', plan_id).eq('ingredient_name', name).execute()
-                
-                if not result.data:
-                    conflicts.append({
-                        'ingredient': name,
-                        'issue': 'not_available',
-                        'message': f"Ingredient '{name}' not found in cart"
-                    })
-                    continue
-                
-                current = result.data[0]
-                remaining = Decimal(str(current['remaining_quantity']))
-                
-                if quantity > remaining:
-                    conflicts.append({
-                        'ingredient': name,
-                        'requested': float(quantity),
-                        'available': float(remaining),
-                        'unit': current['unit'],
-                        'issue': 'insufficient_quantity',
-                        'suggestion': f"Reduce to {remaining} {current['unit']} or less"
-                    })
-                    continue
-                
-                # Allocate the ingredient
-                new_allocated = Decimal(str(current['allocated_quantity'])) + quantity
-                new_remaining = Decimal(str(current['total_quantity'])) - new_allocated
-                
-                self.client.table('ingredient_pools').update({
-                    'allocated_quantity': float(new_allocated),
-                    'remaining_quantity': float(new_remaining),
-                    'updated_at': datetime.now().isoformat()
-                }).eq('id', current['id']).execute()
+            results = {}
+            for day, ingredients in items:
+                conflicts = self._allocate_from_pool(pool, ingredients)
+                results[day] = {'success': False, 'conflicts': conflicts} if conflicts else {'success': True}
             
-            if conflicts:
-                return {'success': False, 'conflicts': conflicts}
-            
-            return {'success': True}
+            self._write_pool_rows([row for name, row in pool.items() if row != original[name]])
+            return results
             
         except Exception as e:
             logger.error(f"Error allocating ingredients: {e}")
@@ -338,23 +420,10 @@ class SupabaseMealStorage(MealPlanStorage):
             if not meal or not meal.get('allocated_ingredients'):
                 return True  # Nothing to release
             
-            for ingredient in meal['allocated_ingredients']:
-                name = ingredient['name']
-                quantity = Decimal(str(ingredient['quantity']))
-                
-                # Get current ingredient status
-                result = self.client.table('ingredient_pools').select('*').eq('meal_plan_id', plan_id).eq('ingredient_name', name).execute()
-                
-                if result.data:
-                    current = result.data[0]
-                    new_allocated = max(Decimal('0'), Decimal(str(current['allocated_quantity'])) - quantity)
-                    new_remaining = Decimal(str(current['total_quantity'])) - new_allocated
-                    
-                    self.client.table('ingredient_pools').update({
-                        'allocated_quantity': float(new_allocated),
-                        'remaining_quantity': float(new_remaining),
-                        'updated_at': datetime.now().isoformat()
-                    }).eq('id', current['id']).execute()
+            pool = self._get_pool_rows(plan_id)
+            original = {name: dict(row) for name, row in pool.items()}
+            self._release_from_pool(pool, meal['allocated_ingredients'])
+            self._write_pool_rows([row for name, row in pool.items() if row != original[name]])
             
             logger.info(f"Released ingredients for {day} in plan {plan_id}")
             return True
@@ -367,14 +436,14 @@ class SupabaseMealStorage(MealPlanStorage):
         """Check for ingredient allocation conflicts."""
         try:
             conflicts = []
+            pool = self._get_pool_rows(plan_id)
             
             for ingredient in ingredients:
                 name = ingredient['name']
                 quantity = Decimal(str(ingredient['quantity']))
                 
-                result = self.client.table('ingredient_pools').select('*').eq('meal_plan_id', plan_id).eq('ingredient_name', name).execute()
-                
-                if not result.data:
+                current = pool.get(name)
+                if current is None:
                     conflicts.append({
                         'ingredient': name,
                         'issue': 'not_available',
@@ -382,7 +451,6 @@ class SupabaseMealStorage(MealPlanStorage):
                     })
                     continue
                 
-                current = result.data[0]
                 remaining = Decimal(str(current['remaining_quantity']))
                 
                 if quantity > remaining:
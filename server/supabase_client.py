@@ -13,6 +13,7 @@ from __future__ import annotations
 
 import os
 import base64
+from functools import lru_cache
 from typing import Optional, Dict, Any, List
 
 # More explicit .env loading
@@ -29,7 +30,13 @@ SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
 
+@lru_cache(maxsize=1)
 def get_client() -> Client:
+    """Return the process-wide Supabase client.
+
+    Building a client sets up PostgREST, auth, storage and realtime sub-clients,
+    so every helper here shares one instead of creating one per query.
+    """
     if not SUPABASE_URL or not SUPABASE_KEY:
         raise RuntimeError(
             "Missing SUPABASE_URL or SUPABASE_KEY in environment."
@@ -732,3 +739,48 @@ def get_meal_locks(phone_number: str, analysis_date: Optional[str] = None) -> Li
         return []
 
 
+def upload_pdf(bucket: str, object_name: str, local_path: str) -> bool:
+    """
+    Upload a generated PDF to Supabase Storage.
+
+    Args:
+        bucket: Storage bucket name
+        object_name: Path of the object inside the bucket
+        local_path: PDF file on disk
+
+    Returns:
+        bool: True if uploaded, False otherwise
+    """
+    try:
+        client = get_client()
+        with open(local_path, "rb") as pdf_file:
+            client.storage.from_(bucket).upload(
+                object_name,
+                pdf_file.read(),
+                {"content-type": "application/pdf", "upsert": "true"},
+            )
+        return True
+    except Exception as e:
+        print(f"❌ Failed to upload PDF {object_name}: {e}")
+        return False
+
+
+def create_signed_pdf_url(bucket: str, object_name: str, expires_in: int) -> Optional[str]:
+    """
+    Create a time-limited download URL for a PDF in Supabase Storage.
+
+    Args:
+        bucket: Storage bucket name
+        object_name: Path of the object inside the bucket
+        expires_in: Seconds until the URL stops working
+
+    Returns:
+        Signed URL, or None if the object doesn't exist or signing failed
+    """
+    try:
+        client = get_client()
+        result = client.storage.from_(bucket).create_signed_url(object_name, expires_in)
+        return result.get("signedURL") or result.get("signedUrl")
+    except Exception as e:
+        print(f"❌ Failed to sign PDF URL {object_name}: {e}")
+        return None
@@ -0,0 +1,134 @@
+"""
+Test Streaming JSON Scanners
+============================
+The SSE meal endpoints render items as _JsonItemScanner / _JsonFieldScanner
+emit them, so they must survive arbitrary chunk boundaries.
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import orjson
+
+from server.services.meal_generator import _JsonItemScanner, _JsonFieldScanner
+
+
+def feed_chunks(scanner, text, size):
+    """Feed text in fixed-size chunks, collecting everything emitted."""
+    emitted = []
+    for start in range(0, len(text), size):
+        emitted.extend(scanner.feed(text[start:start + size]))
+    return emitted
+
+
+def feed_split(scanner_cls, text, split):
+    """Feed text as two chunks split at the given offset."""
+    scanner = scanner_cls()
+    return scanner.feed(text[:split]) + scanner.feed(text[split:])
+
+
+MEALS_REPLY = orjson.dumps({
+    "meals": [
+        {"name": "Chicken \"Stir\" Fry", "ingredients": ["chicken", "peppers"], "notes": "use {high} heat"},
+        {"name": "Back\\slash Salad", "steps": [["chop", "toss"], []], "nested": {"a": {"b": [1, 2]}}},
+    ],
+    "snacks": [
+        {"name": "Apple [sliced] & almonds", "time": "5 min"},
+    ],
+}).decode()
+
+EXPECTED_ITEMS = [
+    ("meals", {"name": "Chicken \"Stir\" Fry", "ingredients": ["chicken", "peppers"], "notes": "use {high} heat"}),
+    ("meals", {"name": "Back\\slash Salad", "steps": [["chop", "toss"], []], "nested": {"a": {"b": [1, 2]}}}),
+    ("snacks", {"name": "Apple [sliced] & almonds", "time": "5 min"}),
+]
+
+
+def test_item_scanner_whole_reply():
+    """The whole reply in one chunk yields every item with its section."""
+    assert _JsonItemScanner().feed(MEALS_REPLY) == EXPECTED_ITEMS
+
+
+def test_item_scanner_chunk_boundaries():
+    """Every two-way split and small fixed chunk sizes give the same items."""
+    for split in range(len(MEALS_REPLY) + 1):
+        assert feed_split(_JsonItemScanner, MEALS_REPLY, split) == EXPECTED_ITEMS, split
+    for size in (1, 2, 3, 7):
+        assert feed_chunks(_JsonItemScanner(), MEALS_REPLY, size) == EXPECTED_ITEMS, size
+
+
+def test_item_scanner_emits_items_as_they_close():
+    """An item is emitted by the chunk carrying its closing brace, before the reply ends."""
+    scanner = _JsonItemScanner()
+    assert scanner.feed('{"meals": [{"name": "Soup"') == []
+    assert scanner.feed('}, {"name": "St') == [("meals", {"name": "Soup"})]
+    assert scanner.feed('ew"}]}') == [("meals", {"name": "Stew"})]
+
+
+def test_item_scanner_skips_malformed_items():
+    """A malformed item is dropped without derailing the items after it."""
+    reply = '{"meals": [{"name": bad}, {"name": "Good"}], "snacks": [{"name": "Nuts"}]}'
+    for size in (1, 5, len(reply)):
+        assert feed_chunks(_JsonItemScanner(), reply, size) == [
+            ("meals", {"name": "Good"}),
+            ("snacks", {"name": "Nuts"}),
+        ]
+
+
+SINGLE_MEAL_REPLY = orjson.dumps({
+    "name": "Say \"cheese\" Omelette",
+    "cooking_time": "10 min",
+    "ingredients_used": ["eggs", "cheese, sharp", "chives {fresh}"],
+    "protein": "eggs\\dairy",
+    "extra": {"nested": [1, {"deep": "]"}]},
+}).decode()
+
+EXPECTED_FIELDS = [
+    ("name", "Say \"cheese\" Omelette"),
+    ("cooking_time", "10 min"),
+    ("ingredients_used", ["eggs", "cheese, sharp", "chives {fresh}"]),
+    ("protein", "eggs\\dairy"),
+    ("extra", {"nested": [1, {"deep": "]"}]}),
+]
+
+
+def test_field_scanner_whole_reply():
+    """The whole reply in one chunk yields every top-level field in order."""
+    assert _JsonFieldScanner().feed(SINGLE_MEAL_REPLY) == EXPECTED_FIELDS
+
+
+def test_field_scanner_chunk_boundaries():
+    """Every two-way split and small fixed chunk sizes give the same fields."""
+    for split in range(len(SINGLE_MEAL_REPLY) + 1):
+        assert feed_split(_JsonFieldScanner, SINGLE_MEAL_REPLY, split) == EXPECTED_FIELDS, split
+    for size in (1, 2, 3, 7):
+        assert feed_chunks(_JsonFieldScanner(), SINGLE_MEAL_REPLY, size) == EXPECTED_FIELDS, size
+
+
+def test_field_scanner_pretty_printed_reply():
+    """Whitespace and newlines around keys and values are ignored."""
+    reply = '{\n  "name" : "Tacos",\n  "protein":\n    "beef"\n}\n'
+    assert feed_chunks(_JsonFieldScanner(), reply, 4) == [("name", "Tacos"), ("protein", "beef")]
+
+
+def test_field_scanner_skips_malformed_fields():
+    """A malformed value is dropped and later fields still come through."""
+    reply = '{"name": oops, "cooking_time": "20 min"}'
+    for size in (1, 6, len(reply)):
+        assert feed_chunks(_JsonFieldScanner(), reply, size) == [("cooking_time", "20 min")]
+
+
+if __name__ == "__main__":
+    for test in (
+        test_item_scanner_whole_reply,
+        test_item_scanner_chunk_boundaries,
+        test_item_scanner_emits_items_as_they_close,
+        test_item_scanner_skips_malformed_items,
+        test_field_scanner_whole_reply,
+        test_field_scanner_chunk_boundaries,
+        test_field_scanner_pretty_printed_reply,
+        test_field_scanner_skips_malformed_fields,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
@@ -33,6 +33,8 @@ def test_normalize_phone():
         ("+12125551234", "+12125551234"),
         ("+1 212 555 1234", "+12125551234"),
         ("1 (212) 555-1234", "+12125551234"),
+        ("tel:+1-212-555-1234", "+12125551234"),
+        ("\u00a0212\u2011555\u20111234", "+12125551234"),  # NBSP / non-breaking hyphens
         
         # Edge cases
         ("", None),
@@ -0,0 +1,251 @@
+"""
+Test Supabase Meal Plan Storage
+===============================
+Batched meal assignment against an in-memory stand-in for the Supabase client.
+"""
+
+import sys
+import os
+import types
+import asyncio
+import importlib
+import itertools
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'server'))
+
+import pytest
+
+from storage.base import ConflictError, StorageError
+
+
+def _load_storage_module():
+    return importlib.import_module('storage.supabase_storage')
+
+
+@pytest.fixture(autouse=True)
+def storage_module(monkeypatch):
+    """
+    storage.supabase_storage, importable even without the supabase package.
+
+    The storage only reaches supabase_client through get_client(), which these
+    tests bypass, so a bare stand-in is enough - scoped to each test so other
+    test modules never see it.
+    """
+    try:
+        import supabase_client  # noqa: F401
+    except ImportError:
+        monkeypatch.setitem(sys.modules, 'supabase_client', types.ModuleType('supabase_client'))
+    already_loaded = 'storage.supabase_storage' in sys.modules
+    module = _load_storage_module()
+    yield module
+    if not already_loaded:
+        # Imported against the stand-in - don't leave it cached for later tests
+        sys.modules.pop('storage.supabase_storage', None)
+
+
+class FakeQuery:
+    """Just enough of the postgrest query builder for SupabaseMealStorage."""
+
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.filters = []
+        self.op = 'select'
+        self.payload = None
+
+    def select(self, *columns):
+        self.op = 'select'
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def in_(self, column, values):
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def delete(self):
+        self.op = 'delete'
+        return self
+
+    def update(self, payload):
+        self.op, self.payload = 'update', payload
+        return self
+
+    def upsert(self, payload):
+        self.op, self.payload = 'upsert', payload
+        return self
+
+    def insert(self, payload):
+        self.op, self.payload = 'insert', payload
+        return self
+
+    def execute(self):
+        if (self.table, self.op) in self.client.fail_on:
+            raise RuntimeError(f"{self.op} on {self.table} failed")
+        self.client.calls.append((self.table, self.op))
+
+        rows = self.client.tables.setdefault(self.table, [])
+        matched = [row for row in rows if all(f(row) for f in self.filters)]
+
+        if self.op == 'select':
+            return types.SimpleNamespace(data=[dict(row) for row in matched])
+        if self.op == 'delete':
+            self.client.tables[self.table] = [row for row in rows if row not in matched]
+            return types.SimpleNamespace(data=matched)
+        if self.op == 'update':
+            for row in matched:
+                row.update(self.payload)
+            return types.SimpleNamespace(data=matched)
+
+        written = []
+        for record in (self.payload if isinstance(self.payload, list) else [self.payload]):
+            record = dict(record)
+            existing = [row for row in rows if 'id' in record and row['id'] == record['id']]
+            if existing:
+                existing[0].update(record)
+            else:
+                record.setdefault('id', next(self.client.ids))
+                rows.append(record)
+            written.append(record)
+        return types.SimpleNamespace(data=written)
+
+
+class FakeClient:
+    def __init__(self):
+        self.tables = {'ingredient_pools': [], 'meal_assignments': [], 'weekly_meal_plans': [{'id': 'plan'}]}
+        self.calls = []
+        self.fail_on = set()
+        self.ids = itertools.count(1)
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+
+def make_storage(pool):
+    """Storage over a fake client whose plan has the given {name: total} pool."""
+    storage_cls = _load_storage_module().SupabaseMealStorage
+    storage = storage_cls.__new__(storage_cls)
+    storage.client = FakeClient()
+    for name, total in pool.items():
+        storage.client.tables['ingredient_pools'].append({
+            'id': f"pool-{name}",
+            'meal_plan_id': 'plan',
+            'ingredient_name': name,
+            'total_quantity': total,
+            'allocated_quantity': 0,
+            'remaining_quantity': total,
+            'unit': 'lb'
+        })
+    return storage
+
+
+def pool_state(storage):
+    return {
+        row['ingredient_name']: (row['allocated_quantity'], row['remaining_quantity'])
+        for row in storage.client.tables['ingredient_pools']
+    }
+
+
+def assigned_days(storage):
+    return sorted(row['day_of_week'] for row in storage.client.tables['meal_assignments'])
+
+
+def meal(day, **ingredients):
+    return (day, {'name': f"{day} dinner"}, [{'name': n, 'quantity': q} for n, q in ingredients.items()])
+
+
+def test_assign_meals_batch():
+    """A week of meals is allocated cumulatively and written in a fixed number of round trips."""
+    storage = make_storage({'chicken': 2, 'rice': 3})
+    week = [meal(day, chicken=0.5, rice=1) for day in ('monday', 'tuesday', 'wednesday')]
+
+    assert asyncio.run(storage.assign_meals('plan', week)) == [True, True, True]
+    assert pool_state(storage) == {'chicken': (1.5, 0.5), 'rice': (3.0, 0.0)}
+    assert assigned_days(storage) == ['monday', 'tuesday', 'wednesday']
+    assert len(storage.client.calls) == 6
+
+
+def test_conflict_leaves_pool_untouched():
+    """One meal that doesn't fit rejects the whole batch before anything is written."""
+    storage = make_storage({'chicken': 1, 'rice': 3})
+    asyncio.run(storage.assign_meals('plan', [meal('monday', chicken=0.5)]))
+    before_pool, before_days = pool_state(storage), assigned_days(storage)
+    storage.client.calls.clear()
+
+    try:
+        asyncio.run(storage.assign_meals('plan', [
+            meal('tuesday', rice=1),
+            meal('wednesday', chicken=1),
+            meal('thursday', tofu=1),
+        ]))
+        assert False, "expected ConflictError"
+    except ConflictError as e:
+        assert [c['issue'] for c in e.conflicts] == ['insufficient_quantity', 'not_available']
+
+    assert pool_state(storage) == before_pool
+    assert assigned_days(storage) == before_days
+    assert all(op == 'select' for _, op in storage.client.calls)
+
+
+def test_replacing_day_releases_its_ingredients_first():
+    """Re-assigning a day frees the old meal's share before the new one is checked."""
+    storage = make_storage({'chicken': 1})
+    asyncio.run(storage.assign_meals('plan', [meal('monday', chicken=1)]))
+    assert pool_state(storage) == {'chicken': (1.0, 0.0)}
+
+    # Needs the whole pool - only fits because monday's old meal gives it back
+    assert asyncio.run(storage.assign_meal('plan', 'monday', {'name': 'new'}, [{'name': 'chicken', 'quantity': 1}]))
+    assert pool_state(storage) == {'chicken': (1.0, 0.0)}
+    assert assigned_days(storage) == ['monday']
+    assert storage.client.tables['meal_assignments'][0]['meal_data'] == {'name': 'new'}
+
+
+def test_failed_upsert_restores_released_snapshot():
+    """If the new assignments can't be written after the old ones were deleted, only the old allocation is gone."""
+    storage = make_storage({'chicken': 2, 'rice': 2})
+    asyncio.run(storage.assign_meals('plan', [meal('monday', chicken=1), meal('tuesday', rice=0.5)]))
+    storage.client.fail_on.add(('meal_assignments', 'upsert'))
+
+    try:
+        asyncio.run(storage.assign_meals('plan', [meal('monday', rice=1)]))
+        assert False, "expected StorageError"
+    except StorageError:
+        pass
+
+    # monday's chicken was released with its deleted row; monday's new rice was rolled back
+    assert pool_state(storage) == {'chicken': (0.0, 2.0), 'rice': (0.5, 1.5)}
+    assert assigned_days(storage) == ['tuesday']
+
+
+def test_failed_delete_restores_original_snapshot():
+    """If the old assignments can't be removed, the pool goes back to exactly how it was."""
+    storage = make_storage({'chicken': 2, 'rice': 2})
+    asyncio.run(storage.assign_meals('plan', [meal('monday', chicken=1)]))
+    before_pool = pool_state(storage)
+    storage.client.fail_on.add(('meal_assignments', 'delete'))
+
+    try:
+        asyncio.run(storage.assign_meals('plan', [meal('monday', rice=1)]))
+        assert False, "expected StorageError"
+    except StorageError:
+        pass
+
+    assert pool_state(storage) == before_pool
+    assert assigned_days(storage) == ['monday']
+
+
+if __name__ == "__main__":
+    try:
+        import supabase_client  # noqa: F401
+    except ImportError:
+        sys.modules['supabase_client'] = types.ModuleType('supabase_client')
+    for test in (
+        test_assign_meals_batch,
+        test_conflict_leaves_pool_untouched,
+        test_replacing_day_releases_its_ingredients_first,
+        test_failed_upsert_restores_released_snapshot,
+        test_failed_delete_restores_original_snapshot,
+    ):
+        test()
+        print(f"✅ {test.__name__}")